@@ -0,0 +1,567 @@
+#!/usr/bin/env python3
+"""
+Mock Discord API - offline test and benchmark server for Paracord
+
+Serves the REST endpoints paracord.py uses from generated, in-memory data,
+so runs can be tested and timed without a real account or real messages.
+It behaves like Discord where it matters for deletion speed: search is
+paged at 25 hits, channels answer 202 until they are indexed, deleted
+messages linger in the search index as ghosts, every route has a rate
+limit bucket with real X-RateLimit headers (plus a global limit), and
+forbidden channels and archived threads answer 403 and 50083.
+
+Standard library only. Nothing is persisted: restarting the server with
+the same --seed recreates the same data.
+
+Usage:
+    python3 mock_discord.py --write-config mock_config.json
+    DISCORD_API_BASE=http://127.0.0.1:8765/api/v9 DISCORD_TOKEN=mock \\
+        python3 paracord.py --config mock_config.json --yes
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+DISCORD_EPOCH = 1420070400000  # First second of 2015, in ms
+API_PREFIX = "/api/v9"
+SEARCH_PAGE = 25
+MAX_OFFSET = 9975  # Discord rejects search offsets past this
+HISTORY_LIMIT = 100
+MEOW_REACTIONS = ("🐭", "🐁")
+
+# Rate limit buckets: route -> (requests, per seconds), before --time-scale
+DEFAULT_LIMITS = {
+    'search': (1, 2.0),
+    'history': (5, 5.0),
+    'delete': (5, 5.0),
+    'edit': (5, 5.0),
+    'react': (1, 0.25),
+    'other': (50, 1.0),
+}
+
+# Errors as Discord sends them
+UNKNOWN_MESSAGE = {'message': 'Unknown Message', 'code': 10008}
+MISSING_ACCESS = {'message': 'Missing Access', 'code': 50001}
+CANNOT_EDIT = {'message': 'Cannot edit a message authored by another user', 'code': 50005}
+MISSING_PERMISSIONS = {'message': 'Missing Permissions', 'code': 50013}
+THREAD_ARCHIVED = {'message': 'Thread is archived', 'code': 50083}
+NOT_INDEXED = {'message': 'Index not yet available. Try again later', 'code': 110000,
+               'documents_indexed': 0}
+
+
+def snowflake(ms: float, sequence: int = 0) -> int:
+    """Snowflake for a Unix time in ms (sequence keeps IDs in one ms apart)"""
+    return (int(ms) - DISCORD_EPOCH) << 22 | (sequence & 0xFFF)
+
+
+def snowflake_time(snowflake_id: int) -> str:
+    ms = (snowflake_id >> 22) + DISCORD_EPOCH
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc).isoformat()
+
+
+class Bucket:
+    """One rate limit window of a route and major parameter"""
+
+    def __init__(self, name: str, limit: int, per: float):
+        self.name = name
+        self.limit = limit
+        self.per = per
+        self.remaining = limit
+        self.reset_at = 0.0
+
+    def take(self, now: float) -> Tuple[bool, Dict[str, str]]:
+        """Count a request; returns whether it's allowed and the headers to send"""
+        if now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = now + self.per
+        allowed = self.remaining > 0
+        if allowed:
+            self.remaining -= 1
+        reset_after = max(0.0, self.reset_at - now)
+        headers = {
+            'X-RateLimit-Limit': str(self.limit),
+            'X-RateLimit-Remaining': str(self.remaining),
+            'X-RateLimit-Reset': f"{time.time() + reset_after:.3f}",
+            'X-RateLimit-Reset-After': f"{reset_after:.3f}",
+            'X-RateLimit-Bucket': self.name,
+        }
+        return allowed, headers
+
+
+class MockDiscord:
+    """Generated guilds, DMs and messages, plus the rules for answering requests"""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+
+        now_ms = time.time() * 1000
+        self.me = {'id': str(snowflake(now_ms - 3 * 365 * 86400000)), 'username': 'mock_user',
+                   'discriminator': '0', 'global_name': 'Mock User'}
+        self.other = {'id': str(snowflake(now_ms - 3 * 365 * 86400000, 1)), 'username': 'mock_friend',
+                      'discriminator': '0', 'global_name': 'Mock Friend'}
+
+        self.guilds = []      # Guild objects
+        self.channels = {}    # channel_id -> channel object (with 'guild_id' for servers)
+        self.messages = {}    # channel_id -> {message_id: message}, live messages only
+        self.order = {}       # channel_id -> message IDs, newest first (live and deleted)
+        self.deleted = {}     # message_id -> (monotonic time of deletion, message)
+        self.forbidden = set()  # Channels where our actions answer 403
+        self.archived = set()   # Threads where our actions answer 50083
+        self.denied = set()     # Single messages that answer 403
+        self.indexed_at = {}  # channel or guild ID -> monotonic time its search index is ready
+
+        scale = args.time_scale
+        self.limits = {route: (limit, per * scale) for route, (limit, per) in DEFAULT_LIMITS.items()}
+        for override in args.limit or []:
+            route, _, value = override.partition('=')
+            limit, _, per = value.partition('/')
+            self.limits[route] = (int(limit), float(per))
+        self.buckets = {}     # (route, major) -> Bucket
+        self.global_bucket = Bucket('global', args.global_rate, 1.0) if args.global_rate else None
+
+        self.stats = {'requests': {}, 'rate_limited': 0, 'global_limited': 0, 'not_indexed': 0,
+                      'ghosts_served': 0, 'unknown_message': 0, 'forbidden': 0, 'archived': 0,
+                      'deleted': 0, 'edited': 0, 'reacted': 0}
+        self.generate()
+
+    # --- Data -------------------------------------------------------------
+
+    def generate(self):
+        args = self.args
+        now_ms = time.time() * 1000
+        span_ms = args.days * 86400000
+
+        for g in range(args.guilds):
+            created = now_ms - span_ms - self.rng.uniform(0, 30) * 86400000
+            guild = {'id': str(snowflake(created, g)), 'name': f"Mock Server {g + 1}",
+                     'joined_at': snowflake_time(snowflake(created + 86400000))}
+            self.guilds.append(guild)
+            self.indexed_at[guild['id']] = self.started + self.rng.uniform(0, args.index_delay)
+            for c in range(args.channels):
+                channel = self.add_channel(0, created + (c + 1) * 60000, guild_id=guild['id'],
+                                           name=f"channel-{c + 1}")
+                if c < args.forbidden_channels:
+                    self.forbidden.add(channel['id'])
+            for t in range(args.archived_threads):
+                thread = self.add_channel(11, created + (args.channels + t + 1) * 60000,
+                                          guild_id=guild['id'], name=f"archived-thread-{t + 1}")
+                thread['thread_metadata'] = {'archived': True, 'locked': False}
+                self.archived.add(thread['id'])
+
+        for d in range(args.dms):
+            created = now_ms - span_ms - self.rng.uniform(0, 30) * 86400000
+            recipient = dict(self.other, username=f"mock_friend_{d + 1}")
+            self.add_channel(1, created, recipients=[recipient])
+        for d in range(args.group_dms):
+            created = now_ms - span_ms - self.rng.uniform(0, 30) * 86400000
+            self.add_channel(3, created, name=f"Mock Group {d + 1}", recipients=[self.other])
+
+    def add_channel(self, channel_type: int, created_ms: float, **fields) -> Dict:
+        channel = dict(fields, id=str(snowflake(created_ms, len(self.channels))), type=channel_type)
+        channel_id = channel['id']
+        self.channels[channel_id] = channel
+        if 'guild_id' not in channel:
+            self.indexed_at[channel_id] = self.started + self.rng.uniform(0, self.args.index_delay)
+
+        # Messages spread over the channel's lifetime, newest first
+        start_ms = (int(channel_id) >> 22) + DISCORD_EPOCH + 1000
+        end_ms = time.time() * 1000
+        stamps = sorted((self.rng.uniform(start_ms, end_ms) for _ in range(self.args.messages)),
+                        reverse=True)
+        live = {}
+        for i, ms in enumerate(stamps):
+            own = self.rng.random() < self.args.own_ratio
+            message = {
+                'id': str(snowflake(ms, i)),
+                'channel_id': channel_id,
+                'type': 0,
+                'author': self.me if own else self.other,
+                'content': f"mock message {i}",
+                'timestamp': datetime.fromtimestamp(ms / 1000, tz=timezone.utc).isoformat(),
+                'edited_timestamp': None,
+                'pinned': self.rng.random() < self.args.pinned_ratio,
+                'attachments': [],
+                'embeds': [],
+                'reactions': [],
+            }
+            live[message['id']] = message
+            if own and self.rng.random() < self.args.denied_ratio:
+                self.denied.add(message['id'])
+        self.messages[channel_id] = live
+        self.order[channel_id] = sorted(live, key=int, reverse=True)
+        return channel
+
+    def own_left(self) -> int:
+        return sum(1 for live in self.messages.values() for m in live.values()
+                   if m['author']['id'] == self.me['id'])
+
+    # --- Rate limits --------------------------------------------------------
+
+    def check_rate(self, route: str, major: str) -> Tuple[Optional[Dict], Dict[str, str]]:
+        """Apply the global and route limits; returns a 429 body (or None) and headers"""
+        now = time.monotonic()
+        if self.global_bucket is not None:
+            allowed, _ = self.global_bucket.take(now)
+            if not allowed:
+                self.stats['global_limited'] += 1
+                retry_after = round(self.global_bucket.reset_at - now, 3)
+                return ({'message': 'You are being rate limited.', 'retry_after': retry_after,
+                         'global': True},
+                        {'Retry-After': str(retry_after), 'X-RateLimit-Global': 'true',
+                         'X-RateLimit-Scope': 'global'})
+
+        key = (route, major)
+        if key not in self.buckets:
+            limit, per = self.limits.get(route, self.limits['other'])
+            self.buckets[key] = Bucket(f"mock-{route}", limit, per)
+        allowed, headers = self.buckets[key].take(now)
+        if allowed:
+            return None, headers
+        self.stats['rate_limited'] += 1
+        retry_after = float(headers['X-RateLimit-Reset-After'])
+        headers.update({'Retry-After': str(retry_after), 'X-RateLimit-Scope': 'user'})
+        return {'message': 'You are being rate limited.', 'retry_after': retry_after,
+                'global': False}, headers
+
+    # --- Endpoints ------------------------------------------------------------
+
+    def search(self, scope_id: str, channel_ids: List[str], query: Dict[str, List[str]]) -> Tuple[int, Dict]:
+        """Search our index: live messages plus ghosts deleted less than index_lag ago"""
+        if time.monotonic() < self.indexed_at.get(scope_id, 0):
+            self.stats['not_indexed'] += 1
+            retry_after = max(1, round(self.indexed_at[scope_id] - time.monotonic()))
+            return 202, dict(NOT_INDEXED, retry_after=retry_after)
+
+        offset = int(query.get('offset', ['0'])[0])
+        if offset > MAX_OFFSET:
+            return 400, {'message': 'Invalid Form Body', 'code': 50035}
+        author_id = query.get('author_id', [None])[0]
+        max_id = int(query.get('max_id', [str(1 << 63)])[0])
+        min_id = int(query.get('min_id', ['0'])[0])
+
+        now = time.monotonic()
+        hits = []
+        for channel_id in channel_ids:
+            live = self.messages[channel_id]
+            for message_id in self.order[channel_id]:
+                if not min_id < int(message_id) < max_id:
+                    continue
+                message = live.get(message_id)
+                if message is None:
+                    deleted_at, message = self.deleted.get(message_id, (0.0, None))
+                    if message is None or now - deleted_at >= self.args.index_lag:
+                        continue  # Gone from the index too
+                if author_id is None or message['author']['id'] == author_id:
+                    hits.append(message)
+        hits.sort(key=lambda m: int(m['id']), reverse=True)
+
+        page = hits[offset:offset + SEARCH_PAGE]
+        self.stats['ghosts_served'] += sum(1 for m in page if m['id'] in self.deleted)
+        return 200, {'total_results': len(hits),
+                     'messages': [[dict(m, hit=True)] for m in page],
+                     'analytics_id': 'mock'}
+
+    def history(self, channel_id: str, query: Dict[str, List[str]]) -> Tuple[int, object]:
+        limit = min(int(query.get('limit', ['50'])[0]), HISTORY_LIMIT)
+        before = int(query.get('before', [str(1 << 63)])[0])
+        live = self.messages[channel_id]
+        page = [live[m] for m in self.order[channel_id] if m in live and int(m) < before][:limit]
+        return 200, page
+
+    def act(self, action: str, channel_id: str, message_id: str,
+            body: Optional[Dict], emoji: Optional[str] = None) -> Tuple[int, Optional[Dict]]:
+        """Delete, edit or react to a message"""
+        message = self.messages[channel_id].get(message_id)
+        if message is None:
+            self.stats['unknown_message'] += 1
+            return 404, UNKNOWN_MESSAGE
+        if channel_id in self.archived:
+            self.stats['archived'] += 1
+            return 400, THREAD_ARCHIVED
+        if channel_id in self.forbidden or message_id in self.denied:
+            self.stats['forbidden'] += 1
+            return 403, MISSING_ACCESS if channel_id in self.forbidden else MISSING_PERMISSIONS
+
+        own = message['author']['id'] == self.me['id']
+        if action == 'delete':
+            if not own:
+                self.stats['forbidden'] += 1
+                return 403, MISSING_PERMISSIONS
+            del self.messages[channel_id][message_id]
+            self.deleted[message_id] = (time.monotonic(), message)
+            self.stats['deleted'] += 1
+            return 204, None
+        if action == 'edit':
+            if not own:
+                self.stats['forbidden'] += 1
+                return 403, CANNOT_EDIT
+            message['content'] = (body or {}).get('content', message['content'])
+            message['edited_timestamp'] = datetime.now(timezone.utc).isoformat()
+            self.stats['edited'] += 1
+            return 200, message
+        # React
+        for reaction in message['reactions']:
+            if reaction['emoji']['name'] == emoji:
+                if not reaction['me']:
+                    reaction['me'] = True
+                    reaction['count'] += 1
+                break
+        else:
+            message['reactions'].append({'emoji': {'id': None, 'name': emoji}, 'count': 1, 'me': True})
+        self.stats['reacted'] += 1
+        return 204, None
+
+    def handle(self, method: str, path: str, query: Dict[str, List[str]],
+               body: Optional[Dict]) -> Tuple[int, object, Dict[str, str]]:
+        """Route a request; returns status, JSON body and extra headers"""
+        if path == '/_mock/stats':
+            return 200, dict(self.stats, own_messages_left=self.own_left()), {}
+        if not path.startswith(API_PREFIX):
+            return 404, {'message': '404: Not Found', 'code': 0}, {}
+        parts = [unquote(p) for p in path[len(API_PREFIX):].strip('/').split('/')]
+
+        # Route name and major parameter (channel or guild ID) for the rate limiter
+        route, major = 'other', ''
+        if parts[-2:] == ['messages', 'search']:
+            route, major = 'search', parts[1]
+        elif parts[0] == 'channels' and len(parts) == 3 and parts[2] == 'messages':
+            route, major = 'history', parts[1]
+        elif parts[0] == 'channels' and len(parts) >= 4 and parts[2] == 'messages':
+            major = parts[1]
+            if len(parts) == 7 and parts[4] == 'reactions':
+                route = 'react'
+            else:
+                route = {'DELETE': 'delete', 'PATCH': 'edit'}.get(method, 'other')
+        self.stats['requests'][route] = self.stats['requests'].get(route, 0) + 1
+
+        limited, headers = self.check_rate(route, major)
+        if limited is not None:
+            return 429, limited, headers
+
+        if parts[0] == 'users' and parts[1] == '@me':
+            if len(parts) == 2:
+                return 200, self.me, headers
+            if parts[2:] == ['guilds']:
+                return 200, [{'id': g['id'], 'name': g['name']} for g in self.guilds], headers
+            if parts[2:] == ['channels']:
+                return 200, [c for c in self.channels.values() if c['type'] in (1, 3)], headers
+            if len(parts) == 5 and parts[2] == 'guilds' and parts[4] == 'member':
+                guild = next((g for g in self.guilds if g['id'] == parts[3]), None)
+                if guild is None:
+                    return 404, {'message': 'Unknown Guild', 'code': 10004}, headers
+                return 200, {'joined_at': guild['joined_at'], 'user': self.me}, headers
+
+        if parts[0] == 'guilds' and len(parts) >= 3:
+            guild_channels = [c for c in self.channels.values() if c.get('guild_id') == parts[1]]
+            if not guild_channels:
+                return 404, {'message': 'Unknown Guild', 'code': 10004}, headers
+            if parts[2:] == ['channels']:
+                return 200, [c for c in guild_channels if c['type'] != 11], headers
+            if route == 'search':
+                wanted = query.get('channel_id') or [c['id'] for c in guild_channels]
+                channel_ids = [c for c in wanted if self.channels.get(c, {}).get('guild_id') == parts[1]]
+                status, payload = self.search(parts[1], channel_ids, query)
+                return status, payload, headers
+
+        if parts[0] == 'channels' and len(parts) >= 3:
+            channel_id = parts[1]
+            channel = self.channels.get(channel_id)
+            if channel is None:
+                return 404, {'message': 'Unknown Channel', 'code': 10003}, headers
+            if route == 'search':
+                status, payload = self.search(channel_id, [channel_id], query)
+                return status, payload, headers
+            if route == 'history' and method == 'GET':
+                status, payload = self.history(channel_id, query)
+                return status, payload, headers
+            if parts[2:] == ['pins'] and method == 'GET':
+                live = self.messages[channel_id]
+                return 200, [live[m] for m in self.order[channel_id]
+                             if m in live and live[m]['pinned']], headers
+            if route in ('delete', 'edit', 'react'):
+                emoji = parts[5] if route == 'react' else None
+                if route == 'react' and emoji not in MEOW_REACTIONS:
+                    return 400, {'message': 'Unknown Emoji', 'code': 10014}, headers
+                status, payload = self.act(route, channel_id, parts[3], body, emoji)
+                return status, payload, headers
+
+        return 404, {'message': '404: Not Found', 'code': 0}, headers
+
+    def write_config(self, path: str):
+        """Write a Paracord config that targets every generated channel and DM"""
+        targets = []
+        for guild in self.guilds:
+            for channel in self.channels.values():
+                if channel.get('guild_id') == guild['id'] and channel['type'] == 0:
+                    targets.append({'type': 'guild', 'guild_id': guild['id'],
+                                    'guild_name': guild['name'], 'channel_id': channel['id'],
+                                    'channel_name': channel['name']})
+            if self.args.archived_threads:
+                # Threads are only reachable through a whole-server search
+                targets.append({'type': 'guild_all', 'guild_id': guild['id'],
+                                'guild_name': guild['name']})
+        for channel in self.channels.values():
+            if channel['type'] == 1:
+                targets.append({'type': 'dm', 'channel_id': channel['id'],
+                                'recipient_name': channel['recipients'][0]['username']})
+            elif channel['type'] == 3:
+                targets.append({'type': 'group_dm', 'channel_id': channel['id'],
+                                'group_name': channel['name']})
+
+        search_limit, search_per = self.limits['search']
+        delete_limit, delete_per = self.limits['delete']
+        config = {
+            '_comment': f"Generated by mock_discord.py (seed {self.args.seed}); "
+                        f"point DISCORD_API_BASE at the mock server",
+            'author_id': self.me['id'],
+            'settings': {
+                'search_delay': round(search_per / search_limit, 3),
+                'delete_delay': round(delete_per / delete_limit, 3),
+                'skip_pinned': True,
+                'skip_meowed': False,
+                'max_retries': 3,
+            },
+            'targets': targets,
+        }
+        with open(path, 'w') as f:
+            json.dump(config, f, indent=2)
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    server_version = "MockDiscord/1.0"
+    mock: MockDiscord = None  # Set by main()
+
+    def respond(self, method: str):
+        url = urlparse(self.path)
+        body = None
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            try:
+                body = json.loads(self.rfile.read(length))
+            except ValueError:
+                body = None
+
+        if url.path != '/_mock/stats' and not self.headers.get('Authorization'):
+            status, payload, headers = 401, {'message': '401: Unauthorized', 'code': 0}, {}
+        else:
+            with self.mock.lock:
+                status, payload, headers = self.mock.handle(method, url.path, parse_qs(url.query), body)
+
+        data = b'' if status == 204 else json.dumps(payload).encode()
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != 204:
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self.respond('GET')
+
+    def do_DELETE(self):
+        self.respond('DELETE')
+
+    def do_PATCH(self):
+        self.respond('PATCH')
+
+    def do_PUT(self):
+        self.respond('PUT')
+
+    def log_message(self, format, *args):
+        if self.mock.args.verbose:
+            super().log_message(format, *args)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Command line options; MockDiscord takes the parsed namespace"""
+    parser = argparse.ArgumentParser(
+        description='Mock Discord API for offline Paracord runs and benchmarks',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+    # Serve the default data set and write a config that targets all of it
+    python3 mock_discord.py --write-config mock_config.json
+
+    # In another terminal: run Paracord against the mock
+    DISCORD_API_BASE=http://127.0.0.1:8765/api/v9 DISCORD_TOKEN=mock \\
+        python3 paracord.py --config mock_config.json --yes --pacing buckets
+
+    # Real-time rate limits, 30s of index lag and a 20s indexing delay
+    python3 mock_discord.py --time-scale 1 --index-lag 30 --index-delay 20
+
+    # Override one bucket: 10 deletes per second
+    python3 mock_discord.py --limit delete=10/1
+        """
+    )
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on (default: 8765)')
+    parser.add_argument('--seed', type=int, default=1, help='Seed for the generated data (default: 1)')
+    parser.add_argument('--guilds', type=int, default=2, help='Servers to generate (default: 2)')
+    parser.add_argument('--channels', type=int, default=3, help='Text channels per server (default: 3)')
+    parser.add_argument('--dms', type=int, default=3, help='DM channels (default: 3)')
+    parser.add_argument('--group-dms', type=int, default=1, help='Group DMs (default: 1)')
+    parser.add_argument('--messages', type=int, default=200, help='Messages per channel (default: 200)')
+    parser.add_argument('--own-ratio', type=float, default=0.5,
+                        help='Share of messages that are ours (default: 0.5)')
+    parser.add_argument('--pinned-ratio', type=float, default=0.02,
+                        help='Share of messages that are pinned (default: 0.02)')
+    parser.add_argument('--days', type=float, default=365, help='Days of history (default: 365)')
+    parser.add_argument('--forbidden-channels', type=int, default=0,
+                        help='Channels per server where our actions answer 403 (default: 0)')
+    parser.add_argument('--archived-threads', type=int, default=0,
+                        help='Archived threads per server, answering 50083 (default: 0)')
+    parser.add_argument('--denied-ratio', type=float, default=0.0,
+                        help='Share of our messages that answer 403 on their own (default: 0)')
+    parser.add_argument('--index-delay', type=float, default=0.0,
+                        help='Seconds until a channel\'s search index is ready; 202 before that (default: 0)')
+    parser.add_argument('--index-lag', type=float, default=5.0,
+                        help='Seconds deleted messages stay in search results as ghosts (default: 5)')
+    parser.add_argument('--time-scale', type=float, default=0.1,
+                        help='Multiplier for every rate limit window; 1 is Discord speed (default: 0.1)')
+    parser.add_argument('--limit', action='append', metavar='ROUTE=N/SECONDS',
+                        help='Override a bucket (routes: ' + ', '.join(DEFAULT_LIMITS) + '); repeatable')
+    parser.add_argument('--global-rate', type=int, default=50,
+                        help='Requests per second across all routes, 0 for none (default: 50)')
+    parser.add_argument('--write-config', metavar='FILE',
+                        help='Write a Paracord config that targets every generated channel')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Log every request')
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+
+    mock = MockDiscord(args)
+    if args.write_config:
+        mock.write_config(args.write_config)
+        print(f"Config written: {args.write_config}")
+
+    MockHandler.mock = mock
+    server = ThreadingHTTPServer((args.host, args.port), MockHandler)
+    print(f"Mock Discord API on http://{args.host}:{args.port}{API_PREFIX} "
+          f"({len(mock.channels)} channels, {mock.own_left()} of our messages)")
+    print(f"  export DISCORD_API_BASE=http://{args.host}:{args.port}{API_PREFIX}")
+    print(f"  Stats: http://{args.host}:{args.port}/_mock/stats")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(dict(mock.stats, own_messages_left=mock.own_left()), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -17,16 +17,29 @@ Usage:
 """
 
 import argparse
+import asyncio
+import csv
+import hashlib
+import io
+import bisect
+import heapq
 import json
 import logging
+import mmap
 import os
 import random
 import signal
 import sys
+import threading
 import time
+import zipfile
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from urllib.parse import quote, urlencode
 
 try:
@@ -36,6 +49,11 @@ except ImportError:
     print("Install it with: pip3 install requests")
     sys.exit(1)
 
+try:
+    import aiohttp  # Optional: only needed for --engine async
+except ImportError:
+    aiohttp = None
+
 __version__ = "3.8.0"
 
 # Console colors (ANSI escape codes, works on most terminals)
@@ -51,26 +69,83 @@ class Colors:
     UNDERLINE = '\033[4m'
 
 # Constants
-DISCORD_API_BASE = "https://discord.com/api/v9"
+DEFAULT_API_BASE = "https://discord.com/api/v9"
+# Overridable from the environment, e.g. to run against mock_discord.py
+DISCORD_API_BASE = os.environ.get('DISCORD_API_BASE', DEFAULT_API_BASE).rstrip('/')
 PROGRESS_FILE = ".paracord_progress.json"
+PROCESSED_INDEX_FILE = ".paracord_processed.idx"  # Sorted uint64 message IDs
+PROCESSED_LOG_FILE = ".paracord_processed.log"    # IDs appended since the last compaction
+PACING_FILE = ".paracord_pacing.json"  # Delays learned by adaptive pacing
+FAILED_QUEUE_FILE = ".paracord_failed.ndjson"  # Failed actions retried by the drain phase
+SKIP_CACHE_FILE = ".paracord_skipped.json"  # Messages and channels we cannot act on
+RETENTION_FILE = ".paracord_retention.json"  # Per-target water marks for --retain-days
+REACT_JOURNAL_FILE = ".paracord_reacted.ndjson"  # IDs reacted to, replayed by the meow phase
 LOG_FILE = "paracord.log"
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 MEOW_TEXT = "**MEOW, MEOW.**\n**MEOW, MEOW.**\n**MEOW, MEOW.**\n**MEOW, MEOW.**"
 MEOW_LABEL = "**MEOW, MEOW.** (x4)"  # Short display label for terminal output
 MEOW_MODES = ("off", "edit_and_delete", "edit_only", "react_only")
 MEOW_REACTIONS = ("🐭", "🐁")  # Randomly chosen per message in meow mode
+KNOWN_ID_BATCH = 25  # Known message IDs processed per batch (same as a search page)
+PLAN_VERSION = 1
+PACING_MODES = ("fixed", "buckets", "adaptive")
+ENUMERATORS = ("auto", "search", "history")
+HISTORY_PAGE = 100  # Messages per channel history call (API maximum)
+VERIFY_CALLS = 2  # History calls per channel when pre-verifying a page for ghosts
+GHOST_WINDOW = 4  # Recent batches whose ghost ratio decides on pre-verification
+INDEX_RETRIES = 10  # 202 "not indexed" answers before a channel is given up on
+MAX_EMPTY_PAGES = 3  # Consecutive empty pages (with results reported) before a target ends
+FAILED_DRAIN_ROUNDS = 3  # Passes over the failed queue at the end of a run
+FAILED_DRAIN_BACKOFF = 30  # Seconds before the second drain pass (doubles each pass)
+SKIP_CHANNEL_AFTER = 5  # Consecutive 403s in a channel (no success between) that give up on it
+DISCORD_EPOCH = 1420070400000  # First second of 2015, in ms; snowflake timestamps count from here
+ENGINES = ("sync", "async")
+WINDOW_ORDERS = ("interleave", "newest", "oldest")
+
+# A search scope: one channel, several channels of a guild, or None (whole guild)
+ChannelScope = Optional[Union[str, List[str]]]
+
+# Name of the target the current task is working on (set in parallel mode)
+TARGET_LABEL = ContextVar('target_label', default='')
+
+# Meow mode of the current target (a plan target's action, or its react_delay phase),
+# overriding the setting
+MEOW_PHASE = ContextVar('meow_phase', default=None)
+
+# target_key() of the target whose react phase is running (its reactions are journaled)
+JOURNAL_TARGET = ContextVar('journal_target', default=None)
+
+# Rate limit routes (Discord buckets are keyed by route + major parameter)
+ROUTE_SEARCH_GUILD = "GET /guilds/{guild_id}/messages/search"
+ROUTE_SEARCH_CHANNEL = "GET /channels/{channel_id}/messages/search"
+ROUTE_HISTORY = "GET /channels/{channel_id}/messages"
+ROUTE_PINS = "GET /channels/{channel_id}/pins"
+ROUTE_MEMBER = "GET /users/@me/guilds/{guild_id}/member"
+ROUTE_DELETE = "DELETE /channels/{channel_id}/messages/{message_id}"
+ROUTE_EDIT = "PATCH /channels/{channel_id}/messages/{message_id}"
+ROUTE_REACT = "PUT /channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me"
+PIPELINED_ROUTES = (ROUTE_REACT, ROUTE_EDIT, ROUTE_DELETE)  # Overlapped by pipeline_actions
+
+# Endpoint classes for adaptive pacing, each with its own learned delay
+PACE_SEARCH = "search"  # Starts from search_delay
+PACE_ACTION = "action"  # Delete, edit and react; starts from delete_delay
+PACE_CLASSES = {'search': PACE_SEARCH, 'delete': PACE_ACTION, 'edit': PACE_ACTION,
+                'react': PACE_ACTION}  # api_request label -> class; other reads are not paced
 
 class ProgressBar:
     """Simple progress bar for terminal display"""
     
-    def __init__(self, total: int, prefix: str = '', length: int = 50):
+    def __init__(self, total: int, prefix: str = '', length: int = 50, quiet: bool = False):
         self.total = total
         self.prefix = prefix
         self.length = length
+        self.quiet = quiet  # Track progress without drawing (parallel output)
         self.current = 0
         
     def update(self, current: int):
         self.current = current
+        if self.quiet:
+            return
         percent = 100 * (self.current / float(self.total))
         filled = int(self.length * self.current // self.total)
         bar = '█' * filled + '░' * (self.length - filled)
@@ -84,14 +159,806 @@ class ProgressBar:
         self.update(self.total)
 
 
+class RateLimiter:
+    """Per-route rate limit tracker driven by Discord's X-RateLimit headers.
+    
+    Discord maps every route to a bucket (X-RateLimit-Bucket) which is further
+    scoped by the route's major parameter (channel or guild ID). Each response
+    reports how many requests are left in that bucket and when it resets, so
+    requests can be paced to exactly what the bucket allows instead of a fixed
+    sleep. A 429 blocks only its own bucket, unless Discord marks it global.
+    """
+    
+    def __init__(self, backoff: float = 2.0, global_rate: float = 50.0):
+        self.backoff = backoff        # Multiplier applied to retry_after on 429
+        self.global_rate = global_rate  # Requests per second across all routes
+        self.route_buckets = {}       # route -> bucket hash
+        self.buckets = {}             # (bucket, major) -> bucket state
+        self.global_until = 0.0       # monotonic time when a global 429 expires
+        self.next_global_slot = 0.0   # monotonic time of the next free global slot
+        self.lock = threading.Lock()
+    
+    def _key(self, route: str, major: str) -> Tuple[str, str]:
+        # Until Discord tells us the bucket hash, the route itself is the bucket
+        return (self.route_buckets.get(route, route), major)
+    
+    def reserve(self, route: str, major: str) -> float:
+        """Claim a request slot and return how many seconds to wait before sending.
+        
+        The wait is the longer of the bucket's wait and the global slot's.
+        The global slot is claimed from now, so one exhausted bucket never
+        holds back requests on other routes or channels.
+        """
+        with self.lock:
+            now = time.monotonic()
+            bucket_wait = 0.0
+            state = self.buckets.get(self._key(route, major))
+            if state is not None:
+                if state['reset_at'] <= now:
+                    # Bucket window has rolled over since the last response
+                    state['remaining'] = state['limit']
+                    state['reset_at'] = now + state['reset_after']
+                
+                if state['remaining'] <= 0:
+                    # Exhausted: wait for the reset, then assume a fresh window
+                    state['opens_at'] = state['reset_at']
+                    state['remaining'] = state['limit']
+                    state['reset_at'] += state['reset_after']
+                # Slots of a window that hasn't opened yet (concurrent claims) wait for it too
+                bucket_wait = max(0.0, state.get('opens_at', 0.0) - now)
+                state['remaining'] -= 1
+            
+            return max(bucket_wait, self._claim_global_slot(now))
+    
+    def capacity(self, route: str, major: str) -> int:
+        """Requests the route's bucket allows per window (1 until Discord has said)"""
+        with self.lock:
+            state = self.buckets.get(self._key(route, major))
+            return max(1, state['limit']) if state else 1
+    
+    def _claim_global_slot(self, now: float) -> float:
+        # One global budget shared by every route (and every parallel target);
+        # only a global 429 pushes it back
+        wait = max(0.0, self.global_until - now)
+        if self.global_rate <= 0:
+            return wait
+        slot = max(now + wait, self.next_global_slot)
+        self.next_global_slot = slot + 1.0 / self.global_rate
+        return slot - now
+    
+    def observe(self, route: str, major: str, status: int, headers,
+                payload: Optional[Dict] = None) -> float:
+        """Update bucket state from a response.
+        
+        Returns the number of seconds the route is blocked for when the
+        response was a 429, otherwise 0.
+        """
+        with self.lock:
+            now = time.monotonic()
+            bucket = headers.get('X-RateLimit-Bucket')
+            if bucket:
+                self.route_buckets[route] = bucket
+            key = self._key(route, major)
+            
+            if 'X-RateLimit-Remaining' in headers and 'X-RateLimit-Reset-After' in headers:
+                try:
+                    reset_after = float(headers['X-RateLimit-Reset-After'])
+                    remaining = int(headers['X-RateLimit-Remaining'])
+                    state = self.buckets.get(key)
+                    if state is not None and state.get('opens_at', 0.0) > now:
+                        pass  # Slots of the next window are claimed; this answer is from the last one
+                    else:
+                        if state is not None and state['reset_at'] > now:
+                            # Same window: slots claimed for requests still in flight
+                            # are not in this response's count yet
+                            remaining = min(remaining, state['remaining'])
+                        self.buckets[key] = {
+                            'limit': int(headers.get('X-RateLimit-Limit', 1)),
+                            'remaining': remaining,
+                            'reset_after': reset_after,
+                            'reset_at': now + reset_after,
+                        }
+                except ValueError:
+                    pass
+            
+            if status != 429:
+                return 0.0
+            
+            payload = payload or {}
+            retry_after = payload.get('retry_after')
+            if retry_after is None:
+                retry_after = float(headers.get('Retry-After', 5))
+            wait_time = float(retry_after) * self.backoff
+            
+            scope = headers.get('X-RateLimit-Scope', 'user')
+            if payload.get('global') or headers.get('X-RateLimit-Global') == 'true' or scope == 'global':
+                self.global_until = max(self.global_until, now + wait_time)
+            else:
+                state = self.buckets.setdefault(key, {
+                    'limit': 1, 'remaining': 0, 'reset_after': wait_time, 'reset_at': now
+                })
+                state['remaining'] = 0
+                state['reset_at'] = max(state['reset_at'], now + wait_time)
+            return wait_time
+
+
+class InFlightGate:
+    """Caps the action requests in flight per rate limit bucket.
+    
+    With pipeline_actions, the react/edit/delete chains of several messages
+    in a channel run at once. Every request first takes a slot for its
+    route and channel. A bucket gets as many slots as its X-RateLimit-Limit
+    (one until the first response has reported it), and the RateLimiter
+    still spaces the requests to what is Remaining in the current window.
+    """
+    
+    def __init__(self, rate_limiter: RateLimiter):
+        self.rate_limiter = rate_limiter
+        self.in_flight = {}   # (route, major) -> requests sent and not answered yet
+        self.changed = None   # asyncio.Condition, created on the engine's event loop
+    
+    def depth(self, major: str) -> int:
+        """Message chains worth running at once in a channel"""
+        return max(self.rate_limiter.capacity(route, major) for route in PIPELINED_ROUTES)
+    
+    async def acquire(self, route: str, major: str):
+        if self.changed is None:
+            self.changed = asyncio.Condition()
+        key = (route, major)
+        async with self.changed:
+            await self.changed.wait_for(
+                lambda: self.in_flight.get(key, 0) < self.rate_limiter.capacity(route, major))
+            self.in_flight[key] = self.in_flight.get(key, 0) + 1
+    
+    async def release(self, route: str, major: str):
+        async with self.changed:
+            self.in_flight[(route, major)] -= 1
+            self.changed.notify_all()  # Slots free up, and the limit may be known now
+
+
+class AdaptivePacer:
+    """AIMD controller for the delay between requests of each endpoint class.
+    
+    Every successful request shortens the class's delay by a fixed step
+    (additive increase of the request rate); a 429 doubles it
+    (multiplicative decrease). The delay stays between its floor and
+    ceiling, and learned delays are saved to PACING_FILE so the next run
+    starts at the tuned rate instead of the configured defaults.
+    
+    Thread-safe: background searches (search_prefetch) report to it from
+    their worker thread.
+    """
+    
+    STEPS = 50       # Successes needed to walk the configured delay down to zero
+    PENALTY = 2.0    # Delay multiplier on a 429
+    
+    def __init__(self, start: Dict[str, float], floor: Dict[str, float],
+                 ceiling: Dict[str, float]):
+        # A floor never sits above the configured delay, nor a ceiling below it
+        self.floor = {cls: min(floor[cls], delay) for cls, delay in start.items()}
+        self.ceiling = {cls: max(ceiling[cls], delay) for cls, delay in start.items()}
+        self.step = {cls: delay / self.STEPS for cls, delay in start.items()}
+        self.delays = {}
+        self.lock = threading.Lock()
+        
+        saved = {}
+        if Path(PACING_FILE).exists():
+            try:
+                with open(PACING_FILE, 'r') as f:
+                    saved = json.load(f).get('delays', {})
+            except (OSError, ValueError):
+                saved = {}
+        for cls, delay in start.items():
+            self.delays[cls] = self.clamp(cls, saved.get(cls, delay))
+        self.resumed = bool(saved)
+    
+    def clamp(self, cls: str, delay: float) -> float:
+        return min(self.ceiling[cls], max(self.floor[cls], delay))
+    
+    def delay(self, cls: str) -> float:
+        return self.delays[cls]
+    
+    def success(self, cls: str):
+        with self.lock:
+            self.delays[cls] = self.clamp(cls, self.delays[cls] - self.step[cls])
+    
+    def penalize(self, cls: str) -> float:
+        """Back off after a 429; returns the new delay"""
+        with self.lock:
+            self.delays[cls] = self.clamp(cls, max(self.delays[cls], self.step[cls]) * self.PENALTY)
+            return self.delays[cls]
+    
+    def save(self):
+        with self.lock:
+            delays = {cls: round(delay, 3) for cls, delay in self.delays.items()}
+            fd = os.open(PACING_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            os.fchmod(fd, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump({
+                    'delays': delays,
+                    'timestamp': datetime.now().isoformat()
+                }, f, indent=2)
+
+
+class TargetLabelFilter(logging.Filter):
+    """Adds the current target (parallel mode) to log records as %(target)s"""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        label = TARGET_LABEL.get()
+        record.target = f"[{label}] " if label else ''
+        return True
+
+
+class ProcessedIndex:
+    """Persistent set of message IDs that never need another request.
+    
+    Holds IDs that were deleted, came back as ghosts, or were permanently
+    rejected. Snowflakes are never reused, so an ID in here is safe to skip
+    in every later pass and run.
+    
+    The index is a sorted file of native-endian uint64s that is memory-mapped
+    and binary-searched, so lookups cost no memory however large it grows.
+    New IDs are appended to a small log (8 bytes each, flushed immediately so
+    an interrupted run keeps them) and merged into the sorted file by
+    compact(), which runs on open when the log is large and on close.
+    """
+    
+    COMPACT_AT = 100_000  # Log entries that trigger a compaction on open
+    
+    def __init__(self, index_path: str = PROCESSED_INDEX_FILE,
+                 log_path: str = PROCESSED_LOG_FILE):
+        self.index_path = index_path
+        self.log_path = log_path
+        self.recent = set()  # IDs in the append log
+        self.mm = None
+        self.ids = None      # uint64 view of the mapped index file
+        
+        if Path(log_path).exists():
+            logged = array('Q')
+            with open(log_path, 'rb') as f:
+                data = f.read()
+            # Ignore a partial trailing record from an interrupted write
+            logged.frombytes(data[:len(data) - len(data) % logged.itemsize])
+            self.recent.update(logged)
+        self._map()
+        if len(self.recent) >= self.COMPACT_AT:
+            self.compact()
+        
+        fd = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+        os.fchmod(fd, 0o600)
+        self.log = os.fdopen(fd, 'ab')
+    
+    def _unmap(self):
+        if self.ids is not None:
+            self.ids.release()
+            self.mm.close()
+            self.ids = self.mm = None
+    
+    def _map(self):
+        """Memory-map the sorted index file (if it has any entries)"""
+        self._unmap()
+        if Path(self.index_path).exists() and os.path.getsize(self.index_path) >= 8:
+            with open(self.index_path, 'rb') as f:
+                self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            usable = len(self.mm) - len(self.mm) % 8
+            self.ids = memoryview(self.mm)[:usable].cast('Q')
+    
+    def __contains__(self, message_id) -> bool:
+        value = int(message_id)
+        if value in self.recent:
+            return True
+        if self.ids is None:
+            return False
+        i = bisect.bisect_left(self.ids, value)
+        return i < len(self.ids) and self.ids[i] == value
+    
+    def __len__(self) -> int:
+        return len(self.recent) + (len(self.ids) if self.ids is not None else 0)
+    
+    def add(self, message_id):
+        """Record a processed message ID (durable as soon as this returns)"""
+        value = int(message_id)
+        if value in self:
+            return
+        self.recent.add(value)
+        self.log.write(array('Q', [value]).tobytes())
+        self.log.flush()
+    
+    def compact(self):
+        """Merge the append log into the sorted index file and empty the log.
+        
+        Streams the merge: runs of the mapped index between two logged IDs
+        are copied to the new file as they are, so only the log is ever
+        held in memory. IDs already in the index are not written twice.
+        """
+        if not self.recent:
+            return
+        ids = self.ids if self.ids is not None else memoryview(array('Q'))
+        tmp_path = self.index_path + '.tmp'
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.fchmod(fd, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            start = 0
+            for value in sorted(self.recent):
+                i = bisect.bisect_left(ids, value, start)
+                f.write(ids[start:i])
+                start = i
+                if i == len(ids) or ids[i] != value:
+                    f.write(array('Q', [value]).tobytes())
+            f.write(ids[start:])
+        self._unmap()
+        os.replace(tmp_path, self.index_path)
+        self._map()
+        self.recent.clear()
+        with open(self.log_path, 'wb'):
+            pass
+    
+    def close(self):
+        """Compact and release the index"""
+        self.compact()
+        self.log.close()
+        self._unmap()
+
+
+class FailedQueue:
+    """Durable queue of message actions that failed and still need doing.
+    
+    A failed delete (or edit/react in the edit-only and react-only modes)
+    would otherwise be lost once the search cursor moves past it. Entries
+    are NDJSON lines of {"c": channel_id, "m": message_id, "a": action,
+    "e": error}, appended and flushed as they happen. The drain phase
+    retries them directly, without searching; close() rewrites the file
+    with whatever is still unresolved.
+    """
+    
+    def __init__(self, path: str = FAILED_QUEUE_FILE):
+        self.path = path
+        self.entries = {}  # message_id -> entry; a later line for an ID wins
+        
+        if Path(path).exists():
+            with open(path, 'r') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        self.entries[entry['m']] = entry
+                    except (ValueError, KeyError, TypeError):
+                        continue  # Partial line from an interrupted write
+        
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+        os.fchmod(fd, 0o600)
+        self.log = os.fdopen(fd, 'a')
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def add(self, channel_id: str, message_id: str, action: str, error: str):
+        """Queue a failed action (durable as soon as this returns)"""
+        entry = {'c': channel_id, 'm': message_id, 'a': action, 'e': error}
+        self.entries[message_id] = entry
+        self.log.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        self.log.flush()
+    
+    def resolve(self, message_id: str):
+        """Drop an entry that no longer needs retrying"""
+        self.entries.pop(message_id, None)
+    
+    def close(self):
+        """Rewrite the file with the unresolved entries (remove it if none)"""
+        self.log.close()
+        if not self.entries:
+            Path(self.path).unlink(missing_ok=True)
+            return
+        tmp_path = self.path + '.tmp'
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.fchmod(fd, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            for entry in self.entries.values():
+                f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        os.replace(tmp_path, self.path)
+
+
+class SkipCache:
+    """Messages and channels that cannot be acted on, remembered between runs.
+    
+    A message that answers 403 is cached by ID. A channel is cached when it
+    turns out to be an archived thread (error 50083), or after
+    SKIP_CHANNEL_AFTER 403s in a row with no success in between. Cached
+    hits are dropped before any request is made, and a cached channel is
+    left alone for the rest of the run and in later runs. Delete the file
+    to try everything again (e.g. after a thread is unarchived).
+    """
+    
+    def __init__(self, path: str = SKIP_CACHE_FILE):
+        self.path = path
+        self.messages = set()
+        self.channels = {}  # channel_id -> reason
+        self.denials = {}   # channel_id -> consecutive 403s this run
+        self.dirty = False
+        
+        if Path(path).exists():
+            try:
+                with open(path, 'r') as f:
+                    saved = json.load(f)
+                self.messages.update(saved.get('messages', []))
+                self.channels.update(saved.get('channels', {}))
+            except (OSError, ValueError):
+                pass
+    
+    def __contains__(self, msg: Dict) -> bool:
+        return msg['id'] in self.messages or msg.get('channel_id') in self.channels
+    
+    def skip_channel(self, channel_id: str, reason: str):
+        self.channels.setdefault(channel_id, reason)
+        self.dirty = True
+    
+    def denied(self, channel_id: str, message_id: str) -> bool:
+        """Record a 403; returns True if this made the channel hopeless.
+        
+        A message counts once toward the channel's streak, even when both
+        its edit and its delete are refused.
+        """
+        if message_id in self.messages:
+            return False
+        self.messages.add(message_id)
+        self.dirty = True
+        self.denials[channel_id] = self.denials.get(channel_id, 0) + 1
+        if self.denials[channel_id] >= SKIP_CHANNEL_AFTER and channel_id not in self.channels:
+            self.channels[channel_id] = f"{SKIP_CHANNEL_AFTER} requests in a row forbidden (403)"
+            return True
+        return False
+    
+    def allowed(self, channel_id: str):
+        """Record a successful action, which resets the channel's 403 streak"""
+        self.denials.pop(channel_id, None)
+    
+    def save(self):
+        if not self.dirty:
+            return
+        fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.fchmod(fd, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump({
+                'channels': self.channels,
+                'messages': sorted(self.messages, key=int),
+                'timestamp': datetime.now().isoformat()
+            }, f, indent=2)
+        self.dirty = False
+
+
+class ReactJournal:
+    """Messages each target's react phase went through, for its meow phase.
+    
+    In react_delay runs, phase 2 edits/deletes straight from the journal
+    instead of searching the target again. Entries are NDJSON lines of
+    {"t": target_key, "c": channel_id, "m": message_id, "r": reacted,
+    "w": meowed}, appended and flushed as the react phase goes; "r" is false
+    for messages whose reaction did not go through, "w" is true for messages
+    that were already meowed. A line with only "t" starts that
+    target's journal over. close() rewrites the file with the targets
+    that are still unfinished.
+    """
+    
+    def __init__(self, path: str = REACT_JOURNAL_FILE):
+        self.path = path
+        self.targets = {}  # target_key -> {message_id: (channel_id, reacted, meowed)}, in react order
+        
+        if Path(path).exists():
+            with open(path, 'r') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        if 'm' in entry:
+                            self.targets.setdefault(entry['t'], {})[entry['m']] = (
+                                entry['c'], entry.get('r', False), entry.get('w', False))
+                        else:
+                            self.targets[entry['t']] = {}
+                    except (ValueError, KeyError, TypeError):
+                        continue  # Partial line from an interrupted write
+        
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+        os.fchmod(fd, 0o600)
+        self.log = os.fdopen(fd, 'a')
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self.targets
+    
+    def _write(self, entry: Dict):
+        self.log.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        self.log.flush()
+    
+    def start(self, key: str):
+        """Begin a target's journal, dropping anything from an earlier react phase"""
+        self.targets[key] = {}
+        self._write({'t': key})
+    
+    def add(self, key: str, channel_id: str, message_id: str, reacted: bool,
+            meowed: bool = False):
+        """Journal a message (durable as soon as this returns)"""
+        self.targets.setdefault(key, {})[message_id] = (channel_id, reacted, meowed)
+        self._write({'t': key, 'c': channel_id, 'm': message_id, 'r': reacted, 'w': meowed})
+    
+    def messages(self, key: str) -> List[Dict]:
+        """A target's journaled messages, in the order the react phase went through them.
+        
+        Already meowed messages carry MEOW_TEXT as their content, as in a search hit.
+        """
+        messages = []
+        for message_id, (channel_id, reacted, meowed) in self.targets.get(key, {}).items():
+            msg = {'id': message_id, 'channel_id': channel_id, 'reacted': reacted}
+            if meowed:
+                msg['content'] = MEOW_TEXT
+            messages.append(msg)
+        return messages
+    
+    def drop(self, key: str):
+        """Forget a finished target"""
+        self.targets.pop(key, None)
+    
+    def close(self):
+        """Rewrite the file with the unfinished targets (remove it if none)"""
+        self.log.close()
+        if not self.targets:
+            Path(self.path).unlink(missing_ok=True)
+            return
+        tmp_path = self.path + '.tmp'
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.fchmod(fd, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            for key, messages in self.targets.items():
+                f.write(json.dumps({'t': key}, separators=(',', ':')) + '\n')
+                for message_id, (channel_id, reacted, meowed) in messages.items():
+                    entry = {'t': key, 'c': channel_id, 'm': message_id, 'r': reacted, 'w': meowed}
+                    f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        os.replace(tmp_path, self.path)
+
+
+def has_own_reaction(msg: Dict) -> bool:
+    """True if the message already carries one of our mouse reactions.
+    
+    Search and history payloads list reactions with a 'me' flag; messages
+    replayed from the react journal are marked 'reacted' instead.
+    """
+    if msg.get('reacted'):
+        return True
+    return any(reaction.get('me') and (reaction.get('emoji') or {}).get('name') in MEOW_REACTIONS
+               for reaction in msg.get('reactions') or [])
+
+
+def target_name(target: Dict) -> str:
+    """Human-readable name for a config target"""
+    if 'window' in target:
+        index, count = target['window']
+        return f"{target_name({k: v for k, v in target.items() if k != 'window'})} [window {index}/{count}]"
+    if target['type'] == 'guild':
+        return f"#{target['channel_name']} ({target['guild_name']})"
+    elif target['type'] == 'dm':
+        return f"DM: @{target['recipient_name']}"
+    elif target['type'] == 'group_dm':
+        return f"Group: {target['group_name']}"
+    elif target['type'] == 'guild_all':
+        channel_ids = target.get('channel_ids')
+        scope = f"{len(channel_ids)} channels" if channel_ids else "All channels"
+        return f"{scope} ({target['guild_name']})"
+    return "Unknown"
+
+
+def search_scope(target: Dict) -> Tuple[str, ChannelScope]:
+    """Guild ID ("@me" for DMs) and channel scope to search for a target"""
+    # For DMs and Group DMs, use "@me" as guild_id
+    if target['type'] in ['dm', 'group_dm']:
+        return "@me", target['channel_id']
+    if target['type'] == 'guild_all':
+        # One search stream for the whole guild (or a set of its channels);
+        # hits are routed to per-channel queues by their own channel_id
+        return target['guild_id'], target.get('channel_ids') or None
+    return target['guild_id'], target['channel_id']
+
+
+def target_key(target: Dict, window: bool = True) -> str:
+    """Stable identifier for a config target, used in progress files.
+    
+    With window=False, a time window is identified by the target it was split from.
+    Plan targets (see read_plan) are split by action, which the key includes.
+    A guild_all target limited to some channels gets a digest of those
+    channels, so two subsets of one server keep separate progress.
+    """
+    if target['type'] == 'guild_all':
+        key = f"guild_all:{target['guild_id']}"
+        if target.get('channel_ids'):
+            channels = ','.join(sorted(target['channel_ids'], key=int))
+            key += f"#{hashlib.sha1(channels.encode()).hexdigest()[:12]}"
+    else:
+        key = f"{target['type']}:{target['channel_id']}"
+    if 'meow_mode' in target:
+        key += f"~{target['meow_mode']}"
+    if window and 'window' in target:
+        index, count = target['window']
+        key += f"@{index}/{count}"
+    return key
+
+
+def history_floor(target: Dict) -> int:
+    """Lowest snowflake a target's messages can have.
+    
+    Snowflakes embed their creation time, and no message is older than the
+    channel it was posted in (or, for a whole server, than the server).
+    """
+    if target['type'] == 'guild_all':
+        ids = target.get('channel_ids') or [target['guild_id']]
+        return min(int(i) for i in ids)
+    return int(target['channel_id'])
+
+
+def snowflake_at(timestamp: str) -> int:
+    """Smallest snowflake created at an ISO 8601 timestamp"""
+    moment = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    return (int(moment.timestamp() * 1000) - DISCORD_EPOCH) << 22
+
+
+def snowflake_ago(seconds: float = 0) -> int:
+    """Smallest snowflake created the given number of seconds ago"""
+    return (int((time.time() - seconds) * 1000) - DISCORD_EPOCH) << 22
+
+
+def window_edges(target: Dict, count: int) -> List[int]:
+    """Snowflakes splitting a target's range into equal time windows.
+    
+    The range is the target's lifetime (creation until now), narrowed to
+    its own min_id/max_id bounds if it has them (--retain-days).
+    """
+    low = max(history_floor(target), int(target.get('min_id', 0)))
+    high = int(target['max_id']) if 'max_id' in target else snowflake_ago()
+    return [low + (high - low) * k // count for k in range(count + 1)]
+
+
+def split_windows(target: Dict, edges: List[int]) -> List[Dict]:
+    """Split a search target into one target per time window, newest first.
+    
+    Each window is searched between its own min_id and max_id bounds and
+    has its own target_key, so it is checkpointed and resumed on its own.
+    The oldest window is open below and the newest open above.
+    """
+    count = len(edges) - 1
+    windows = []
+    for index in range(1, count + 1):
+        k = count - index  # Window 1 covers the newest slice
+        window = dict(target, window=[index, count])
+        if k > 0:
+            window['min_id'] = str(edges[k] - 1)
+        if k < count - 1:
+            window['max_id'] = str(edges[k + 1])
+        windows.append(window)
+    return windows
+
+
+def read_data_package(path: str) -> List[Dict]:
+    """Build per-channel targets from a Discord data package ("Request My Data").
+    
+    Reads messages/c<channel_id>/channel.json plus messages.csv or
+    messages.json straight from the zip without extracting it. Older
+    packages without the 'c' folder prefix are handled too.
+    
+    Returns:
+        One target per channel with at least one message, each carrying
+        'known_ids': our message IDs in that channel, newest first, and
+        'meowed_ids': those whose exported content is already MEOW_TEXT.
+    """
+    targets = []
+    with zipfile.ZipFile(path) as zf:
+        try:
+            index = json.loads(zf.read('messages/index.json'))
+        except KeyError:
+            index = {}
+        
+        # Group the per-channel files by folder
+        folders = {}
+        for name in zf.namelist():
+            parts = name.split('/')
+            if (len(parts) == 3 and parts[0] == 'messages' and
+                    parts[2] in ('channel.json', 'messages.csv', 'messages.json')):
+                folders.setdefault(parts[1], {})[parts[2]] = name
+        
+        for files in folders.values():
+            if 'channel.json' not in files:
+                continue
+            channel = json.loads(zf.read(files['channel.json']))
+            channel_id = str(channel['id'])
+            
+            rows = []
+            if 'messages.csv' in files:
+                with zf.open(files['messages.csv']) as raw:
+                    reader = csv.DictReader(io.TextIOWrapper(raw, encoding='utf-8', newline=''))
+                    rows = [row for row in reader if row.get('ID')]
+            elif 'messages.json' in files:
+                with zf.open(files['messages.json']) as raw:
+                    rows = [m for m in json.load(raw) if m.get('ID')]
+            if not rows:
+                continue
+            message_ids = sorted((str(row['ID']) for row in rows), key=int, reverse=True)
+            meowed_ids = [str(row['ID']) for row in rows if row.get('Contents') == MEOW_TEXT]
+            
+            label = index.get(channel_id) or channel_id
+            if channel.get('type') == 1:
+                target = {"type": "dm", "channel_id": channel_id,
+                          "recipient_name": label.replace("Direct Message with ", "")}
+            elif channel.get('type') == 3:
+                target = {"type": "group_dm", "channel_id": channel_id,
+                          "group_name": channel.get('name') or label}
+            else:
+                guild = channel.get('guild') or {}
+                target = {"type": "guild", "guild_id": guild.get('id'),
+                          "guild_name": guild.get('name', 'Unknown server'),
+                          "channel_id": channel_id, "channel_name": channel.get('name') or label}
+            target['known_ids'] = message_ids
+            target['meowed_ids'] = meowed_ids
+            targets.append(target)
+    
+    return targets
+
+
+def read_plan(path: str) -> Tuple[Dict, List[Dict]]:
+    """Read a plan file written by --dry-run --plan-out.
+    
+    The plan is NDJSON: a header line, one {"target": ...} line per target,
+    then one {"t": target_key, "c": channel_id, "m": message_id, "a": action}
+    line per message.
+    
+    Returns:
+        The header, and one known-ID target per (target, channel, action) in
+        plan order, ready for process_known_target. Each target's
+        'meow_mode' is the action of its lines ('delete' becomes 'off').
+    """
+    header = {}
+    target_meta = {}
+    groups = {}  # (target key, channel_id, action) -> message IDs
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if 'plan' in record:
+                header = record
+            elif 'target' in record:
+                target_meta[target_key(record['target'])] = record['target']
+            else:
+                groups.setdefault((record['t'], record['c'], record.get('a')), []).append(record['m'])
+    
+    targets = []
+    for (key, channel_id, action), message_ids in groups.items():
+        target = dict(target_meta.get(key, {"type": "guild", "guild_name": "Unknown server"}))
+        if target['type'] in ('guild', 'guild_all'):
+            # Guild-wide hits become one target per channel they were found in
+            target.pop('channel_ids', None)
+            if target['type'] == 'guild_all' or target.get('channel_id') != channel_id:
+                target['channel_name'] = channel_id
+            target['type'] = 'guild'
+        target['channel_id'] = channel_id
+        target['known_ids'] = message_ids
+        action = action or header.get('meow_mode', 'off')
+        target['meow_mode'] = 'off' if action == 'delete' else action
+        targets.append(target)
+    return header, targets
+
+
 class Paracord:
     """Main class for Discord message deletion"""
     
+    concurrent = False  # Whether awaits can overlap (see AsyncParacord)
+    
     def __init__(self, config: Dict):
         self.config = config
         self.token = None
         self.author_id = None
         self.session = requests.Session()
+        self.rate_limiter = RateLimiter()
+        self.pacer = None  # AdaptivePacer when pacing is 'adaptive'
+        self.gate = None   # InFlightGate when pipeline_actions is on
+        self.joined_floors = {}  # guild_id -> snowflake of our join time (joined_at_floor)
+        self.pinned_ids = {}     # channel_id -> IDs of its pinned messages (known-ID skip_pinned)
+        self.executor = None     # Background search thread, started by the first spawn()
+        self.local = threading.local()   # Per-thread state of background work (see run_spawned)
+        self.stats_lock = threading.Lock()  # Stats are also counted by background searches
         
         # Statistics
         self.stats = {
@@ -102,6 +969,10 @@ class Paracord:
             'skipped': 0,
             'rate_limited': 0,
             'ghosts': 0,
+            'indexed': 0,
+            'recovered': 0,
+            'skip_cached': 0,
+            'already_reacted': 0,
             'start_time': None,
             'end_time': None
         }
@@ -109,6 +980,26 @@ class Paracord:
         # Progress tracking
         self.progress_data = {}
         self.current_target_index = 0
+        self.completed_targets = set()  # target_key() of every finished target
+        self.abandoned_targets = set()  # target_key() of targets stopped by an error before their end
+        self.plan_file = None           # Open plan file during --dry-run --plan-out
+        self.planned_targets = set()
+        self.planned_messages = 0
+        self.target_cursors = {}        # target_key() -> cursor of unfinished targets
+        self.window_edges = {}          # target_key() -> snowflake edges of its time windows
+        self.walks = {}                 # target_key() -> {'recent', 'pending'} of a deferred search walk
+        self.retention_horizon = None   # Snowflake below which --retain-days cleans
+        self.retention_marks = {}       # target_key() -> {'low', 'at'} water mark
+        self.pass_totals = {}           # target_key() -> total_results at the start of this pass
+        self.meow_phases = False        # react_delay run: each target reacts, waits, then meows
+        self.reacted_targets = {}       # target_key() -> time.time() its react phase finished
+        self.journal = None             # ReactJournal replayed by the meow phase of react_delay runs
+        self.processed = None           # ProcessedIndex of IDs that need no more requests
+        self.failed = None              # FailedQueue of actions for the drain phase
+        self.failure_reasons = {}       # message_id -> why its last action failed
+        self.skip_cache = None          # SkipCache of messages/channels we cannot act on
+        self.checkpoint_pages = 0       # Pages searched since the last save
+        self.last_checkpoint = time.monotonic()
         self.should_stop = False
         
         # Set up logging
@@ -120,7 +1011,7 @@ class Paracord:
     
     def setup_logging(self):
         """Configure logging to file and console"""
-        log_format = '%(asctime)s [%(levelname)s] %(message)s'
+        log_format = '%(asctime)s [%(levelname)s] %(target)s%(message)s'
         date_format = '%Y-%m-%d %H:%M:%S'
         
         # File handler (restricted permissions: owner read/write only)
@@ -131,11 +1022,13 @@ class Paracord:
         file_handler = logging.StreamHandler(log_stream)
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(logging.Formatter(log_format, date_format))
+        file_handler.addFilter(TargetLabelFilter())
         
         # Console handler (less verbose)
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.INFO)
-        console_handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
+        console_handler.setFormatter(logging.Formatter('%(levelname)s: %(target)s%(message)s'))
+        console_handler.addFilter(TargetLabelFilter())
         
         # Configure root logger
         logging.basicConfig(
@@ -145,6 +1038,15 @@ class Paracord:
         
         self.logger = logging.getLogger(__name__)
     
+    def say(self, message: str = '', **kwargs):
+        """Print a console line, prefixed with the current target in parallel mode"""
+        label = TARGET_LABEL.get()
+        if label:
+            # Keep leading blank lines ahead of the prefix
+            text = message.lstrip('\n')
+            message = f"{message[:len(message) - len(text)]}{Colors.BLUE}[{label}]{Colors.ENDC} {text}"
+        print(message, **kwargs)
+    
     def signal_handler(self, signum, frame):
         """Handle graceful shutdown on Ctrl+C"""
         print(f"\n\n{Colors.YELLOW}Received interrupt signal. Saving progress...{Colors.ENDC}")
@@ -320,9 +1222,16 @@ class Paracord:
                 text_channels = [c for c in channels if c['type'] in [0, 5, 15]]
                 
                 print(f"  Found {len(text_channels)} text channels")
-                print(f"  Add all channels from this server? (y/n): ", end='')
+                print(f"  Add all channels from this server? (y/n, or 'g' for one guild-wide search): ", end='')
                 
-                if input().lower().strip() == 'y':
+                choice = input().lower().strip()
+                if choice == 'g':
+                    targets.append({
+                        "type": "guild_all",
+                        "guild_id": guild['id'],
+                        "guild_name": guild['name']
+                    })
+                elif choice == 'y':
                     for channel in text_channels:
                         targets.append({
                             "type": "guild",
@@ -374,13 +1283,138 @@ class Paracord:
         
         print(f"\n{Colors.GREEN}Configuration saved to config.json{Colors.ENDC}")
         print(f"{Colors.GREEN}  Total targets: {len(targets)}{Colors.ENDC}")
+        
+        # Census: count our messages per target so empty channels can be skipped
+        print(f"\n{Colors.CYAN}Run a census now to disable targets without your messages? (y/n):{Colors.ENDC}", end=' ')
+        if targets and input().lower().strip() == 'y':
+            self.run_census('config.json')
         print(f"\n{Colors.CYAN}Next steps:{Colors.ENDC}")
         print(f"  1. Review config.json and adjust settings if needed")
         print(f"  2. Test with: python3 paracord.py --config config.json --dry-run")
         print(f"  3. Execute with: python3 paracord.py --config config.json")
     
-    def search_messages(self, guild_id: str, channel_id: str, offset: int = 0,
-                        max_id: Optional[str] = None) -> Dict:
+    # Engine primitives. The default engine blocks on requests.Session and
+    # time.sleep; AsyncParacord overrides these to run on an event loop.
+    
+    def run_engine(self, coro):
+        """Run a coroutine of the processing pipeline to completion"""
+        return asyncio.run(coro)
+    
+    async def send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a single HTTP request (blocking)"""
+        session = getattr(self.local, 'session', None) or self.session
+        return session.request(method, url, **kwargs)
+    
+    async def sleep(self, seconds: float):
+        """Wait between requests (blocking)"""
+        time.sleep(seconds)
+    
+    def spawn(self, coro) -> asyncio.Future:
+        """Start a coroutine in the background and return an awaitable for its result.
+        
+        The blocking engine runs it on a worker thread with its own event loop,
+        so it overlaps with the (blocking) work on the main thread. Cancelling
+        a coroutine that has not started yet closes it.
+        """
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1)
+        job = self.executor.submit(self.run_spawned, coro)
+        job.add_done_callback(lambda done: coro.close() if done.cancelled() else None)
+        return asyncio.wrap_future(job)
+    
+    def run_spawned(self, coro):
+        """Run a spawned coroutine on the worker thread, with its own HTTP session.
+        
+        requests.Session is not thread-safe, so the worker gets a copy of the
+        main session's headers. The rate limiter and pacer lock themselves;
+        stats go through stats_lock.
+        """
+        if getattr(self.local, 'session', None) is None:
+            self.local.session = requests.Session()
+            self.local.session.headers.update(self.session.headers)
+        return asyncio.run(coro)
+    
+    async def api_request(self, method: str, url: str, route: str, major: str,
+                          label: str, **kwargs) -> requests.Response:
+        """Send an API request paced by the rate limiter.
+        
+        Waits for the route's bucket (or a global limit) before sending, then
+        feeds the response headers back into the limiter. A 429 is logged and
+        counted here; the caller only needs to retry.
+        
+        Args:
+            method: HTTP method.
+            url: Full request URL.
+            route: Route template (one of the ROUTE_* constants).
+            major: Major parameter of the route (channel or guild ID).
+            label: Short action name for log output ("search", "delete", ...).
+        """
+        
+        gated = self.gate is not None and route in PIPELINED_ROUTES
+        if gated:
+            await self.gate.acquire(route, major)
+        try:
+            delay = self.rate_limiter.reserve(route, major)
+            if delay > 0:
+                self.logger.debug(f"Pacing {label}: waiting {delay:.2f}s for bucket")
+                await self.sleep(delay)
+            
+            response = await self.send(method, url, **kwargs)
+        finally:
+            if gated:
+                await self.gate.release(route, major)
+        
+        payload = None
+        if response.status_code == 429:
+            try:
+                payload = response.json()
+            except ValueError:
+                payload = {}
+        wait_time = self.rate_limiter.observe(route, major, response.status_code,
+                                              response.headers, payload)
+        
+        pace_class = PACE_CLASSES.get(label)
+        if self.pacer is not None and pace_class is not None:
+            if response.status_code == 429:
+                new_delay = self.pacer.penalize(pace_class)
+                self.logger.info(f"Adaptive pacing: {pace_class} delay raised to {new_delay:.2f}s")
+                self.pacer.save()
+            elif response.status_code < 500:
+                self.pacer.success(pace_class)
+        
+        if response.status_code == 429:
+            scope = 'global' if payload.get('global') else response.headers.get('X-RateLimit-Scope', 'user')
+            with self.stats_lock:
+                self.stats['rate_limited'] += 1
+            self.logger.warning(
+                f"Rate limited on {label} ({scope}), waiting {wait_time:.1f}s "
+                f"(retry_after={payload.get('retry_after')}s)"
+            )
+            self.say(f"{Colors.YELLOW}Rate limited - waiting {wait_time:.1f}s...{Colors.ENDC}")
+        
+        return response
+    
+    async def action_pause(self):
+        """Pause between message actions according to the pacing mode.
+        
+        In 'fixed' mode this is the configured delete_delay, in 'adaptive' mode
+        the learned action delay. In 'buckets' mode the rate limiter already
+        paces every request to its bucket, so no extra sleep is added.
+        """
+        if self.pacer is not None:
+            await self.sleep(self.pacer.delay(PACE_ACTION))
+        elif self.config['settings'].get('pacing', 'fixed') == 'fixed':
+            await self.sleep(self.config['settings']['delete_delay'])
+    
+    def search_delay(self) -> float:
+        """Seconds to wait between searches (learned in 'adaptive' mode)"""
+        if self.pacer is not None:
+            return self.pacer.delay(PACE_SEARCH)
+        return self.config['settings']['search_delay']
+    
+    async def search_messages(self, guild_id: str, channel_id: ChannelScope, offset: int = 0,
+                              max_id: Optional[str] = None, author_only: bool = True,
+                              defer_index: bool = False, min_id: Optional[str] = None) -> Dict:
         """Search for messages using cursor-based pagination.
         
         Uses max_id as a sliding cursor to walk backward through time,
@@ -389,66 +1423,77 @@ class Paracord:
         
         Args:
             guild_id: The guild ID, or "@me" for DMs.
-            channel_id: The channel ID.
+            channel_id: The channel ID. For guild searches this may also be a
+                list of channel IDs, or None to search the whole guild.
             offset: Offset within current result page.
             max_id: Snowflake cursor - only return messages older than this ID.
+            author_only: Only match our own messages (False counts everyone's).
+            defer_index: Don't wait for an unindexed channel; return at once.
+            min_id: Lower bound - only return messages newer than this ID.
+        
+        If the channel never finishes indexing (or on the first 202 with
+        defer_index), an empty result with 'not_indexed' set is returned,
+        plus Discord's 'retry_after' estimate when deferring.
         """
         
         if guild_id == "@me":
             url = f"{DISCORD_API_BASE}/channels/{channel_id}/messages/search"
+            route, major = ROUTE_SEARCH_CHANNEL, channel_id
         else:
             url = f"{DISCORD_API_BASE}/guilds/{guild_id}/messages/search"
+            route, major = ROUTE_SEARCH_GUILD, guild_id
         
         params = {
-            'author_id': self.author_id,
             'include_nsfw': 'true',
             'sort_by': 'timestamp',
             'sort_order': 'desc',
             'offset': offset
         }
         
-        if guild_id != "@me":
+        if author_only:
+            params['author_id'] = self.author_id
+        
+        if guild_id != "@me" and channel_id:
             params['channel_id'] = channel_id
         
         # Cursor-based pagination: only fetch messages older than max_id
         if max_id is not None:
             params['max_id'] = max_id
+        if min_id is not None:
+            params['min_id'] = min_id
         
         self.logger.debug(f"Searching messages: {urlencode(params)}")
         
-        max_index_retries = 10  # Cap 202 retries to avoid infinite loop
         index_attempts = 0
         
         while True:
-            response = self.session.get(url, params=params, timeout=30)
+            response = await self.api_request('GET', url, route, major, 'search',
+                                        params=params, timeout=30)
             
-            # Handle rate limiting with dynamic backoff (retry indefinitely)
+            # Rate limited: the limiter holds the bucket, retry indefinitely
             if response.status_code == 429:
-                retry_after = response.json().get('retry_after', 40)
-                wait_time = retry_after * 2
-                self.stats['rate_limited'] += 1
-                self.logger.warning(f"Rate limited on search, waiting {wait_time}s (retry_after={retry_after}s)")
-                print(f"{Colors.YELLOW}Rate limited - waiting {wait_time}s...{Colors.ENDC}")
-                time.sleep(wait_time)
                 continue
             
             # Handle channel not indexed (cap retries)
             if response.status_code == 202:
                 index_attempts += 1
-                if index_attempts >= max_index_retries:
-                    self.logger.warning(f"Channel still not indexed after {max_index_retries} attempts, giving up")
-                    print(f"{Colors.YELLOW}Channel not indexed after {max_index_retries} attempts, skipping...{Colors.ENDC}")
-                    return {'total_results': 0, 'messages': []}
                 retry_after = response.json().get('retry_after', 5)
-                self.logger.info(f"Channel not indexed, waiting {retry_after}s (attempt {index_attempts}/{max_index_retries})")
-                print(f"{Colors.YELLOW}Channel being indexed, waiting {retry_after}s...{Colors.ENDC}")
-                time.sleep(retry_after)
+                if defer_index:
+                    return {'total_results': 0, 'messages': [], 'not_indexed': True,
+                            'retry_after': retry_after}
+                if index_attempts >= INDEX_RETRIES:
+                    self.logger.warning(f"Channel still not indexed after {INDEX_RETRIES} attempts, giving up")
+                    self.say(f"{Colors.YELLOW}Channel not indexed after {INDEX_RETRIES} attempts, skipping...{Colors.ENDC}")
+                    return {'total_results': 0, 'messages': [], 'not_indexed': True}
+                self.logger.info(f"Channel not indexed, waiting {retry_after}s (attempt {index_attempts}/{INDEX_RETRIES})")
+                self.say(f"{Colors.YELLOW}Channel being indexed, waiting {retry_after}s...{Colors.ENDC}")
+                await self.sleep(retry_after)
                 continue
             
             response.raise_for_status()
             return response.json()
     
-    def delete_message(self, channel_id: str, message_id: str, attempt: int = 1) -> str:
+    async def delete_message(self, channel_id: str, message_id: str, attempt: int = 1) -> str:
         """Delete a single message.
         
         Returns:
@@ -462,19 +1507,15 @@ class Paracord:
         url = f"{DISCORD_API_BASE}/channels/{channel_id}/messages/{message_id}"
         
         try:
-            response = self.session.delete(url, timeout=10)
+            response = await self.api_request('DELETE', url, ROUTE_DELETE, channel_id, 'delete',
+                                        timeout=10)
             
             if response.status_code == 204:
+                self.note_allowed(channel_id)
                 return 'OK'
             
             elif response.status_code == 429:
-                # Rate limited - dynamic backoff (double the retry_after)
-                retry_after = response.json().get('retry_after', 3)
-                wait_time = retry_after * 2
-                self.stats['rate_limited'] += 1
-                self.logger.warning(f"Rate limited on delete, waiting {wait_time}s (retry_after={retry_after}s)")
-                print(f"{Colors.YELLOW}Rate limited - waiting {wait_time}s...{Colors.ENDC}")
-                time.sleep(wait_time)
+                # Rate limited - the limiter blocks the bucket until it's safe
                 return 'RETRY'
             
             elif response.status_code == 404:
@@ -488,29 +1529,36 @@ class Paracord:
                     error_data = response.json()
                     if error_data.get('code') == 50083:
                         self.logger.warning(f"Message {message_id} in archived thread, skipping")
+                        self.note_archived(channel_id)
                         return 'SKIP'
                 except (ValueError, KeyError):
                     pass
                 self.logger.error(f"Delete failed with status 400: {response.text}")
+                self.failure_reasons[message_id] = f"HTTP 400: {response.text[:200]}"
+                # Rejected outright (e.g. a system message); asking again won't help
+                self.mark_processed(message_id)
                 return 'FAILED'
             
             elif response.status_code == 403:
                 # Forbidden (no permissions)
                 error_data = response.json()
                 self.logger.warning(f"Cannot delete message {message_id}: {error_data}")
+                self.note_denied(channel_id, message_id)
                 return 'SKIP'
             
             else:
                 self.logger.error(f"Delete failed with status {response.status_code}: {response.text}")
+                self.failure_reasons[message_id] = f"HTTP {response.status_code}"
                 return 'FAILED'
         
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Delete request failed: {e}")
+            self.failure_reasons[message_id] = str(e)
             max_retries = self.config['settings'].get('max_retries', 3)
             return 'RETRY' if attempt < max_retries else 'FAILED'
     
-    def edit_message(self, channel_id: str, message_id: str, content: str,
-                     attempt: int = 1) -> str:
+    async def edit_message(self, channel_id: str, message_id: str, content: str,
+                           attempt: int = 1) -> str:
         """Edit a single message's content.
         
         Returns:
@@ -525,18 +1573,14 @@ class Paracord:
         payload = {'content': content, 'attachments': [], 'embeds': []}
         
         try:
-            response = self.session.patch(url, json=payload, timeout=10)
+            response = await self.api_request('PATCH', url, ROUTE_EDIT, channel_id, 'edit',
+                                        json=payload, timeout=10)
             
             if response.status_code == 200:
+                self.note_allowed(channel_id)
                 return 'OK'
             
             elif response.status_code == 429:
-                retry_after = response.json().get('retry_after', 3)
-                wait_time = retry_after * 2
-                self.stats['rate_limited'] += 1
-                self.logger.warning(f"Rate limited on edit, waiting {wait_time}s (retry_after={retry_after}s)")
-                print(f"{Colors.YELLOW}Rate limited - waiting {wait_time}s...{Colors.ENDC}")
-                time.sleep(wait_time)
                 return 'RETRY'
             
             elif response.status_code == 404:
@@ -548,28 +1592,33 @@ class Paracord:
                     error_data = response.json()
                     if error_data.get('code') == 50083:
                         self.logger.warning(f"Message {message_id} in archived thread, cannot edit")
+                        self.note_archived(channel_id)
                         return 'SKIP'
                 except (ValueError, KeyError):
                     pass
                 self.logger.error(f"Edit failed with status 400: {response.text}")
+                self.failure_reasons[message_id] = f"HTTP 400: {response.text[:200]}"
                 return 'FAILED'
             
             elif response.status_code == 403:
                 error_data = response.json()
                 self.logger.warning(f"Cannot edit message {message_id}: {error_data}")
+                self.note_denied(channel_id, message_id)
                 return 'SKIP'
             
             else:
                 self.logger.error(f"Edit failed with status {response.status_code}: {response.text}")
+                self.failure_reasons[message_id] = f"HTTP {response.status_code}"
                 return 'FAILED'
         
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Edit request failed: {e}")
+            self.failure_reasons[message_id] = str(e)
             max_retries = self.config['settings'].get('max_retries', 3)
             return 'RETRY' if attempt < max_retries else 'FAILED'
     
-    def react_message(self, channel_id: str, message_id: str,
-                      attempt: int = 1) -> str:
+    async def react_message(self, channel_id: str, message_id: str,
+                            attempt: int = 1) -> str:
         """Add a random mouse emoji reaction to a message.
         
         Randomly picks between 🐭 (:mouse:) and 🐁 (:mouse2:).
@@ -589,18 +1638,13 @@ class Paracord:
         url = f"{DISCORD_API_BASE}/channels/{channel_id}/messages/{message_id}/reactions/{encoded_emoji}/%40me"
         
         try:
-            response = self.session.put(url, timeout=10)
+            response = await self.api_request('PUT', url, ROUTE_REACT, channel_id, 'react',
+                                        timeout=10)
             
             if response.status_code in (200, 204):
                 return 'OK'
             
             elif response.status_code == 429:
-                retry_after = response.json().get('retry_after', 3)
-                wait_time = retry_after * 2
-                self.stats['rate_limited'] += 1
-                self.logger.warning(f"Rate limited on react, waiting {wait_time}s (retry_after={retry_after}s)")
-                print(f"{Colors.YELLOW}Rate limited - waiting {wait_time}s...{Colors.ENDC}")
-                time.sleep(wait_time)
                 return 'RETRY'
             
             elif response.status_code == 404:
@@ -612,301 +1656,1166 @@ class Paracord:
                     error_data = response.json()
                     if error_data.get('code') == 50083:
                         self.logger.warning(f"Message {message_id} in archived thread, cannot react")
+                        self.note_archived(channel_id)
                         return 'SKIP'
                 except (ValueError, KeyError):
                     pass
                 self.logger.error(f"React failed with status 400: {response.text}")
+                self.failure_reasons[message_id] = f"HTTP 400: {response.text[:200]}"
                 return 'FAILED'
             
             elif response.status_code == 403:
+                # Not cached: reactions can be refused where edits and deletes are allowed
                 error_data = response.json()
                 self.logger.warning(f"Cannot react to message {message_id}: {error_data}")
                 return 'SKIP'
             
             else:
                 self.logger.error(f"React failed with status {response.status_code}: {response.text}")
+                self.failure_reasons[message_id] = f"HTTP {response.status_code}"
                 return 'FAILED'
         
         except requests.exceptions.RequestException as e:
             self.logger.error(f"React request failed: {e}")
+            self.failure_reasons[message_id] = str(e)
             max_retries = self.config['settings'].get('max_retries', 3)
             return 'RETRY' if attempt < max_retries else 'FAILED'
     
-    def process_target(self, target: Dict, dry_run: bool = False):
-        """Process a single channel/DM target using cursor-based pagination.
-        
-        Uses max_id as a sliding cursor to walk backward through time,
-        bypassing Discord's 9,975 offset ceiling. The offset is only used
-        to skip undeletable messages within a single search page.
-        """
+    async def prefetch_search(self, guild_id: str, channel_id: ChannelScope, max_id: str,
+                              not_before: float, min_id: Optional[str] = None) -> Dict:
+        """Search the next page in the background once the search cooldown expires.
         
-        # Build target name based on type
-        if target['type'] == 'guild':
-            target_name = f"#{target['channel_name']} ({target['guild_name']})"
-        elif target['type'] == 'dm':
-            target_name = f"DM: @{target['recipient_name']}"
-        elif target['type'] == 'group_dm':
-            target_name = f"Group: {target['group_name']}"
-        else:
-            target_name = "Unknown"
+        Runs in the background (see spawn) while the current batch is being
+        processed, so the search_delay overlaps with delete work instead of
+        being added to it.
         
-        print(f"\n{Colors.HEADER}{'─'*60}{Colors.ENDC}")
-        print(f"{Colors.BOLD}Target: {target_name}{Colors.ENDC}")
-        print(f"{Colors.HEADER}{'─'*60}{Colors.ENDC}")
+        Args:
+            guild_id: The guild ID, or "@me" for DMs.
+            channel_id: The search scope, as for search_messages.
+            max_id: Cursor for the next page.
+            not_before: time.monotonic() value before which the search must not start.
+            min_id: Lower bound of the search (time-window targets).
+        """
+        wait = not_before - time.monotonic()
+        if wait > 0:
+            await self.sleep(wait)
+        return await self.search_messages(guild_id, channel_id, offset=0, max_id=max_id,
+                                          min_id=min_id)
+    
+    async def process_batch(self, channel_id: str, messages: List[Dict],
+                            quiet: bool = False) -> Dict:
+        """Run the configured actions (react, edit, delete) on a batch of messages.
         
-        # For DMs and Group DMs, use "@me" as guild_id
-        if target['type'] in ['dm', 'group_dm']:
-            guild_id = "@me"
-        else:
-            guild_id = target['guild_id']
+        With pipeline_actions, the chains of several messages overlap, as many
+        as the channel's action buckets allow; each message's own actions
+        still run in order.
         
-        channel_id = target['channel_id']
+        Args:
+            channel_id: Channel the messages belong to.
+            messages: Message objects (at least 'id' and 'content').
+            quiet: Don't draw a progress bar (used when batches run side by side).
         
-        # Cursor-based pagination state
-        max_id_cursor = None  # None = start from newest message
-        offset = 0            # Only used to skip undeletable messages within a page
-        messages_found = 0
-        empty_pages = 0       # Track consecutive empty pages to detect end
-        MAX_EMPTY_PAGES = 3   # Stop after this many consecutive empty pages
+        Returns:
+            Counts for the batch ('edited', 'deleted', 'skipped', and 'ghosts'
+            among the deleted) and 'oldest_id', the oldest message ID that
+            was processed (or None).
+        """
         
-        while not self.should_stop:
-            # Search for messages
-            cursor_info = f"max_id={max_id_cursor}" if max_id_cursor else "from newest"
-            print(f"{Colors.CYAN}Searching messages ({cursor_info}, offset={offset})...{Colors.ENDC}")
-            
-            try:
-                result = self.search_messages(guild_id, channel_id, offset=offset,
-                                              max_id=max_id_cursor)
-            except requests.exceptions.RequestException as e:
-                print(f"{Colors.RED}Error searching: {e}{Colors.ENDC}")
-                break
-            
-            # Extract messages
-            total_results = result.get('total_results', 0)
-            message_groups = result.get('messages', [])
-            
-            if not message_groups:
-                empty_pages += 1
-                if empty_pages >= MAX_EMPTY_PAGES:
-                    print(f"{Colors.GREEN}No more messages found (after {empty_pages} empty pages){Colors.ENDC}")
-                    break
-                # Sometimes the index needs a moment; wait and retry
-                print(f"{Colors.YELLOW}Empty page ({empty_pages}/{MAX_EMPTY_PAGES}), waiting before retry...{Colors.ENDC}")
-                time.sleep(self.config['settings']['search_delay'])
-                continue
+        meow_mode = self.meow_mode()
+        if meow_mode == 'react_only':
+            prefix_label = 'Reacting'
+        elif meow_mode == 'edit_only':
+            prefix_label = 'Meowing'
+        elif meow_mode == 'edit_and_delete':
+            prefix_label = 'Meowing & deleting'
+        else:
+            prefix_label = 'Deleting'
+        progress = ProgressBar(len(messages), prefix=prefix_label,
+                               quiet=quiet or bool(TARGET_LABEL.get()))
+        
+        deleted_in_batch = 0
+        edited_in_batch = 0
+        skipped_in_batch = 0
+        ghosts_in_batch = 0
+        oldest_processed_id = None
+        
+        done = 0
+        
+        def step_done():
+            nonlocal done
+            done += 1
+            progress.update(done)
+        
+        async def run_chain(msg: Dict):
+            """React to, edit and delete one message, in that order"""
+            nonlocal deleted_in_batch, edited_in_batch, skipped_in_batch
+            nonlocal ghosts_in_batch, oldest_processed_id
             
-            # Reset empty page counter since we got results
-            empty_pages = 0
+            message_id = msg['id']
+            max_retries = self.config['settings']['max_retries']
             
-            # Flatten message groups and extract all hit messages
-            all_hit_messages = []
-            messages = []
-            for group in message_groups:
-                for msg in group:
-                    if msg.get('hit') and msg.get('author', {}).get('id') == self.author_id:
-                        all_hit_messages.append(msg)
-                        # Filter pinned if configured
-                        if self.config['settings']['skip_pinned'] and msg.get('pinned'):
-                            continue
-                        # Skip meowed messages if configured
-                        if self.config['settings'].get('skip_meowed') and msg.get('content') == MEOW_TEXT:
-                            continue
-                        messages.append(msg)
+            # Track the oldest message for cursor advancement
+            msg_id_int = int(message_id)
+            if oldest_processed_id is None or msg_id_int < oldest_processed_id:
+                oldest_processed_id = msg_id_int
             
-            if not messages and not all_hit_messages:
-                # No messages from us in this page - advance cursor
-                oldest_id = None
-                for group in message_groups:
-                    for msg in group:
-                        if msg.get('hit'):
-                            msg_id = int(msg['id'])
-                            if oldest_id is None or msg_id < oldest_id:
-                                oldest_id = msg_id
-                if oldest_id:
-                    max_id_cursor = str(oldest_id - 1)
-                    offset = 0
-                    print(f"{Colors.YELLOW}No messages from us in batch, advancing cursor...{Colors.ENDC}")
-                else:
-                    offset += len(message_groups)
-                    print(f"{Colors.YELLOW}No deletable messages in this batch, advancing offset...{Colors.ENDC}")
-                time.sleep(self.config['settings']['search_delay'])
-                continue
+            # The channel was given up on earlier in this batch
+            if self.is_skipped({'id': message_id, 'channel_id': channel_id}):
+                self.stats['skip_cached'] += 1
+                step_done()
+                return
             
-            if not messages and all_hit_messages:
-                # All our messages were pinned/filtered - advance cursor past them
-                oldest_id = min(int(msg['id']) for msg in all_hit_messages)
+            # Meow mode: edit message content before deletion
+            was_ghost = False
+            if meow_mode != 'off':
+                # Skip if message is already meowed
+                if msg.get('content') != MEOW_TEXT:
+                    # React with a random mouse emoji before editing
+                    reacted_before = has_own_reaction(msg)
+                    if reacted_before:
+                        # Our mouse is already on it (an earlier run, or this target's react phase)
+                        react_result = 'OK'
+                        self.stats['already_reacted'] += 1
+                    elif meow_mode in ('react_only', 'edit_only', 'edit_and_delete'):
+                        for attempt in range(1, max_retries + 1):
+                            react_result = await self.react_message(channel_id, message_id, attempt)
+                            
+                            if react_result == 'OK':
+                                self.stats['reacted'] += 1
+                                await self.action_pause()
+                                break
+                            elif react_result == 'GHOST':
+                                self.stats['ghosts'] += 1
+                                ghosts_in_batch += 1
+                                self.mark_processed(message_id)
+                                deleted_in_batch += 1
+                                was_ghost = True
+                                break
+                            elif react_result in ('SKIP', 'FAILED'):
+                                break
+                            elif react_result == 'RETRY':
+                                if attempt < max_retries:
+                                    await self.sleep(1)
+                                    continue
+                                break
+                        
+                        # If ghost, skip everything (message doesn't exist)
+                        if was_ghost:
+                            step_done()
+                            return
+                    
+                    # In react_only mode, skip edit entirely
+                    if meow_mode == 'react_only':
+                        if react_result in ('FAILED', 'RETRY'):
+                            self.queue_failed(channel_id, message_id, 'react')
+                        # A failed reaction is tried again before the edit in phase 2
+                        self.journal_message(channel_id, message_id, react_result == 'OK')
+                        step_done()
+                        if not reacted_before:
+                            await self.action_pause()
+                        return
+                    
+                    edit_success = False
+                    for attempt in range(1, max_retries + 1):
+                        edit_result = await self.edit_message(channel_id, message_id, MEOW_TEXT, attempt)
+                        
+                        if edit_result == 'OK':
+                            self.stats['edited'] += 1
+                            edited_in_batch += 1
+                            edit_success = True
+                            break
+                        elif edit_result == 'GHOST':
+                            self.stats['ghosts'] += 1
+                            ghosts_in_batch += 1
+                            self.mark_processed(message_id)
+                            deleted_in_batch += 1
+                            was_ghost = True
+                            break
+                        elif edit_result in ('SKIP', 'FAILED'):
+                            break
+                        elif edit_result == 'RETRY':
+                            if attempt < max_retries:
+                                await self.sleep(1)
+                                continue
+                            break
+                    
+                    # If ghost, skip deletion (message doesn't exist)
+                    if was_ghost:
+                        step_done()
+                        return
+                    
+                    # Edit-only leaves the message standing, so a failed edit is left to the drain
+                    if meow_mode == 'edit_only' and edit_result in ('FAILED', 'RETRY'):
+                        self.queue_failed(channel_id, message_id, 'edit')
+                    
+                    # Delay after edit before next API call
+                    if edit_success:
+                        await self.action_pause()
+            
+            # In edit_only or react_only mode, skip deletion entirely
+            if meow_mode in ('edit_only', 'react_only'):
+                if meow_mode == 'react_only':
+                    self.journal_message(channel_id, message_id, False, meowed=True)  # Still to delete
+                step_done()
+                # Still need a delay between edits
+                if not was_ghost:
+                    await self.action_pause()
+                return
+            
+            # Attempt deletion with retries
+            for attempt in range(1, max_retries + 1):
+                result = await self.delete_message(channel_id, message_id, attempt)
+                
+                if result == 'OK':
+                    self.stats['deleted'] += 1
+                    self.mark_processed(message_id)
+                    deleted_in_batch += 1
+                    break
+                elif result == 'GHOST':
+                    self.stats['ghosts'] += 1
+                    ghosts_in_batch += 1
+                    self.mark_processed(message_id)
+                    deleted_in_batch += 1
+                    was_ghost = True
+                    break
+                elif result == 'SKIP':
+                    self.stats['skipped'] += 1
+                    skipped_in_batch += 1
+                    break
+                elif result == 'FAILED':
+                    self.stats['failed'] += 1
+                    skipped_in_batch += 1
+                    self.queue_failed(channel_id, message_id, 'delete')
+                    break
+                elif result == 'RETRY':
+                    if attempt < max_retries:
+                        await self.sleep(1)
+                        continue
+                    else:
+                        self.stats['failed'] += 1
+                        skipped_in_batch += 1
+                        self.queue_failed(channel_id, message_id, 'delete')
+                        break
+            
+            step_done()
+            
+            # Skip delay for ghost messages (already deleted, no API cost)
+            if not was_ghost:
+                await self.action_pause()
+        
+        if self.gate is not None and len(messages) > 1:
+            # Chains of different messages overlap (each one still reacts, edits,
+            # then deletes in order); every request waits for a slot in its bucket
+            chains = set()
+            for msg in messages:
+                if self.should_stop:
+                    break
+                while len(chains) >= self.gate.depth(channel_id):
+                    finished, chains = await asyncio.wait(chains, return_when=asyncio.FIRST_COMPLETED)
+                    for chain in finished:
+                        chain.result()  # Re-raise what the chain raised
+                chains.add(self.spawn(run_chain(msg)))
+            if chains:
+                await asyncio.gather(*chains)
+        else:
+            for msg in messages:
+                if self.should_stop:
+                    break
+                await run_chain(msg)
+        
+        progress.finish()
+        
+        return {
+            'edited': edited_in_batch,
+            'deleted': deleted_in_batch,
+            'skipped': skipped_in_batch,
+            'ghosts': ghosts_in_batch,
+            'oldest_id': oldest_processed_id
+        }
+    
+    def meow_mode(self) -> str:
+        """Meow mode for the current target: its react_delay phase, else the setting"""
+        return MEOW_PHASE.get() or self.config['settings'].get('meow_mode', 'off')
+    
+    def is_processed(self, message_id: str) -> bool:
+        """True if an earlier pass or run already finished with this message"""
+        return self.processed is not None and message_id in self.processed
+    
+    def mark_processed(self, message_id: str):
+        """Record a message that is gone (or permanently rejected) in the index"""
+        if self.processed is not None:
+            self.processed.add(message_id)
+    
+    def is_skipped(self, msg: Dict) -> bool:
+        """True if the skip cache has the message or its channel"""
+        return self.skip_cache is not None and msg in self.skip_cache
+    
+    def channel_skipped(self, channel_id: str) -> bool:
+        """True (and says why) if the skip cache has given up on a channel"""
+        if self.skip_cache is None or channel_id not in self.skip_cache.channels:
+            return False
+        self.say(f"{Colors.YELLOW}Skipping channel: {self.skip_cache.channels[channel_id]} "
+                 f"(cached in {SKIP_CACHE_FILE}){Colors.ENDC}")
+        return True
+    
+    def note_allowed(self, channel_id: str):
+        if self.skip_cache is not None:
+            self.skip_cache.allowed(channel_id)
+    
+    def note_archived(self, channel_id: str):
+        """Cache an archived thread: none of its messages can be changed"""
+        if self.skip_cache is not None and channel_id not in self.skip_cache.channels:
+            self.skip_cache.skip_channel(channel_id, "archived thread (50083)")
+            self.say(f"{Colors.YELLOW}Channel {channel_id} is an archived thread; "
+                     f"skipping it from now on{Colors.ENDC}")
+    
+    def note_denied(self, channel_id: str, message_id: str):
+        """Cache a forbidden message, and its channel once 403s keep coming"""
+        if self.skip_cache is not None and self.skip_cache.denied(channel_id, message_id):
+            self.say(f"{Colors.YELLOW}Channel {channel_id}: {SKIP_CHANNEL_AFTER} forbidden "
+                     f"requests in a row, skipping it from now on{Colors.ENDC}")
+    
+    def journal_message(self, channel_id: str, message_id: str, reacted: bool,
+                        meowed: bool = False):
+        """Journal a message for the meow phase of the target reacting right now"""
+        key = JOURNAL_TARGET.get()
+        if key is not None and self.journal is not None:
+            self.journal.add(key, channel_id, message_id, reacted, meowed)
+    
+    def queue_failed(self, channel_id: str, message_id: str, action: str):
+        """Queue a failed action for the drain phase (unless it can never succeed)"""
+        reason = self.failure_reasons.pop(message_id, 'rate limited (retries exhausted)')
+        if self.failed is not None and not self.is_processed(message_id):
+            self.failed.add(channel_id, message_id, action, reason)
+    
+    async def retry_failed(self, entry: Dict) -> str:
+        """Retry one queued action, backing off exponentially between attempts"""
+        max_retries = self.config['settings'].get('max_retries', 3)
+        channel_id, message_id, action = entry['c'], entry['m'], entry['a']
+        for attempt in range(1, max_retries + 1):
+            if action == 'edit':
+                result = await self.edit_message(channel_id, message_id, MEOW_TEXT, attempt)
+            elif action == 'react':
+                result = await self.react_message(channel_id, message_id, attempt)
+            else:
+                result = await self.delete_message(channel_id, message_id, attempt)
+            if result != 'RETRY' or attempt == max_retries:
+                return result
+            await self.sleep(2 ** attempt)
+        return result
+    
+    def drain_action(self, action: str) -> Optional[str]:
+        """What a queued action becomes under this run's meow mode.
+        
+        Modes that delete delete every queued message, whatever action an
+        earlier run queued for it. Edit-only and react-only runs never
+        delete, so queued deletes (and, for react_only, edits) are left for
+        a later run in a mode that does them (None).
+        """
+        meow_mode = self.config['settings'].get('meow_mode', 'off')
+        if meow_mode in ('off', 'edit_and_delete'):
+            return 'delete'
+        if action == 'delete' or (meow_mode == 'react_only' and action == 'edit'):
+            return None
+        return action
+    
+    async def drain_failed(self):
+        """Retry every queued failed action directly, with no searching.
+        
+        Runs up to FAILED_DRAIN_ROUNDS passes over the queue; each pass after
+        the first waits twice as long as the one before (starting at
+        FAILED_DRAIN_BACKOFF seconds) to let transient errors clear. Entries
+        that still fail stay queued for the next run, as do entries this
+        run's meow mode does not cover (see drain_action).
+        """
+        if self.failed is None or not len(self.failed):
+            return
+        
+        print(f"\n{Colors.HEADER}{'='*60}{Colors.ENDC}")
+        print(f"{Colors.HEADER}RETRYING FAILED MESSAGES{Colors.ENDC}")
+        print(f"{Colors.HEADER}{'='*60}{Colors.ENDC}")
+        
+        # Queued by a run in another meow mode: convert them, or keep them for later
+        held = set()
+        for message_id, entry in list(self.failed.entries.items()):
+            action = self.drain_action(entry['a'])
+            if action is None:
+                held.add(message_id)
+            elif action != entry['a']:
+                self.failed.entries[message_id] = dict(entry, a=action)
+        if held:
+            print(f"{Colors.CYAN}{len(held)} queued actions need another meow mode; "
+                  f"kept for a later run{Colors.ENDC}")
+        if len(held) == len(self.failed):
+            return
+        
+        for round_number in range(FAILED_DRAIN_ROUNDS):
+            pending = [e for e in self.failed.entries.values() if e['m'] not in held]
+            if not pending or self.should_stop:
+                break
+            if round_number:
+                wait = FAILED_DRAIN_BACKOFF * 2 ** (round_number - 1)
+                print(f"{Colors.CYAN}{len(pending)} still failing, waiting {wait}s before pass "
+                      f"{round_number + 1}/{FAILED_DRAIN_ROUNDS}...{Colors.ENDC}")
+                await self.sleep(wait)
+            
+            progress = ProgressBar(len(pending), prefix='Retrying')
+            for i, entry in enumerate(pending):
+                if self.should_stop:
+                    break
+                message_id = entry['m']
+                if self.is_processed(message_id) or self.is_skipped({'id': message_id, 'channel_id': entry['c']}):
+                    self.failed.resolve(message_id)
+                    progress.update(i + 1)
+                    continue
+                
+                result = await self.retry_failed(entry)
+                if result == 'OK':
+                    self.stats['recovered'] += 1
+                    if entry['a'] == 'delete':
+                        self.stats['deleted'] += 1
+                        self.mark_processed(message_id)
+                    elif entry['a'] == 'edit':
+                        self.stats['edited'] += 1
+                    else:
+                        self.stats['reacted'] += 1
+                    self.failed.resolve(message_id)
+                elif result == 'GHOST':
+                    self.stats['ghosts'] += 1
+                    self.mark_processed(message_id)
+                    self.failed.resolve(message_id)
+                elif result == 'SKIP':
+                    self.stats['skipped'] += 1
+                    self.failed.resolve(message_id)
+                else:
+                    reason = self.failure_reasons.pop(message_id, 'rate limited (retries exhausted)')
+                    self.failed.entries[message_id] = dict(entry, e=reason)
+                progress.update(i + 1)
+                if result != 'GHOST':
+                    await self.action_pause()
+            progress.finish()
+        
+        if len(self.failed) > len(held):
+            print(f"{Colors.YELLOW}{len(self.failed) - len(held)} messages still failing; kept in "
+                  f"{FAILED_QUEUE_FILE} for the next run{Colors.ENDC}")
+        else:
+            print(f"{Colors.GREEN}All queued failures resolved{Colors.ENDC}")
+    
+    async def process_queues(self, queues: Dict[str, List[Dict]]) -> Dict:
+        """Process per-channel message queues and add up their batch counts.
+        
+        Every channel has its own delete bucket, so engines that can overlap
+        waits work the queues side by side; otherwise they run in turn.
+        """
+        if len(queues) > 1 and self.concurrent:
+            results = await asyncio.gather(*(
+                self.process_batch(channel_id, batch, quiet=True)
+                for channel_id, batch in queues.items()
+            ))
+        else:
+            results = [await self.process_batch(channel_id, batch)
+                       for channel_id, batch in queues.items()]
+        
+        oldest_ids = [r['oldest_id'] for r in results if r['oldest_id'] is not None]
+        return {
+            'edited': sum(r['edited'] for r in results),
+            'deleted': sum(r['deleted'] for r in results),
+            'skipped': sum(r['skipped'] for r in results),
+            'ghosts': sum(r['ghosts'] for r in results),
+            'oldest_id': min(oldest_ids) if oldest_ids else None
+        }
+    
+    def write_plan(self, target: Dict, messages: List[Dict]):
+        """Append the messages a dry run would act on to the plan file (--plan-out)"""
+        if self.plan_file is None:
+            return
+        key = target_key(target)
+        if key not in self.planned_targets:
+            self.planned_targets.add(key)
+            meta = {k: v for k, v in target.items() if k not in ('known_ids', 'meowed_ids')}
+            self.plan_file.write(json.dumps({'target': meta}) + '\n')
+        meow_mode = self.meow_mode()
+        action = 'delete' if meow_mode == 'off' else meow_mode
+        for msg in messages:
+            record = {'t': key, 'c': msg.get('channel_id', target.get('channel_id')),
+                      'm': msg['id'], 'a': action}
+            self.plan_file.write(json.dumps(record, separators=(',', ':')) + '\n')
+        self.planned_messages += len(messages)
+    
+    async def process_known_target(self, target: Dict, dry_run: bool = False):
+        """Process a target whose message IDs are already known (data package).
+        
+        No search calls are made: the IDs are fed to the action pipeline in
+        batches of KNOWN_ID_BATCH. Messages that no longer exist come back
+        as ghosts. The position in the ID list is checkpointed for --resume.
+        Messages the package shows as meowed ('meowed_ids') are skipped with
+        skip_meowed, and otherwise only deleted. With skip_pinned, the
+        channel's pins are read once and left alone; if they cannot be read,
+        the target is stopped rather than risk deleting them.
+        """
+        channel_id = target['channel_id']
+        message_ids = target['known_ids']
+        key = target_key(target)
+        meowed = set(target.get('meowed_ids', ()))
+        skip_meowed = self.config['settings'].get('skip_meowed')
+        
+        # The package has no pinned flag, so ask the channel for its pins
+        pinned = set()
+        if self.config['settings']['skip_pinned']:
+            if channel_id not in self.pinned_ids:
+                try:
+                    self.pinned_ids[channel_id] = set(await self.fetch_pins(channel_id))
+                except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+                    self.say(f"{Colors.RED}Could not read pinned messages: {e}. Stopping this "
+                             f"target so they are not deleted{Colors.ENDC}")
+                    self.abandoned_targets.add(key)
+                    return
+            pinned = self.pinned_ids[channel_id]
+        
+        def wanted(message_id: str) -> bool:
+            return not (self.is_processed(message_id) or message_id in pinned or
+                        (skip_meowed and message_id in meowed))
+        
+        def known_message(message_id: str) -> Dict:
+            msg = {'id': message_id, 'channel_id': channel_id}
+            if message_id in meowed:
+                msg['content'] = MEOW_TEXT
+            return msg
+        
+        position = 0
+        batches = 0
+        saved = self.target_cursors.get(key)
+        if saved:
+            position = saved.get('position', 0)
+            batches = saved.get('batches', 0)
+            self.say(f"{Colors.GREEN}Resuming from checkpoint ({position}/{len(message_ids)} IDs done){Colors.ENDC}")
+        
+        self.say(f"{Colors.CYAN}{len(message_ids) - position} known messages, no search needed{Colors.ENDC}")
+        
+        if dry_run:
+            pending_ids = [message_id for message_id in message_ids[position:] if wanted(message_id)]
+            self.say(f"{Colors.YELLOW}[DRY RUN] Would process {len(pending_ids)} messages{Colors.ENDC}")
+            self.write_plan(target, [{'id': message_id, 'channel_id': channel_id}
+                                     for message_id in pending_ids])
+            return
+        
+        while position < len(message_ids) and not self.should_stop:
+            if self.channel_skipped(channel_id):
+                break
+            self.checkpoint_target(key, {'position': position, 'batches': batches})
+            
+            chunk = message_ids[position:position + KNOWN_ID_BATCH]
+            messages = [known_message(message_id) for message_id in chunk if wanted(message_id)]
+            indexed = sum(1 for message_id in chunk if self.is_processed(message_id))
+            self.stats['indexed'] += indexed
+            preserved = sum(1 for message_id in chunk if skip_meowed and message_id in meowed)
+            kept_pinned = sum(1 for message_id in chunk if message_id in pinned)
+            cached = [msg for msg in messages if self.is_skipped(msg)]
+            self.stats['skip_cached'] += len(cached)
+            messages = [msg for msg in messages if msg not in cached]
+            batch = await self.process_batch(channel_id, messages) if messages else {
+                'edited': 0, 'deleted': 0, 'skipped': 0, 'ghosts': 0, 'oldest_id': None}
+            if self.should_stop:
+                break
+            position += len(chunk)
+            batches += 1
+            
+            parts = []
+            if indexed:
+                parts.append(f"{indexed} already processed")
+            if cached:
+                parts.append(f"{len(cached)} in skip cache")
+            if preserved:
+                parts.append(f"{preserved} meowed (kept)")
+            if kept_pinned:
+                parts.append(f"{kept_pinned} pinned (kept)")
+            if batch['edited']:
+                parts.append(f"{batch['edited']} meowed")
+            if batch['deleted']:
+                parts.append(f"{batch['deleted']} deleted")
+            if batch['skipped']:
+                parts.append(f"{batch['skipped']} skipped")
+            self.say(f"{Colors.CYAN}Batch done ({position}/{len(message_ids)}): {', '.join(parts)}{Colors.ENDC}")
+    
+    async def replay_journal(self, target: Dict):
+        """Meow phase of a react_delay target, from its react journal.
+        
+        No search calls are made: the messages the react phase went through
+        are fed to the action pipeline in batches of KNOWN_ID_BATCH, routed
+        to per-channel queues. Messages that were already meowed are only
+        deleted (or kept, with skip_meowed), as in a single-phase run. The
+        position in the journal is checkpointed for --resume.
+        """
+        key = target_key(target)
+        messages_left = self.journal.messages(key)
+        skip_meowed = self.config['settings'].get('skip_meowed')
+        
+        position = 0
+        batches = 0
+        saved = self.target_cursors.get(key)
+        if saved:
+            position = saved.get('position', 0)
+            batches = saved.get('batches', 0)
+            self.say(f"{Colors.GREEN}Resuming from checkpoint ({position}/{len(messages_left)} "
+                     f"journaled messages done){Colors.ENDC}")
+        
+        self.say(f"{Colors.CYAN}{len(messages_left) - position} messages in the react journal, "
+                 f"no search needed{Colors.ENDC}")
+        
+        while position < len(messages_left) and not self.should_stop:
+            self.checkpoint_target(key, {'position': position, 'batches': batches})
+            
+            chunk = messages_left[position:position + KNOWN_ID_BATCH]
+            messages = [msg for msg in chunk if not self.is_processed(msg['id'])]
+            indexed = len(chunk) - len(messages)
+            self.stats['indexed'] += indexed
+            if skip_meowed:
+                messages = [msg for msg in messages if msg.get('content') != MEOW_TEXT]
+            cached = [msg for msg in messages if self.is_skipped(msg)]
+            self.stats['skip_cached'] += len(cached)
+            messages = [msg for msg in messages if msg not in cached]
+            queues = {}
+            for msg in messages:
+                queues.setdefault(msg['channel_id'], []).append(msg)
+            batch = await self.process_queues(queues)
+            if self.should_stop:
+                break
+            position += len(chunk)
+            batches += 1
+            
+            parts = []
+            if indexed:
+                parts.append(f"{indexed} already processed")
+            if cached:
+                parts.append(f"{len(cached)} in skip cache")
+            if batch['edited']:
+                parts.append(f"{batch['edited']} meowed")
+            if batch['deleted']:
+                parts.append(f"{batch['deleted']} deleted")
+            if batch['skipped']:
+                parts.append(f"{batch['skipped']} skipped")
+            self.say(f"{Colors.CYAN}Batch done ({position}/{len(messages_left)}): "
+                     f"{', '.join(parts) or 'nothing to do'}{Colors.ENDC}")
+    
+    def select_messages(self, own_messages: List[Dict]) -> Tuple[List[Dict], List[int]]:
+        """Filter our own messages down to the ones that need work.
+        
+        Returns:
+            The messages to process, and the IDs dropped because the
+            processed-ID index already has them.
+        """
+        messages = []
+        indexed_ids = []  # Hits an earlier pass already finished with
+        for msg in own_messages:
+            # Stale search entries for messages we already handled
+            if self.is_processed(msg['id']):
+                indexed_ids.append(int(msg['id']))
+                continue
+            # Forbidden messages and channels from the skip cache
+            if self.is_skipped(msg):
+                self.stats['skip_cached'] += 1
+                continue
+            # Filter pinned if configured
+            if self.config['settings']['skip_pinned'] and msg.get('pinned'):
+                continue
+            # Skip meowed messages if configured
+            if self.config['settings'].get('skip_meowed') and msg.get('content') == MEOW_TEXT:
+                continue
+            messages.append(msg)
+        return messages, indexed_ids
+    
+    async def target_floor(self, target: Dict) -> int:
+        """Lowest snowflake the target's messages can have (see history_floor).
+        
+        With joined_at_floor, server targets are also bounded by when we
+        joined the server. Messages from an earlier membership (left and
+        rejoined) are older than that, hence opt-in.
+        """
+        floor_id = history_floor(target)
+        guild_id = target.get('guild_id')
+        if guild_id and self.config['settings'].get('joined_at_floor', False):
+            if guild_id not in self.joined_floors:
+                self.joined_floors[guild_id] = await self.fetch_joined_floor(guild_id)
+            if self.joined_floors[guild_id]:
+                floor_id = max(floor_id, self.joined_floors[guild_id])
+        return floor_id
+    
+    async def fetch_joined_floor(self, guild_id: str) -> Optional[int]:
+        """Snowflake of the moment we joined a server, or None if unknown"""
+        url = f"{DISCORD_API_BASE}/users/@me/guilds/{guild_id}/member"
+        try:
+            while True:
+                response = await self.api_request('GET', url, ROUTE_MEMBER, guild_id, 'member',
+                                                  timeout=10)
+                if response.status_code != 429:
+                    break
+            response.raise_for_status()
+            return snowflake_at(response.json()['joined_at'])
+        except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+            self.logger.warning(f"Could not read joined_at for guild {guild_id}: {e}")
+            return None
+    
+    def use_history(self, target: Dict) -> bool:
+        """Decide whether a target is enumerated by history scan instead of search.
+        
+        A target's own 'enumerator' wins over the 'enumerator' setting. In
+        'auto' mode, history is used when the census found our messages make
+        up at least history_scan_ratio of the channel (e.g. 1:1 DMs), since
+        then most of every 100-message history page is ours anyway.
+        """
+        if target['type'] == 'guild_all' or not target.get('channel_id') or 'window' in target:
+            return False  # History is per channel; guild-wide and windows need search
+        
+        settings = self.config['settings']
+        mode = target.get('enumerator', settings.get('enumerator', 'auto'))
+        if mode != 'auto':
+            return mode == 'history'
+        
+        count = target.get('message_count')
+        total = target.get('channel_total')
+        if not count or not total:
+            return False
+        return count / total >= settings.get('history_scan_ratio', 0.5)
+    
+    async def fetch_history(self, channel_id: str, before: Optional[str] = None) -> List[Dict]:
+        """Fetch up to HISTORY_PAGE messages older than `before` (newest first).
+        
+        Unlike search, channel history comes straight from the live message
+        store: no index lag, no 202s and no ghosts.
+        """
+        url = f"{DISCORD_API_BASE}/channels/{channel_id}/messages"
+        params = {'limit': HISTORY_PAGE}
+        if before is not None:
+            params['before'] = before
+        
+        while True:
+            response = await self.api_request('GET', url, ROUTE_HISTORY, channel_id, 'history',
+                                              params=params, timeout=30)
+            # Rate limited: the limiter holds the bucket, retry indefinitely
+            if response.status_code == 429:
+                continue
+            response.raise_for_status()
+            return response.json()
+    
+    async def fetch_pins(self, channel_id: str) -> List[str]:
+        """IDs of the messages pinned in a channel (one request, no search)"""
+        url = f"{DISCORD_API_BASE}/channels/{channel_id}/pins"
+        while True:
+            response = await self.api_request('GET', url, ROUTE_PINS, channel_id, 'pins', timeout=10)
+            # Rate limited: the limiter holds the bucket, retry indefinitely
+            if response.status_code == 429:
+                continue
+            response.raise_for_status()
+            return [msg['id'] for msg in response.json()]
+    
+    async def verify_messages(self, channel_id: str, messages: List[Dict]) -> List[Dict]:
+        """Drop messages that no longer exist, using channel history instead of DELETEs.
+        
+        Reads the history just above the newest message, up to VERIFY_CALLS
+        pages of HISTORY_PAGE. A message inside the range those pages cover
+        exists only if it was returned. Messages older than the covered
+        range are kept, as is everything if history cannot be read.
+        
+        Returns:
+            The messages that (may) still exist.
+        """
+        ids = [int(msg['id']) for msg in messages]
+        before = str(max(ids) + 1)
+        seen = set()
+        covered_to = None  # Oldest ID the fetched pages account for
+        try:
+            for _ in range(VERIFY_CALLS):
+                page = await self.fetch_history(channel_id, before)
+                seen.update(msg['id'] for msg in page)
+                if len(page) < HISTORY_PAGE:
+                    covered_to = 0  # Reached the start of the channel
+                    break
+                covered_to = min(int(msg['id']) for msg in page)
+                if covered_to <= min(ids):
+                    break
+                before = str(covered_to)
+        except requests.exceptions.RequestException as e:
+            self.logger.warning(f"Ghost pre-verification failed for channel {channel_id}: {e}")
+        if covered_to is None:
+            return messages
+        return [msg for msg in messages if msg['id'] in seen or int(msg['id']) < covered_to]
+    
+    async def process_history_target(self, target: Dict, dry_run: bool = False):
+        """Process a target by walking its channel history with a `before` cursor.
+        
+        Every message is fetched and filtered by author on our side, so this
+        pays off for channels where most messages are ours. The walk ends at
+        the first empty page: history has no index lag to wait out. A
+        target's max_id/min_id bounds (--retain-days) limit the walk.
+        """
+        channel_id = target['channel_id']
+        key = target_key(target)
+        min_id = int(target.get('min_id', 0))
+        
+        before = target.get('max_id')
+        messages_found = 0
+        batches = 0
+        saved = self.target_cursors.get(key)
+        if saved and 'before' in saved:
+            before = saved['before']
+            messages_found = saved.get('messages_found', 0)
+            batches = saved.get('batches', 0)
+            self.say(f"{Colors.GREEN}Resuming history scan from checkpoint (before={before}, "
+                     f"{messages_found} found in {batches} batches){Colors.ENDC}")
+        
+        self.say(f"{Colors.CYAN}Scanning channel history (no search needed){Colors.ENDC}")
+        
+        while not self.should_stop and not self.channel_skipped(channel_id):
+            self.checkpoint_target(key, {
+                'before': before,
+                'messages_found': messages_found,
+                'batches': batches
+            })
+            
+            try:
+                page = await self.fetch_history(channel_id, before)
+            except requests.exceptions.RequestException as e:
+                self.say(f"{Colors.RED}Error reading history: {e}{Colors.ENDC}")
+                self.abandoned_targets.add(key)
+                break
+            
+            if not page:
+                self.say(f"{Colors.GREEN}Reached the start of the channel{Colors.ENDC}")
+                break
+            
+            own = [msg for msg in page if msg.get('author', {}).get('id') == self.author_id
+                   and int(msg['id']) > min_id]
+            messages, indexed_ids = self.select_messages(own)
+            self.stats['indexed'] += len(indexed_ids)
+            oldest_id = str(min(int(msg['id']) for msg in page))
+            
+            if messages:
+                messages_found += len(messages)
+                batches += 1
+                self.say(f"{Colors.GREEN}Found {len(messages)} of ours in {len(page)} messages "
+                         f"(total so far: {messages_found}){Colors.ENDC}")
+                if dry_run:
+                    self.say(f"{Colors.YELLOW}[DRY RUN] Would process {len(messages)} messages{Colors.ENDC}")
+                    self.write_plan(target, messages)
+                else:
+                    batch = await self.process_batch(channel_id, messages)
+                    if self.should_stop:
+                        break
+                    parts = []
+                    if batch['edited']:
+                        parts.append(f"{batch['edited']} meowed")
+                    if batch['deleted']:
+                        parts.append(f"{batch['deleted']} deleted")
+                    if batch['skipped']:
+                        parts.append(f"{batch['skipped']} skipped")
+                    self.say(f"{Colors.CYAN}Batch done: {', '.join(parts)}{Colors.ENDC}")
+            
+            if len(page) < HISTORY_PAGE:
+                self.say(f"{Colors.GREEN}Reached the start of the channel{Colors.ENDC}")
+                break
+            if int(oldest_id) <= min_id:
+                self.say(f"{Colors.GREEN}Reached the previous run's retention horizon{Colors.ENDC}")
+                break
+            before = oldest_id
+    
+    async def process_target(self, target: Dict, dry_run: bool = False) -> Optional[float]:
+        """Process a single channel/DM target using cursor-based pagination.
+        
+        Uses max_id as a sliding cursor to walk backward through time,
+        bypassing Discord's 9,975 offset ceiling. The offset is only used
+        to skip undeletable messages within a single search page.
+        
+        A channel that is still being indexed, or a page that comes back
+        empty while results are reported, does not wait here: the target
+        is deferred with its cursor checkpointed, so other targets can run.
+        Interleaved time windows defer after every page. A deferred walk
+        keeps its ghost window and prefetched page in self.walks.
+        
+        Returns:
+            None when the target is finished, or the time.monotonic() value
+            after which a deferred target should be processed again.
+        """
+        # A deferred search walk picks up its ghost window and prefetch again
+        key = target_key(target)
+        walk = self.walks.pop(key, None)
+        if walk is None:
+            self.say(f"\n{Colors.HEADER}{'─'*60}{Colors.ENDC}")
+            self.say(f"{Colors.BOLD}Target: {target_name(target)}{Colors.ENDC}")
+            self.say(f"{Colors.HEADER}{'─'*60}{Colors.ENDC}")
+        else:
+            self.say(f"{Colors.BOLD}Continuing {target_name(target)}{Colors.ENDC}")
+        
+        # A channel the skip cache gave up on (guild-wide hits are filtered per channel)
+        single_channel = target['type'] != 'guild_all' and target.get('channel_id')
+        if single_channel and self.channel_skipped(target['channel_id']):
+            return
+        
+        # Meow phase of a react_delay run: the react phase journaled what to do
+        # (known-ID targets too, so their reactions are not sent again)
+        if self.journal is not None and key in self.reacted_targets and key in self.journal:
+            await self.replay_journal(target)
+            return
+        
+        if 'known_ids' in target:
+            await self.process_known_target(target, dry_run)
+            return
+        
+        if self.use_history(target):
+            await self.process_history_target(target, dry_run)
+            return
+        
+        guild_id, channel_id = search_scope(target)
+        
+        # Cursor-based pagination state
+        max_id_cursor = target.get('max_id')  # None = start from newest message
+        min_id = target.get('min_id')         # Lower bound of a time-window target
+        offset = 0            # Only used to skip undeletable messages within a page
+        messages_found = 0
+        batches = 0           # Pages processed for this target
+        empty_pages = 0       # Track consecutive empty pages to detect end
+        index_waits = 0       # Times the target was deferred for indexing
+        
+        # Continue mid-channel from a saved checkpoint (--resume, or a deferred turn)
+        saved = self.target_cursors.get(key)
+        if saved:
+            max_id_cursor = saved.get('max_id_cursor')
+            offset = saved.get('offset', 0)
+            messages_found = saved.get('messages_found', 0)
+            batches = saved.get('batches', 0)
+            empty_pages = saved.get('empty_pages', 0)
+            index_waits = saved.get('index_waits', 0)
+        if saved and walk is None:
+            self.say(f"{Colors.GREEN}Resuming from checkpoint (max_id={max_id_cursor}, "
+                     f"{messages_found} found in {batches} batches){Colors.ENDC}")
+        
+        # Search-ahead: fetch the next page in the background while deleting
+        prefetch = self.config['settings'].get('search_prefetch', False) and not dry_run
+        pending = walk['pending'] if walk else None  # Future for the prefetched next page
+        
+        # Nothing of ours is older than the floor. The channel's own floor is
+        # implied, but the time we joined a server also bounds the search, so
+        # total_results (and the last page) only cover messages that can exist.
+        floor_id = await self.target_floor(target)
+        if floor_id > max(history_floor(target), int(min_id or 0)):
+            min_id = str(floor_id)
+        # Interleaved windows hand over to the next window after every page
+        interleave = ('window' in target and
+                      self.config['settings'].get('window_order', 'interleave') == 'interleave')
+        last_page = False     # The current page holds every remaining result
+        
+        # Ghost pre-verification: once recent batches are mostly ghosts, check
+        # pages against channel history and only act on messages that exist
+        verify_ratio = self.config['settings'].get('ghost_verify_ratio', 0.5)
+        verify = self.config['settings'].get('ghost_verify', False)
+        recent = walk['recent'] if walk else deque(maxlen=GHOST_WINDOW)  # (ghosts, messages) of recent batches
+        
+        def end_of_history() -> bool:
+            """Report (once) that search has nothing older than the cursor"""
+            if not last_page:
+                return False
+            self.say(f"{Colors.GREEN}Reached the end of history (search reports no older messages){Colors.ENDC}")
+            return True
+        
+        def park(retry_at: float) -> float:
+            """Defer the target, keeping its cursor and walk state for the next turn"""
+            self.checkpoint_target(key, cursor())
+            self.walks[key] = {'recent': recent, 'pending': pending}
+            return retry_at
+        
+        def cursor() -> Dict:
+            return {
+                'max_id_cursor': max_id_cursor,
+                'offset': offset,
+                'messages_found': messages_found,
+                'batches': batches,
+                'empty_pages': empty_pages,
+                'index_waits': index_waits
+            }
+        
+        while not self.should_stop:
+            # The channel turned out to be forbidden or archived during this run
+            if single_channel and self.channel_skipped(target['channel_id']):
+                break
+            
+            # Record the page we're about to search so a resume restarts right here
+            self.checkpoint_target(key, cursor())
+            
+            # Search for messages
+            cursor_info = f"max_id={max_id_cursor}" if max_id_cursor else "from newest"
+            try:
+                if pending is not None:
+                    self.say(f"{Colors.CYAN}Using prefetched page ({cursor_info})...{Colors.ENDC}")
+                    result = await pending
+                    pending = None
+                else:
+                    self.say(f"{Colors.CYAN}Searching messages ({cursor_info}, offset={offset})...{Colors.ENDC}")
+                    result = await self.search_messages(guild_id, channel_id, offset=offset,
+                                                        max_id=max_id_cursor, defer_index=True,
+                                                        min_id=min_id)
+            except requests.exceptions.RequestException as e:
+                self.say(f"{Colors.RED}Error searching: {e}{Colors.ENDC}")
+                self.abandoned_targets.add(key)
+                break
+            last_search_at = time.monotonic()
+            
+            # Extract messages
+            total_results = result.get('total_results', 0)
+            if not result.get('not_indexed'):
+                # What search reported at the start of this pass (see run_passes)
+                self.pass_totals.setdefault(key, total_results)
+            message_groups = result.get('messages', [])
+            last_page = offset == 0 and len(message_groups) >= total_results
+            
+            if result.get('not_indexed'):
+                index_waits += 1
+                if index_waits >= INDEX_RETRIES or 'retry_after' not in result:
+                    self.logger.warning(f"Channel still not indexed after {index_waits} attempts, giving up")
+                    self.say(f"{Colors.YELLOW}Channel not indexed after {index_waits} attempts, skipping...{Colors.ENDC}")
+                    # A later --resume starts the index waits over from this cursor
+                    index_waits = 0
+                    self.checkpoint_target(key, cursor())
+                    self.abandoned_targets.add(key)
+                    break
+                # Park the target until Discord's estimate for the index is up
+                retry_after = result['retry_after']
+                self.say(f"{Colors.YELLOW}Channel being indexed, deferring for {retry_after}s "
+                         f"(attempt {index_waits}/{INDEX_RETRIES})...{Colors.ENDC}")
+                return park(last_search_at + retry_after)
+            index_waits = 0
+            
+            if not message_groups:
+                empty_pages += 1
+                # A zero can be index lag too; trust it once a deferred search repeats it
+                if total_results == 0 and empty_pages > 1:
+                    self.say(f"{Colors.GREEN}No more messages found (search reports none left){Colors.ENDC}")
+                    break
+                if empty_pages >= MAX_EMPTY_PAGES:
+                    self.say(f"{Colors.GREEN}No more messages found (after {empty_pages} empty pages){Colors.ENDC}")
+                    break
+                # Sometimes the index needs a moment; come back after a search delay
+                self.say(f"{Colors.YELLOW}Empty page ({empty_pages}/{MAX_EMPTY_PAGES}), deferring target...{Colors.ENDC}")
+                return park(last_search_at + self.search_delay())
+            
+            # Reset empty page counter since we got results
+            empty_pages = 0
+            
+            # Flatten message groups and extract all hit messages
+            all_hit_messages = [msg for group in message_groups for msg in group
+                                if msg.get('hit') and msg.get('author', {}).get('id') == self.author_id]
+            messages, indexed_ids = self.select_messages(all_hit_messages)
+            
+            if not messages and not all_hit_messages:
+                # No messages from us in this page - advance cursor
+                oldest_id = None
+                for group in message_groups:
+                    for msg in group:
+                        if msg.get('hit'):
+                            msg_id = int(msg['id'])
+                            if oldest_id is None or msg_id < oldest_id:
+                                oldest_id = msg_id
+                if oldest_id:
+                    max_id_cursor = str(oldest_id - 1)
+                    offset = 0
+                    self.say(f"{Colors.YELLOW}No messages from us in batch, advancing cursor...{Colors.ENDC}")
+                else:
+                    offset += len(message_groups)
+                    self.say(f"{Colors.YELLOW}No deletable messages in this batch, advancing offset...{Colors.ENDC}")
+                if end_of_history():
+                    break
+                await self.sleep(self.search_delay())
+                continue
+            
+            self.stats['indexed'] += len(indexed_ids)
+            if indexed_ids:
+                self.say(f"{Colors.YELLOW}{len(indexed_ids)} already processed (processed-ID index), "
+                         f"no requests needed{Colors.ENDC}")
+            
+            if not messages and all_hit_messages:
+                # All our messages were pinned/filtered - advance cursor past them
+                oldest_id = min(int(msg['id']) for msg in all_hit_messages)
                 max_id_cursor = str(oldest_id - 1)
                 offset = 0
-                print(f"{Colors.YELLOW}All messages in batch were filtered (pinned/meowed), advancing cursor...{Colors.ENDC}")
-                time.sleep(self.config['settings']['search_delay'])
+                self.say(f"{Colors.YELLOW}All messages in batch were filtered (pinned/meowed/processed/skip cache), advancing cursor...{Colors.ENDC}")
+                if end_of_history():
+                    break
+                await self.sleep(self.search_delay())
                 continue
             
             messages_found += len(messages)
-            print(f"{Colors.GREEN}Found {len(messages)} messages to process{Colors.ENDC}")
-            print(f"{Colors.CYAN}Total found so far: {messages_found} / ~{total_results}{Colors.ENDC}")
+            batches += 1
+            self.say(f"{Colors.GREEN}Found {len(messages)} messages to process{Colors.ENDC}")
+            self.say(f"{Colors.CYAN}Total found so far: {messages_found} / ~{total_results}{Colors.ENDC}")
             
             if dry_run:
                 # Just preview
-                print(f"\n{Colors.YELLOW}[DRY RUN] Would delete:{Colors.ENDC}")
+                self.say(f"\n{Colors.YELLOW}[DRY RUN] Would delete:{Colors.ENDC}")
                 for msg in messages[:5]:
                     content = msg.get('content', '')
                     timestamp = msg.get('timestamp', 'unknown')[:10]
-                    print(f"  - {timestamp}: [{len(content)} chars]")
+                    self.say(f"  - {timestamp}: [{len(content)} chars]")
                 if len(messages) > 5:
-                    print(f"  ... and {len(messages) - 5} more")
+                    self.say(f"  ... and {len(messages) - 5} more")
+                self.write_plan(target, messages)
                 # Advance cursor past this batch
                 oldest_id = min(int(msg['id']) for msg in messages)
                 max_id_cursor = str(oldest_id - 1)
                 offset = 0
             else:
-                # Actually process messages (edit and/or delete)
-                meow_mode = self.config['settings'].get('meow_mode', 'off')
-                if meow_mode == 'react_only':
-                    prefix_label = 'Reacting'
-                elif meow_mode == 'edit_only':
-                    prefix_label = 'Meowing'
-                elif meow_mode == 'edit_and_delete':
-                    prefix_label = 'Meowing & deleting'
-                else:
-                    prefix_label = 'Deleting'
-                progress = ProgressBar(len(messages), prefix=prefix_label)
+                # The next cursor is known now: oldest hit on this page minus one.
+                # Start that search (after the usual cooldown) while we delete.
+                next_cursor = str(min(int(msg['id']) for msg in all_hit_messages) - 1)
+                if prefetch and not last_page:
+                    pending = self.spawn(self.prefetch_search(
+                        guild_id, channel_id, next_cursor,
+                        last_search_at + self.search_delay(), min_id))
                 
-                deleted_in_batch = 0
-                edited_in_batch = 0
-                skipped_in_batch = 0
-                oldest_processed_id = None
+                # Route hits to per-channel queues. Search results carry their own
+                # channel_id (threads, guild-wide search), which is what we act on.
+                queues = {}
+                for msg in messages:
+                    queues.setdefault(msg.get('channel_id', channel_id), []).append(msg)
                 
-                for i, msg in enumerate(messages):
-                    if self.should_stop:
-                        break
-                    
-                    message_id = msg['id']
-                    max_retries = self.config['settings']['max_retries']
-                    
-                    # Track the oldest message for cursor advancement
-                    msg_id_int = int(message_id)
-                    if oldest_processed_id is None or msg_id_int < oldest_processed_id:
-                        oldest_processed_id = msg_id_int
-                    
-                    # Meow mode: edit message content before deletion
-                    was_ghost = False
-                    if meow_mode != 'off':
-                        # Skip if message is already meowed
-                        if msg.get('content') != MEOW_TEXT:
-                            # React with a random mouse emoji before editing
-                            if meow_mode in ('react_only', 'edit_only', 'edit_and_delete'):
-                                for attempt in range(1, max_retries + 1):
-                                    react_result = self.react_message(channel_id, message_id, attempt)
-                                    
-                                    if react_result == 'OK':
-                                        self.stats['reacted'] += 1
-                                        time.sleep(self.config['settings']['delete_delay'])
-                                        break
-                                    elif react_result == 'GHOST':
-                                        self.stats['ghosts'] += 1
-                                        deleted_in_batch += 1
-                                        was_ghost = True
-                                        break
-                                    elif react_result in ('SKIP', 'FAILED'):
-                                        break
-                                    elif react_result == 'RETRY':
-                                        if attempt < max_retries:
-                                            time.sleep(1)
-                                            continue
-                                        break
-                                
-                                # If ghost, skip everything (message doesn't exist)
-                                if was_ghost:
-                                    progress.update(i + 1)
-                                    continue
-                            
-                            # In react_only mode, skip edit entirely
-                            if meow_mode == 'react_only':
-                                progress.update(i + 1)
-                                time.sleep(self.config['settings']['delete_delay'])
-                                continue
-                            
-                            edit_success = False
-                            for attempt in range(1, max_retries + 1):
-                                edit_result = self.edit_message(channel_id, message_id, MEOW_TEXT, attempt)
-                                
-                                if edit_result == 'OK':
-                                    self.stats['edited'] += 1
-                                    edited_in_batch += 1
-                                    edit_success = True
-                                    break
-                                elif edit_result == 'GHOST':
-                                    self.stats['ghosts'] += 1
-                                    deleted_in_batch += 1
-                                    was_ghost = True
-                                    break
-                                elif edit_result in ('SKIP', 'FAILED'):
-                                    break
-                                elif edit_result == 'RETRY':
-                                    if attempt < max_retries:
-                                        time.sleep(1)
-                                        continue
-                                    break
-                            
-                            # If ghost, skip deletion (message doesn't exist)
-                            if was_ghost:
-                                progress.update(i + 1)
-                                continue
-                            
-                            # Delay after edit before next API call
-                            if edit_success:
-                                time.sleep(self.config['settings']['delete_delay'])
-                    
-                    # In edit_only or react_only mode, skip deletion entirely
-                    if meow_mode in ('edit_only', 'react_only'):
-                        progress.update(i + 1)
-                        # Still need a delay between edits
-                        if not was_ghost:
-                            time.sleep(self.config['settings']['delete_delay'])
-                        continue
-                    
-                    # Attempt deletion with retries
-                    for attempt in range(1, max_retries + 1):
-                        result = self.delete_message(channel_id, message_id, attempt)
-                        
-                        if result == 'OK':
-                            self.stats['deleted'] += 1
-                            deleted_in_batch += 1
-                            break
-                        elif result == 'GHOST':
-                            self.stats['ghosts'] += 1
-                            deleted_in_batch += 1
-                            was_ghost = True
-                            break
-                        elif result == 'SKIP':
-                            self.stats['skipped'] += 1
-                            skipped_in_batch += 1
-                            break
-                        elif result == 'FAILED':
-                            self.stats['failed'] += 1
-                            skipped_in_batch += 1
-                            break
-                        elif result == 'RETRY':
-                            if attempt < max_retries:
-                                time.sleep(1)
-                                continue
-                            else:
-                                self.stats['failed'] += 1
-                                skipped_in_batch += 1
-                                break
-                    
-                    progress.update(i + 1)
-                    
-                    # Skip delay for ghost messages (already deleted, no API cost)
-                    if not was_ghost:
-                        time.sleep(self.config['settings']['delete_delay'])
+                verified_ghosts = []
+                ghost_count = sum(g for g, _ in recent)
+                message_count = sum(n for _, n in recent)
+                if verify and message_count and ghost_count / message_count >= verify_ratio:
+                    for queue_channel, queued in list(queues.items()):
+                        alive = await self.verify_messages(queue_channel, queued)
+                        alive_ids = {msg['id'] for msg in alive}
+                        verified_ghosts += [int(msg['id']) for msg in queued if msg['id'] not in alive_ids]
+                        queues[queue_channel] = alive
+                    queues = {c: q for c, q in queues.items() if q}
+                    for ghost_id in verified_ghosts:
+                        self.mark_processed(str(ghost_id))
+                    self.stats['ghosts'] += len(verified_ghosts)
+                    self.say(f"{Colors.YELLOW}Pre-verified against history: {len(verified_ghosts)} of "
+                             f"{len(messages)} are ghosts, no DELETE needed{Colors.ENDC}")
                 
-                progress.finish()
+                batch = await self.process_queues(queues)
+                edited_in_batch = batch['edited']
+                deleted_in_batch = batch['deleted'] + len(verified_ghosts)
+                skipped_in_batch = batch['skipped']
+                oldest_processed_id = batch['oldest_id']
+                recent.append((batch['ghosts'] + len(verified_ghosts), len(messages)))
+                known_ids = indexed_ids + verified_ghosts
+                if known_ids and not self.should_stop:
+                    # Known ghosts count as processed, so the cursor skips past them too
+                    if oldest_processed_id is not None:
+                        known_ids.append(oldest_processed_id)
+                    oldest_processed_id = min(known_ids)
                 
                 # Advance the cursor past everything we processed.
                 # This is the key: instead of incrementing offset (which hits
                 # Discord's 9,975 ceiling), we slide max_id backward through time.
-                if oldest_processed_id is not None:
+                if pending is not None and not self.should_stop:
+                    # Prefetched page was requested from the oldest hit on this page
+                    max_id_cursor = next_cursor
+                    offset = 0
+                    self.logger.info(
+                        f"Cursor advanced: max_id={max_id_cursor} "
+                        f"(edited={edited_in_batch}, deleted={deleted_in_batch}, skipped={skipped_in_batch})"
+                    )
+                elif oldest_processed_id is not None:
                     max_id_cursor = str(oldest_processed_id - 1)
                     offset = 0  # Reset offset since cursor handles pagination
                     self.logger.info(
@@ -922,16 +2831,209 @@ class Paracord:
                     parts.append(f"{deleted_in_batch} deleted")
                 if skipped_in_batch:
                     parts.append(f"{skipped_in_batch} skipped")
-                print(f"{Colors.CYAN}Batch done: {', '.join(parts)}{Colors.ENDC}")
+                self.say(f"{Colors.CYAN}Batch done: {', '.join(parts)}{Colors.ENDC}")
+            
+            if pending is None and end_of_history():
+                break
             
-            # Delay before next search
-            print(f"{Colors.CYAN}Waiting {self.config['settings']['search_delay']}s before next search...{Colors.ENDC}")
-            time.sleep(self.config['settings']['search_delay'])
+            # Let the next window search while this one's cooldown runs. A
+            # prefetched page keeps running and is picked up on the next turn.
+            if interleave and not self.should_stop:
+                return park(last_search_at + self.search_delay())
+            
+            # Delay before next search (a prefetched page already waited it out)
+            if pending is None:
+                self.say(f"{Colors.CYAN}Waiting {self.search_delay():g}s before next search...{Colors.ENDC}")
+                await self.sleep(self.search_delay())
+        
+        if pending is not None:
+            pending.cancel()
+    
+    def run_census(self, config_file: str, prune: str = 'disable'):
+        """Count our messages in every enabled target and prune empty ones.
+        
+        Writes 'message_count' (ours), 'channel_total' (everyone's, only where
+        we have messages) and 'census_at' into each target of the config file.
+        Targets with no messages are disabled, or removed with prune='drop'.
+        """
+        print(f"\n{Colors.HEADER}{'='*60}{Colors.ENDC}")
+        print(f"{Colors.HEADER}CENSUS{Colors.ENDC}")
+        print(f"{Colors.HEADER}{'='*60}{Colors.ENDC}\n")
+        
+        with open(config_file, 'r') as f:
+            config = json.load(f)
+        self.config = config
+        self.start_pacer()
+        
+        targets = [t for t in config['targets'] if t.get('enabled', True)]
+        print(f"{Colors.CYAN}Counting messages in {len(targets)} targets "
+              f"(~{len(targets) * self.search_delay():g}s)...{Colors.ENDC}\n")
+        self.run_engine(self.census_targets(targets))
+        if self.pacer is not None:
+            self.pacer.save()
+        
+        empty = [t for t in targets if t.get('message_count') == 0]
+        if prune == 'drop':
+            empty_ids = {id(t) for t in empty}
+            config['targets'] = [t for t in config['targets'] if id(t) not in empty_ids]
+        else:
+            for target in empty:
+                target['enabled'] = False
+        
+        with open(config_file, 'w') as f:
+            json.dump(config, f, indent=2)
+        
+        counted = [t for t in targets if 'message_count' in t]
+        total = sum(t['message_count'] for t in counted)
+        action = "removed" if prune == 'drop' else "disabled"
+        print(f"\n{Colors.GREEN}Census saved to {config_file}{Colors.ENDC}")
+        print(f"  Targets counted: {len(counted)}/{len(targets)}")
+        print(f"  Messages found: {total}")
+        print(f"  Empty targets {action}: {len(empty)}")
+    
+    async def census_targets(self, targets: List[Dict]):
+        """Record message counts on each target (one or two searches per target)"""
+        last_search_at = None
+        
+        async def search(*args, **kwargs) -> Dict:
+            """Search, one search_delay() after the previous census search"""
+            nonlocal last_search_at
+            if last_search_at is not None:
+                wait = last_search_at + self.search_delay() - time.monotonic()
+                if wait > 0:
+                    await self.sleep(wait)
+            try:
+                return await self.search_messages(*args, **kwargs)
+            finally:
+                last_search_at = time.monotonic()
+        
+        for i, target in enumerate(targets):
+            if self.should_stop:
+                break
+            
+            guild_id, channel_id = search_scope(target)
+            try:
+                result = await search(guild_id, channel_id)
+                if result.get('not_indexed'):
+                    # Unknown count: leave the target as it is
+                    print(f"  [{i+1}/{len(targets)}] {target_name(target)}: {Colors.YELLOW}not indexed{Colors.ENDC}")
+                    continue
+                count = result.get('total_results', 0)
+                
+                # Everyone's messages, so we know what share of the channel is ours
+                if count and target['type'] != 'guild_all':
+                    overall = await search(guild_id, channel_id, author_only=False)
+                    if not overall.get('not_indexed'):
+                        target['channel_total'] = overall.get('total_results', 0)
+            except requests.exceptions.RequestException as e:
+                print(f"  [{i+1}/{len(targets)}] {target_name(target)}: {Colors.RED}error: {e}{Colors.ENDC}")
+                continue
+            
+            target['message_count'] = count
+            target['census_at'] = datetime.now().isoformat(timespec='seconds')
+            color = Colors.GREEN if count else Colors.YELLOW
+            print(f"  [{i+1}/{len(targets)}] {target_name(target)}: {color}{count} messages{Colors.ENDC}")
+            self.logger.info(f"Census: {target_key(target)} has {count} messages")
+    
+    def load_package_targets(self, package: str, config_targets: List[Dict]) -> List[Dict]:
+        """Read known-ID targets from a data package.
+        
+        If the config lists targets, only package channels they cover (by
+        channel, or by guild for guild_all targets) are kept.
+        """
+        print(f"{Colors.CYAN}Reading data package: {package}{Colors.ENDC}")
+        try:
+            targets = read_data_package(package)
+        except (OSError, zipfile.BadZipFile, ValueError, KeyError) as e:
+            print(f"{Colors.RED}Error reading data package: {e}{Colors.ENDC}")
+            sys.exit(1)
+        
+        if config_targets:
+            channel_ids = {t.get('channel_id') for t in config_targets}
+            guild_ids = {t['guild_id'] for t in config_targets if t['type'] == 'guild_all'}
+            targets = [t for t in targets
+                       if t['channel_id'] in channel_ids or t.get('guild_id') in guild_ids]
+        
+        total = sum(len(t['known_ids']) for t in targets)
+        print(f"{Colors.GREEN}Found {total} known messages in {len(targets)} channels{Colors.ENDC}")
+        if self.config['settings'].get('skip_meowed'):
+            meowed = sum(len(t['meowed_ids']) for t in targets)
+            print(f"{Colors.YELLOW}Note: skip_meowed goes by the contents at export time; "
+                  f"{meowed} messages were meowed then, later meows are not known{Colors.ENDC}")
+        return targets
+    
+    def load_plan_targets(self, plan: str, meow_mode: Optional[str] = None) -> List[Dict]:
+        """Read known-ID targets from a plan file and adopt its meow mode.
+        
+        Every message is processed with the action on its plan line. A
+        --meow (meow_mode) that disagrees with those actions is an error.
+        """
+        print(f"{Colors.CYAN}Reading plan: {plan}{Colors.ENDC}")
+        try:
+            header, targets = read_plan(plan)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"{Colors.RED}Error reading plan: {e}{Colors.ENDC}")
+            sys.exit(1)
+        
+        if header.get('author_id') and header['author_id'] != self.author_id:
+            print(f"{Colors.RED}Plan was made for a different account ({header['author_id']}){Colors.ENDC}")
+            sys.exit(1)
+        
+        # The plan records what the dry run would have done; apply exactly that
+        actions = sorted({t['meow_mode'] for t in targets})
+        if meow_mode is not None and actions and actions != [meow_mode]:
+            print(f"{Colors.RED}--meow {meow_mode} conflicts with the plan's actions "
+                  f"({', '.join(actions)}); drop --meow or write a new plan{Colors.ENDC}")
+            sys.exit(1)
+        if len(actions) > 1:
+            print(f"{Colors.CYAN}Plan mixes meow modes: {', '.join(actions)}{Colors.ENDC}")
+        plan_mode = header.get('meow_mode', 'off')
+        if plan_mode != self.config['settings'].get('meow_mode', 'off'):
+            print(f"{Colors.YELLOW}Using the plan's meow mode: {plan_mode}{Colors.ENDC}")
+            self.config['settings']['meow_mode'] = plan_mode
+        
+        total = sum(len(t['known_ids']) for t in targets)
+        print(f"{Colors.GREEN}Plan has {total} messages in {len(targets)} channels "
+              f"(created {header.get('created', 'unknown')}){Colors.ENDC}")
+        return targets
+    
+    def open_plan(self, plan_out: str):
+        """Start a plan file (owner read/write only) and write its header"""
+        fd = os.open(plan_out, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.fchmod(fd, 0o600)
+        self.plan_file = os.fdopen(fd, 'w')
+        self.plan_file.write(json.dumps({
+            'plan': PLAN_VERSION,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'author_id': self.author_id,
+            'meow_mode': self.config['settings'].get('meow_mode', 'off')
+        }) + '\n')
+    
+    def start_pacer(self):
+        """Create the AdaptivePacer when the config asks for adaptive pacing"""
+        settings = self.config['settings']
+        if settings.get('pacing', 'fixed') == 'adaptive':
+            self.pacer = AdaptivePacer(
+                start={PACE_SEARCH: settings['search_delay'], PACE_ACTION: settings['delete_delay']},
+                floor={PACE_SEARCH: settings.get('search_delay_floor', 2),
+                       PACE_ACTION: settings.get('delete_delay_floor', 0.25)},
+                ceiling={PACE_SEARCH: settings.get('search_delay_ceiling', 60),
+                         PACE_ACTION: settings.get('delete_delay_ceiling', 10)})
     
     def run_batch(self, config_file: str, dry_run: bool = False, resume: bool = False,
                   skip_confirm: bool = False, meow_mode: Optional[str] = None,
-                  skip_meowed: Optional[bool] = None, react_delay: Optional[int] = None):
-        """Run batch deletion from config file"""
+                  skip_meowed: Optional[bool] = None, react_delay: Optional[int] = None,
+                  pacing: Optional[str] = None, prefetch: Optional[bool] = None,
+                  parallel_targets: Optional[int] = None, package: Optional[str] = None,
+                  plan_out: Optional[str] = None, apply_plan: Optional[str] = None,
+                  enumerator: Optional[str] = None, retry_failed: bool = False,
+                  windows: Optional[int] = None, retain_days: Optional[float] = None,
+                  passes: Optional[Union[int, str]] = None, pipeline: Optional[bool] = None):
+        """Run batch deletion from config file.
+        
+        With retry_failed, no targets are processed: only the queued failed
+        actions from earlier runs are retried (the drain phase).
+        """
         
         print(f"\n{Colors.HEADER}{'='*60}{Colors.ENDC}")
         print(f"{Colors.HEADER}PARACORD v{__version__}{Colors.ENDC}")
@@ -961,6 +3063,58 @@ class Paracord:
         # Ensure react_delay has a default
         config['settings'].setdefault('react_delay', 0)
         
+        # CLI --pacing flag overrides config file pacing
+        if pacing is not None:
+            config['settings']['pacing'] = pacing
+        config['settings'].setdefault('pacing', 'fixed')
+        # Bucket pacing honors retry_after exactly; fixed pacing keeps the 2x margin
+        self.rate_limiter.backoff = 1.0 if config['settings']['pacing'] == 'buckets' else 2.0
+        self.start_pacer()
+        
+        # CLI --prefetch flag overrides config file search_prefetch
+        if prefetch is not None:
+            config['settings']['search_prefetch'] = prefetch
+        config['settings'].setdefault('search_prefetch', False)
+        
+        # CLI --enumerator flag overrides config file enumerator
+        if enumerator is not None:
+            config['settings']['enumerator'] = enumerator
+        config['settings'].setdefault('enumerator', 'auto')
+        
+        # CLI --passes flag overrides config file passes
+        if passes is not None:
+            config['settings']['passes'] = passes
+        config['settings'].setdefault('passes', 1)
+        
+        # CLI --windows flag overrides config file windows
+        if windows is not None:
+            config['settings']['windows'] = windows
+            # Asked for on the command line: split every search target
+            config['settings'].setdefault('window_min_messages', 0)
+        config['settings'].setdefault('windows', 1)
+        
+        # CLI --parallel-targets flag overrides config file parallel_targets
+        if parallel_targets is not None:
+            config['settings']['parallel_targets'] = parallel_targets
+        config['settings'].setdefault('parallel_targets', 1)
+        if config['settings']['parallel_targets'] > 1 and not self.concurrent:
+            print(f"{Colors.YELLOW}parallel_targets needs --engine async; processing one target at a time{Colors.ENDC}")
+            config['settings']['parallel_targets'] = 1
+        self.rate_limiter.global_rate = config['settings'].get('global_rate_limit', 50)
+        
+        # CLI --pipeline flag overrides config file pipeline_actions
+        if pipeline is not None:
+            config['settings']['pipeline_actions'] = pipeline
+        config['settings'].setdefault('pipeline_actions', False)
+        if config['settings']['pipeline_actions']:
+            if not self.concurrent:
+                print(f"{Colors.YELLOW}pipeline_actions needs --engine async; acting on one message at a time{Colors.ENDC}")
+            elif config['settings']['pacing'] != 'buckets':
+                # Fixed/adaptive pauses are the pacing; overlapping them would multiply the rate
+                print(f"{Colors.YELLOW}pipeline_actions needs --pacing buckets; acting on one message at a time{Colors.ENDC}")
+            else:
+                self.gate = InFlightGate(self.rate_limiter)
+        
         # Token and author_id already set by main()
         
         # Load progress if resuming
@@ -971,19 +3125,87 @@ class Paracord:
             self.current_target_index = self.progress_data.get('current_target_index', 0)
         
         # Get targets
-        targets = [t for t in config['targets'] if t.get('enabled', True)]
+        targets = [t for t in config.get('targets', []) if t.get('enabled', True)]
+        
+        # Known-ID mode: targets and message IDs come from the data package
+        if package:
+            targets = self.load_package_targets(package, targets)
+        
+        # Apply mode: execute a plan from an earlier dry run, no searching
+        if apply_plan:
+            if targets:
+                print(f"{Colors.YELLOW}--apply ignores the {len(targets)} targets in the config; "
+                      f"the plan lists its own{Colors.ENDC}")
+            targets = self.load_plan_targets(apply_plan, meow_mode)
+        
+        # Drain-only mode: retry queued failures, no targets
+        if retry_failed:
+            if dry_run or not config['settings'].get('failed_queue', True):
+                print(f"{Colors.RED}--retry-failed needs a real run with failed_queue enabled{Colors.ENDC}")
+                sys.exit(1)
+            targets = []
+            queue = FailedQueue()
+            queued = len(queue)
+            queue.close()
+            if not queued:
+                print(f"{Colors.GREEN}No failed messages queued in {FAILED_QUEUE_FILE}{Colors.ENDC}")
+                sys.exit(0)
+            print(f"{Colors.CYAN}Retrying {queued} queued failed messages (no searching){Colors.ENDC}")
         
-        if not targets:
+        if not targets and not retry_failed:
             print(f"{Colors.RED}No enabled targets found in config{Colors.ENDC}")
             sys.exit(1)
         
+        # Retention: only the slice between the last run's horizon and now - N days
+        if retain_days is not None:
+            config['settings']['retain_days'] = retain_days
+        if config['settings'].get('retain_days') is not None:
+            targets = self.apply_retention(targets, config['settings']['retain_days'])
+        
+        # Big channels become several time windows, each with its own cursor
+        self.window_edges = self.progress_data.get('window_edges', {})
+        targets = self.split_targets(targets)
+        
+        if self.progress_data:
+            if 'completed_targets' in self.progress_data:
+                self.completed_targets = set(self.progress_data['completed_targets'])
+            else:
+                # Progress files from older versions only record an index
+                self.completed_targets = {target_key(t) for t in targets[:self.current_target_index]}
+            self.target_cursors = self.progress_data.get('target_cursors', {})
+            self.reacted_targets = self.progress_data.get('reacted_targets', {})
+        
         print(f"{Colors.BOLD}Configuration loaded:{Colors.ENDC}")
         print(f"  Targets: {len(targets)}")
-        print(f"  Search delay: {config['settings']['search_delay']}s")
-        print(f"  Delete delay: {config['settings']['delete_delay']}s")
+        if self.pacer is not None:
+            source = f"learned, {PACING_FILE}" if self.pacer.resumed else "starting from config"
+            print(f"  Search delay: {Colors.YELLOW}{self.pacer.delay(PACE_SEARCH):g}s adaptive{Colors.ENDC} ({source})")
+            print(f"  Delete delay: {Colors.YELLOW}{self.pacer.delay(PACE_ACTION):g}s adaptive{Colors.ENDC} ({source})")
+        else:
+            print(f"  Search delay: {config['settings']['search_delay']}s")
+            if config['settings']['pacing'] == 'buckets':
+                print(f"  Delete delay: {Colors.YELLOW}paced to rate limit buckets{Colors.ENDC}")
+            else:
+                print(f"  Delete delay: {config['settings']['delete_delay']}s")
         print(f"  Skip pinned: {config['settings']['skip_pinned']}")
         if config['settings'].get('skip_meowed'):
             print(f"  Skip meowed: {Colors.YELLOW}True{Colors.ENDC} (meowed messages will be preserved)")
+        if config['settings']['parallel_targets'] > 1:
+            print(f"  Parallel targets: {Colors.YELLOW}{config['settings']['parallel_targets']}{Colors.ENDC}")
+        if config['settings']['passes'] != 1 and not dry_run:
+            print(f"  Passes: {Colors.YELLOW}{config['settings']['passes']}{Colors.ENDC} "
+                  f"(targets are searched again until the index reports none left)")
+        if config['settings']['search_prefetch']:
+            print(f"  Search prefetch: {Colors.YELLOW}True{Colors.ENDC} (next page fetched while deleting)")
+        if self.gate is not None:
+            print(f"  Action pipeline: {Colors.YELLOW}True{Colors.ENDC} (messages overlap up to each bucket's limit)")
+        window_targets = sum(1 for t in targets if 'window' in t)
+        if window_targets:
+            print(f"  Time windows: {Colors.YELLOW}{window_targets} windows{Colors.ENDC} "
+                  f"({config['settings'].get('window_order', 'interleave')} order)")
+        history_targets = sum(1 for t in targets if 'known_ids' not in t and self.use_history(t))
+        if history_targets:
+            print(f"  History scan: {Colors.YELLOW}{history_targets} targets{Colors.ENDC} (channel history instead of search)")
         
         meow_mode = config['settings'].get('meow_mode', 'off')
         react_delay_mins = config['settings'].get('react_delay', 0)
@@ -994,6 +3216,10 @@ class Paracord:
         
         if dry_run:
             print(f"{Colors.YELLOW}  DRY RUN MODE: No messages will be deleted{Colors.ENDC}")
+            if plan_out:
+                print(f"  Plan file: {Colors.YELLOW}{plan_out}{Colors.ENDC}")
+        elif plan_out:
+            print(f"{Colors.YELLOW}--plan-out only applies to --dry-run; ignoring{Colors.ENDC}")
         
         # Confirm
         if not dry_run and not skip_confirm:
@@ -1005,7 +3231,10 @@ class Paracord:
                 action_desc = f"edit messages to \"{MEOW_LABEL}\" then delete them from"
             else:
                 action_desc = "delete messages from"
-            print(f"\n{Colors.YELLOW}This will {action_desc} {len(targets)} channels/DMs.{Colors.ENDC}")
+            if retry_failed:
+                print(f"\n{Colors.YELLOW}This will retry the queued failed actions in {FAILED_QUEUE_FILE}.{Colors.ENDC}")
+            else:
+                print(f"\n{Colors.YELLOW}This will {action_desc} {len(targets)} channels/DMs.{Colors.ENDC}")
             print(f"{Colors.YELLOW}This action cannot be undone!{Colors.ENDC}")
             confirm = input("Continue? (yes/no): ").lower().strip()
             if confirm != 'yes':
@@ -1015,78 +3244,409 @@ class Paracord:
         # Start timer
         self.stats['start_time'] = datetime.now()
         
-        # Two-phase react delay: react to all targets first, wait, then edit/delete
+        if dry_run and plan_out:
+            self.open_plan(plan_out)
+        if config['settings'].get('processed_index', True):
+            self.processed = ProcessedIndex()
+            if len(self.processed):
+                print(f"{Colors.CYAN}Processed-ID index: {len(self.processed)} messages "
+                      f"will be skipped without requests{Colors.ENDC}")
+        if config['settings'].get('skip_cache', True):
+            self.skip_cache = SkipCache()
+            if self.skip_cache.messages or self.skip_cache.channels:
+                print(f"{Colors.CYAN}Skip cache: {len(self.skip_cache.messages)} messages and "
+                      f"{len(self.skip_cache.channels)} channels will be skipped without requests{Colors.ENDC}")
+        if not dry_run and config['settings'].get('failed_queue', True):
+            self.failed = FailedQueue()
+            if len(self.failed) and not retry_failed:
+                print(f"{Colors.CYAN}Failed queue: {len(self.failed)} messages from earlier runs "
+                      f"will be retried at the end{Colors.ENDC}")
+        try:
+            self.run_engine(self.execute_batch(targets, dry_run))
+            if self.retention_horizon is not None and not dry_run:
+                self.save_retention_marks(targets)
+        finally:
+            if self.journal is not None:
+                self.journal.close()
+            if self.failed is not None:
+                self.failed.close()
+            if self.skip_cache is not None:
+                self.skip_cache.save()
+            if self.processed is not None:
+                self.processed.close()
+            if self.pacer is not None:
+                self.pacer.save()
+            if self.plan_file is not None:
+                self.plan_file.close()
+                self.plan_file = None
+                print(f"\n{Colors.GREEN}Plan written: {self.planned_messages} messages → {plan_out}{Colors.ENDC}")
+                print(f"{Colors.CYAN}Review it, then run with --apply {plan_out}{Colors.ENDC}")
+        
+        # End timer
+        self.stats['end_time'] = datetime.now()
+        
+        # Print summary
+        self.print_summary()
+    
+    async def execute_batch(self, targets: List[Dict], dry_run: bool = False):
+        """Process all targets, in one phase or as react → wait → meow phases"""
+        config = self.config
+        meow_mode = config['settings'].get('meow_mode', 'off')
+        react_delay_mins = config['settings'].get('react_delay', 0)
+        
+        # Two-phase react delay: each target reacts, waits out its own delay, then
+        # edits/deletes, while other targets keep working in the meantime
         if react_delay_mins > 0 and meow_mode in ('edit_only', 'edit_and_delete') and not dry_run:
-            # Phase 1: React only
-            original_meow_mode = config['settings']['meow_mode']
-            config['settings']['meow_mode'] = 'react_only'
+            self.meow_phases = True
+            self.journal = ReactJournal()
+            print(f"\n{Colors.HEADER}{'='*60}{Colors.ENDC}")
+            print(f"{Colors.HEADER}REACT → WAIT {react_delay_mins} MIN → MEOW, PER TARGET{Colors.ENDC}")
+            print(f"{Colors.HEADER}{'='*60}{Colors.ENDC}")
+        
+        await self.process_targets(targets, dry_run)
+        
+        # Further passes for targets the lagging search index still reports hits in
+        if not dry_run and not self.should_stop:
+            await self.run_passes(targets)
+        
+        # Retry what failed (this run or earlier ones) directly by ID
+        if not dry_run and not self.should_stop:
+            await self.drain_failed()
+    
+    async def count_remaining(self, target: Dict) -> Optional[int]:
+        """How many of our messages search still reports for a target (None if unknown)"""
+        guild_id, channel_id = search_scope(target)
+        try:
+            result = await self.search_messages(guild_id, channel_id, max_id=target.get('max_id'),
+                                                min_id=target.get('min_id'))
+        except requests.exceptions.RequestException as e:
+            self.logger.warning(f"Could not count {target_key(target)}: {e}")
+            return None
+        if result.get('not_indexed'):
+            return None
+        return result.get('total_results', 0)
+    
+    async def run_passes(self, targets: List[Dict]):
+        """Re-run search targets until the index reports nothing left.
+        
+        Search lags behind deletions, so a finished target can still report
+        hits. With passes > 1 (or 'auto', up to max_passes) every search
+        target is counted again after pass_interval seconds, doubling after
+        each pass up to pass_interval_max. Targets reporting zero (including
+        those whose first search in this run did) are done; targets whose count did
+        not drop since their last pass (pinned or undeletable messages) are
+        left alone. The rest get another pass. Passes stop when no target is
+        left.
+        """
+        settings = self.config['settings']
+        passes = settings.get('passes', 1)
+        max_passes = settings.get('max_passes', 10) if passes == 'auto' else int(passes)
+        interval = settings.get('pass_interval', 300)
+        interval_max = settings.get('pass_interval_max', 3600)
+        
+        # Known IDs and history scans read live data; only search lags
+        active = [t for t in targets if 'known_ids' not in t and not self.use_history(t)]
+        previous = dict(self.pass_totals)  # target_key() -> count at the start of its last pass
+        # Search already reported nothing for these in the first pass
+        active = [t for t in active if previous.get(target_key(t)) != 0]
+        
+        for pass_number in range(2, max_passes + 1):
+            if not active or self.should_stop:
+                break
             
             print(f"\n{Colors.HEADER}{'='*60}{Colors.ENDC}")
-            print(f"{Colors.HEADER}PHASE 1: REACT{Colors.ENDC}")
+            print(f"{Colors.HEADER}PASS {pass_number}: waiting {interval:g}s for the search index "
+                  f"to catch up{Colors.ENDC}")
             print(f"{Colors.HEADER}{'='*60}{Colors.ENDC}")
+            await self.sleep(interval)
+            interval = min(interval * 2, interval_max)
             
-            for i in range(self.current_target_index, len(targets)):
+            again = []
+            for target in active:
                 if self.should_stop:
                     break
-                
-                target = targets[i]
-                print(f"\n{Colors.BOLD}[{i+1}/{len(targets)}] Processing target...{Colors.ENDC}")
-                
-                self.process_target(target, dry_run)
-                self.current_target_index = i + 1
-                self.save_progress()
-            
-            if not self.should_stop:
-                # Wait for react_delay minutes
-                print(f"\n{Colors.HEADER}{'='*60}{Colors.ENDC}")
-                print(f"{Colors.YELLOW}Mice deployed. Waiting {react_delay_mins} minute{'s' if react_delay_mins != 1 else ''}...{Colors.ENDC}")
-                print(f"{Colors.HEADER}{'='*60}{Colors.ENDC}")
-                
-                for remaining in range(react_delay_mins * 60, 0, -1):
-                    if self.should_stop:
-                        break
-                    mins, secs = divmod(remaining, 60)
-                    print(f"\r{Colors.CYAN}  {mins:02d}:{secs:02d} remaining...{Colors.ENDC}", end='', flush=True)
-                    time.sleep(1)
-                print()  # newline after countdown
-            
-            if not self.should_stop:
-                # Phase 2: Edit (and optionally delete)
-                config['settings']['meow_mode'] = original_meow_mode
-                self.current_target_index = 0  # Reset to process all targets again
-                
-                print(f"\n{Colors.HEADER}{'='*60}{Colors.ENDC}")
-                print(f"{Colors.HEADER}PHASE 2: MEOW{Colors.ENDC}")
-                print(f"{Colors.HEADER}{'='*60}{Colors.ENDC}")
-                
-                for i in range(self.current_target_index, len(targets)):
-                    if self.should_stop:
-                        break
-                    
-                    target = targets[i]
-                    print(f"\n{Colors.BOLD}[{i+1}/{len(targets)}] Processing target...{Colors.ENDC}")
-                    
-                    self.process_target(target, dry_run)
-                    self.current_target_index = i + 1
-                    self.save_progress()
+                key = target_key(target)
+                count = await self.count_remaining(target)
+                await self.sleep(self.search_delay())
+                before = previous.get(key)
+                if count == 0:
+                    status = f"{Colors.GREEN}confirmed empty{Colors.ENDC}"
+                elif count is not None and before is not None and count >= before:
+                    status = f"{Colors.YELLOW}{count} left, no progress since last pass; leaving it{Colors.ENDC}"
+                else:
+                    status = f"{count if count is not None else 'unknown'} left"
+                    again.append(target)
+                if count is not None:
+                    previous[key] = count
+                print(f"  {target_name(target)}: {status}")
+            active = again
+            
+            if not active or self.should_stop:
+                break
+            print(f"{Colors.CYAN}Pass {pass_number}: {len(active)} targets still have hits{Colors.ENDC}")
+            
+            for target in active:
+                self.completed_targets.discard(target_key(target))
+                self.target_cursors.pop(target_key(target), None)
+            self.current_target_index = 0
+            await self.process_targets(active)
         else:
-            # Single-phase: process targets normally
-            for i in range(self.current_target_index, len(targets)):
-                if self.should_stop:
-                    break
+            if active and not self.should_stop and max_passes > 1:
+                print(f"{Colors.YELLOW}Stopped after {max_passes} passes; {len(active)} targets "
+                      f"still had hits at the start of the last one{Colors.ENDC}")
+    
+    async def run_target(self, target: Dict, dry_run: bool = False) -> Optional[float]:
+        """Process a target, through both meow phases in react_delay runs.
+        
+        Phase 1 reacts only, journaling every message it goes through. The
+        target is then deferred until its own react_delay has passed (timed
+        from when its reactions finished, kept in the progress file) and
+        phase 2 edits/deletes the journaled messages with the configured meow
+        mode, without searching. Returns a retry time like process_target.
+        """
+        # Plan targets carry their own meow mode; only edits get a react phase
+        MEOW_PHASE.set(target.get('meow_mode'))
+        if not self.meow_phases or self.meow_mode() not in ('edit_only', 'edit_and_delete'):
+            return await self.process_target(target, dry_run)
+        
+        key = target_key(target)
+        delay = self.config['settings'].get('react_delay', 0) * 60
+        if key not in self.reacted_targets:
+            if self.journal is not None and key not in self.target_cursors:
+                self.journal.start(key)
+            MEOW_PHASE.set('react_only')
+            JOURNAL_TARGET.set(key)
+            retry_at = await self.process_target(target, dry_run)
+            JOURNAL_TARGET.set(None)
+            if retry_at is not None or self.should_stop or key in self.abandoned_targets:
+                return retry_at
+            self.reacted_targets[key] = time.time()
+            self.target_cursors.pop(key, None)  # Phase 2 starts at the top of the journal
+            self.save_progress()
+            self.say(f"{Colors.YELLOW}Mice deployed. Meowing this target in "
+                     f"{delay / 60:g} min{Colors.ENDC}")
+            return time.monotonic() + delay
+        
+        wait = self.reacted_targets[key] + delay - time.time()
+        if wait > 0:
+            return time.monotonic() + wait
+        return await self.process_target(target, dry_run)
+    
+    async def process_targets(self, targets: List[Dict], dry_run: bool = False):
+        """Process every target not completed yet.
+        
+        Targets that run_target defers (unindexed channel, empty page, an
+        interleaved time window after each page, or a react_delay wait) are
+        parked until their retry time while other targets run. See
+        finish_target for what happens when a target returns.
+        
+        With parallel_targets > 1 (async engine), up to that many targets are
+        worked at once. They share the rate limiter, so per-channel delete
+        buckets run side by side under one global request budget. Console
+        lines are prefixed with the target they belong to.
+        """
+        remaining = [(i, t) for i, t in enumerate(targets)
+                     if target_key(t) not in self.completed_targets]
+        parallel = self.config['settings'].get('parallel_targets', 1)
+        
+        if parallel <= 1:
+            # Time windows start out parked and due, so the heap hands them out in turns
+            queue = deque((i, t) for i, t in remaining if 'window' not in t)
+            parked = [(0.0, i, t) for i, t in remaining if 'window' in t]  # (retry_at, index, target)
+            while (queue or parked) and not self.should_stop:
+                # A deferred target goes first once it is due, or when nothing else is left
+                if parked and (not queue or parked[0][0] <= time.monotonic()):
+                    retry_at, i, target = heapq.heappop(parked)
+                    wait = retry_at - time.monotonic()
+                    if wait > 0:
+                        print(f"\n{Colors.CYAN}Only deferred targets left, waiting {wait:.1f}s...{Colors.ENDC}")
+                        await self.sleep(wait)
+                else:
+                    i, target = queue.popleft()
                 
-                target = targets[i]
                 print(f"\n{Colors.BOLD}[{i+1}/{len(targets)}] Processing target...{Colors.ENDC}")
                 
-                self.process_target(target, dry_run)
-                self.current_target_index = i + 1
-                self.save_progress()
+                retry_at = await self.run_target(target, dry_run)
+                if retry_at is None:
+                    self.finish_target(targets, target)
+                else:
+                    heapq.heappush(parked, (retry_at, i, target))
+            return
         
-        # End timer
-        self.stats['end_time'] = datetime.now()
+        semaphore = asyncio.Semaphore(parallel)
         
-        # Print summary
-        self.print_summary()
+        async def worker(i: int, target: Dict):
+            while True:
+                async with semaphore:
+                    if self.should_stop:
+                        return
+                    # Each worker runs in its own task, so the label is per target
+                    TARGET_LABEL.set(target_name(target))
+                    self.say(f"{Colors.BOLD}[{i+1}/{len(targets)}] Processing target...{Colors.ENDC}")
+                    retry_at = await self.run_target(target, dry_run)
+                    if retry_at is None:
+                        self.finish_target(targets, target)
+                        return
+                # Deferred: free the slot for other targets until it is due again
+                await self.sleep(max(0.0, retry_at - time.monotonic()))
+        
+        await asyncio.gather(*(worker(i, target) for i, target in remaining))
+    
+    def apply_retention(self, targets: List[Dict], days: float) -> List[Dict]:
+        """Bound every target to what --retain-days still has to clean.
+        
+        Messages newer than now - days are kept (max_id = the horizon). For
+        a target a previous retention run finished, everything below that
+        run's horizon (its low-water mark) is already clean, so min_id skips
+        it. Known-ID targets just drop IDs newer than the horizon. A resumed
+        run keeps the horizon it started with.
+        """
+        horizon = self.progress_data.get('retention_horizon') or snowflake_ago(days * 86400)
+        self.retention_horizon = horizon
+        self.retention_marks = {}
+        if Path(RETENTION_FILE).exists():
+            try:
+                with open(RETENTION_FILE, 'r') as f:
+                    self.retention_marks = json.load(f).get('targets', {})
+            except (OSError, ValueError):
+                self.retention_marks = {}
+        
+        bounded = []
+        incremental = 0
+        for target in targets:
+            target = dict(target, max_id=str(horizon))
+            if 'known_ids' in target:
+                target['known_ids'] = [i for i in target['known_ids'] if int(i) < horizon]
+                bounded.append(target)
+                continue
+            low = self.retention_marks.get(target_key(target), {}).get('low')
+            if low is not None:
+                if low >= horizon:
+                    continue  # Already clean up to (or past) this horizon
+                target['min_id'] = str(low)
+                incremental += 1
+            bounded.append(target)
+        
+        horizon_ms = (horizon >> 22) + DISCORD_EPOCH
+        print(f"{Colors.CYAN}Retention: keeping the last {days:g} days, cleaning messages before "
+              f"{datetime.fromtimestamp(horizon_ms / 1000).isoformat(timespec='minutes')}{Colors.ENDC}")
+        if incremental:
+            print(f"{Colors.CYAN}  {incremental} targets only need the slice since their last run "
+                  f"({RETENTION_FILE}){Colors.ENDC}")
+        if len(bounded) < len(targets):
+            print(f"{Colors.GREEN}  {len(targets) - len(bounded)} targets already clean{Colors.ENDC}")
+        return bounded
+    
+    def save_retention_marks(self, targets: List[Dict]):
+        """Advance the low-water mark of every target this retention run finished.
+        
+        'low' becomes this run's horizon: everything below it is clean now.
+        Only targets that reached the end of their history count (see
+        finish_target), and a split target only once all of its windows did,
+        so an error never leaves an unsearched gap below the mark.
+        """
+        finished = {}  # Base key -> whether all of its windows are done
+        for target in targets:
+            if 'known_ids' in target:
+                continue
+            base = target_key(target, window=False)
+            done = target_key(target) in self.completed_targets
+            finished[base] = finished.get(base, True) and done
+        
+        for base, done in finished.items():
+            if not done:
+                continue
+            marks = self.retention_marks.setdefault(base, {})
+            marks['low'] = self.retention_horizon
+            marks['at'] = datetime.now().isoformat(timespec='seconds')
+        
+        fd = os.open(RETENTION_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.fchmod(fd, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'targets': self.retention_marks,
+                       'timestamp': datetime.now().isoformat()}, f, indent=2)
+    
+    def window_count(self, target: Dict) -> int:
+        """How many time windows a target is split into (1 = not split).
+        
+        A target's own 'windows' wins. Otherwise the 'windows' setting
+        applies to targets whose census count is at least window_min_messages.
+        """
+        if 'known_ids' in target or self.use_history(target):
+            return 1  # Windows bound search; other enumerators have nothing to split
+        if 'windows' in target:
+            return max(1, int(target['windows']))
+        settings = self.config['settings']
+        if target.get('message_count', 0) >= settings.get('window_min_messages', 10000):
+            return max(1, settings.get('windows', 1))
+        return 1
+    
+    def split_targets(self, targets: List[Dict]) -> List[Dict]:
+        """Replace big targets by their time windows (see split_windows).
+        
+        Window edges are kept in the progress file, so a resumed run splits
+        a target exactly as before. With window_order 'oldest' the windows
+        run oldest first; otherwise newest first ('interleave' takes turns).
+        """
+        split = []
+        for target in targets:
+            count = self.window_count(target)
+            if count <= 1:
+                split.append(target)
+                continue
+            key = target_key(target)
+            edges = self.window_edges.get(key)
+            if not edges or len(edges) != count + 1:
+                edges = self.window_edges[key] = window_edges(target, count)
+            windows = split_windows(target, edges)
+            if self.config['settings'].get('window_order', 'interleave') == 'oldest':
+                windows.reverse()
+            split.extend(windows)
+        return split
+    
+    def checkpoint_target(self, key: str, cursor: Dict):
+        """Record a target's cursor position, saving progress on an interval.
+        
+        The in-memory cursor is always current (the signal handler saves it on
+        Ctrl+C); the progress file is rewritten every checkpoint_batches pages
+        or checkpoint_interval seconds, whichever comes first.
+        """
+        self.target_cursors[key] = cursor
+        self.checkpoint_pages += 1
+        settings = self.config['settings']
+        if (self.checkpoint_pages >= settings.get('checkpoint_batches', 10) or
+                time.monotonic() - self.last_checkpoint >= settings.get('checkpoint_interval', 60)):
+            self.save_progress()
+    
+    def finish_target(self, targets: List[Dict], target: Dict):
+        """Record a target that run_target returned from for good.
+        
+        A target that reached its end is marked done. One that an error
+        stopped early (search or history failing, a channel never indexed)
+        keeps its cursor checkpoint and stays out of completed_targets, so
+        --resume picks it up where it stopped.
+        """
+        key = target_key(target)
+        if key in self.abandoned_targets:
+            self.abandoned_targets.discard(key)
+            self.say(f"{Colors.YELLOW}Target stopped before its end; checkpoint kept for "
+                     f"--resume{Colors.ENDC}")
+            self.save_progress()
+            return
+        self.mark_target_done(targets, target)
+    
+    def mark_target_done(self, targets: List[Dict], target: Dict):
+        """Record a finished target and save progress"""
+        self.completed_targets.add(target_key(target))
+        self.target_cursors.pop(target_key(target), None)
+        self.reacted_targets.pop(target_key(target), None)
+        if self.journal is not None:
+            self.journal.drop(target_key(target))
+        # current_target_index stays the count of leading finished targets
+        while (self.current_target_index < len(targets) and
+               target_key(targets[self.current_target_index]) in self.completed_targets):
+            self.current_target_index += 1
+        self.save_progress()
     
     def save_progress(self):
         """Save current progress to file"""
@@ -1100,6 +3660,11 @@ class Paracord:
         
         progress = {
             'current_target_index': self.current_target_index,
+            'completed_targets': sorted(self.completed_targets),
+            'target_cursors': self.target_cursors,
+            'window_edges': self.window_edges,
+            'reacted_targets': self.reacted_targets,
+            'retention_horizon': self.retention_horizon,
             'stats': serializable_stats,
             'timestamp': datetime.now().isoformat()
         }
@@ -1109,6 +3674,13 @@ class Paracord:
         with os.fdopen(fd, 'w') as f:
             json.dump(progress, f, indent=2)
         
+        if self.pacer is not None:
+            self.pacer.save()
+        if self.skip_cache is not None:
+            self.skip_cache.save()
+        
+        self.checkpoint_pages = 0
+        self.last_checkpoint = time.monotonic()
         self.logger.info(f"Progress saved: target {self.current_target_index}")
     
     def print_summary(self):
@@ -1127,15 +3699,121 @@ class Paracord:
             print(f"{Colors.YELLOW}Edited (meowed):{Colors.ENDC} {self.stats['edited']}")
         if self.stats['reacted']:
             print(f"{Colors.YELLOW}Reacted:{Colors.ENDC} {self.stats['reacted']}")
+        if self.stats['already_reacted']:
+            print(f"{Colors.YELLOW}Already reacted:{Colors.ENDC} {self.stats['already_reacted']} "
+                  f"(our mouse was already there, no requests)")
         print(f"{Colors.GREEN}Deleted:{Colors.ENDC} {self.stats['deleted']}")
         print(f"{Colors.YELLOW}Ghosts:{Colors.ENDC} {self.stats['ghosts']} (already-deleted stale index entries)")
+        if self.stats['indexed']:
+            print(f"{Colors.YELLOW}Already processed:{Colors.ENDC} {self.stats['indexed']} "
+                  f"(skipped via {PROCESSED_INDEX_FILE}, no requests)")
         print(f"{Colors.YELLOW}Skipped:{Colors.ENDC} {self.stats['skipped']}")
+        if self.stats['skip_cached']:
+            print(f"{Colors.YELLOW}Skip cache hits:{Colors.ENDC} {self.stats['skip_cached']} "
+                  f"(known undeletable, via {SKIP_CACHE_FILE}, no requests)")
         print(f"{Colors.RED}Failed:{Colors.ENDC} {self.stats['failed']}")
+        if self.stats['recovered']:
+            print(f"{Colors.GREEN}Recovered:{Colors.ENDC} {self.stats['recovered']} "
+                  f"(failed earlier, succeeded when retried from {FAILED_QUEUE_FILE})")
+        if self.failed is not None and len(self.failed):
+            print(f"{Colors.YELLOW}Still queued:{Colors.ENDC} {len(self.failed)} "
+                  f"(retried at the end of the next run, or with --retry-failed)")
         print(f"{Colors.CYAN}Rate limited:{Colors.ENDC} {self.stats['rate_limited']} times")
         
         print(f"\n{Colors.CYAN}Full log saved to: {LOG_FILE}{Colors.ENDC}")
 
 
+class AsyncResponse:
+    """Buffered aiohttp response exposing the parts of requests.Response we use"""
+    
+    def __init__(self, status: int, headers, body: bytes, url: str):
+        self.status_code = status
+        self.headers = headers
+        self.content = body
+        self.url = url
+    
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+    
+    def json(self):
+        return json.loads(self.content)
+    
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+
+class AsyncParacord(Paracord):
+    """Paracord running on a single asyncio event loop.
+    
+    Uses the same pipeline, outcome codes (OK/GHOST/SKIP/RETRY/FAILED) and
+    stats as Paracord, but HTTP goes through aiohttp and every wait is an
+    asyncio.sleep, so a wait never blocks other coroutines on the loop.
+    Network errors are re-raised as requests exceptions so the pipeline's
+    error handling is shared by both engines.
+    """
+    
+    concurrent = True
+    
+    def __init__(self, config: Dict):
+        if aiohttp is None:
+            print(f"{Colors.RED}Error: the async engine requires the 'aiohttp' library.{Colors.ENDC}")
+            print("Install it with: pip3 install aiohttp")
+            sys.exit(1)
+        super().__init__(config)
+        self.http = None  # aiohttp.ClientSession, open while run_engine runs
+    
+    def run_engine(self, coro):
+        return asyncio.run(self._run_with_http(coro))
+    
+    async def _run_with_http(self, coro):
+        headers = {
+            'Authorization': self.token,
+            'User-Agent': USER_AGENT
+        }
+        async with aiohttp.ClientSession(headers=headers) as self.http:
+            return await coro
+    
+    async def send(self, method: str, url: str, **kwargs) -> AsyncResponse:
+        """Send a single HTTP request without blocking the event loop"""
+        timeout = aiohttp.ClientTimeout(total=kwargs.pop('timeout', 30))
+        if 'params' in kwargs:
+            # aiohttp wants string values, and repeated keys as separate pairs
+            params = []
+            for k, v in kwargs['params'].items():
+                for item in (v if isinstance(v, list) else [v]):
+                    params.append((k, str(item)))
+            kwargs['params'] = params
+        try:
+            async with self.http.request(method, url, timeout=timeout, **kwargs) as response:
+                body = await response.read()
+                return AsyncResponse(response.status, response.headers, body, url)
+        except asyncio.TimeoutError as e:
+            raise requests.exceptions.Timeout(f"{method} {url} timed out") from e
+        except aiohttp.ClientError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+    
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(seconds)
+    
+    def spawn(self, coro) -> asyncio.Future:
+        return asyncio.ensure_future(coro)
+
+
+def passes_arg(value: str) -> Union[int, str]:
+    """argparse type for --passes: a positive number or 'auto'"""
+    if value == 'auto':
+        return value
+    try:
+        passes = int(value)
+    except ValueError:
+        passes = 0
+    if passes < 1:
+        raise argparse.ArgumentTypeError(f"expected a number of passes or 'auto', got {value!r}")
+    return passes
+
+
 def main():
     """Main entry point"""
     
@@ -1173,6 +3851,43 @@ Examples:
     
     # Delete all messages except meowed ones (preserve meow'd messages)
     python3 paracord.py --config config.json --skip-meowed
+    
+    # Pace requests to Discord's rate limit buckets instead of fixed delays
+    python3 paracord.py --config config.json --pacing buckets
+    
+    # Overlap the search cooldown with delete work
+    python3 paracord.py --config config.json --prefetch
+    
+    # Run on the asyncio engine (requires aiohttp)
+    python3 paracord.py --config config.json --engine async
+    
+    # Keep several messages' react/edit/delete requests in flight per channel
+    python3 paracord.py --config config.json --pacing buckets --pipeline
+    
+    # Work four channels at once
+    python3 paracord.py --config config.json --parallel-targets 4
+    
+    # Count messages per target and disable the empty ones
+    python3 paracord.py --config config.json --census
+    
+    # Delete the message IDs from a Discord data package, skipping search
+    python3 paracord.py --config config.json --package package.zip
+    
+    # Write what a dry run finds to a plan, then execute exactly that plan
+    python3 paracord.py --config config.json --dry-run --plan-out plan.ndjson
+    python3 paracord.py --config config.json --apply plan.ndjson
+    
+    # Search a huge channel as four time windows, each with its own cursor
+    python3 paracord.py --config config.json --windows 4
+    
+    # Scheduled cleanup: keep the last 30 days, only scan what's new since last run
+    python3 paracord.py --config config.json --retain-days 30 --yes
+    
+    # Keep making passes until the search index reports nothing left
+    python3 paracord.py --config config.json --passes auto
+    
+    # Retry only the failed messages queued by earlier runs (no searching)
+    python3 paracord.py --config config.json --retry-failed
         """
     )
     
@@ -1193,9 +3908,52 @@ Examples:
                         help='Skip meowed messages (preserve them during deletion passes)')
     parser.add_argument('--react-delay', type=int, default=None, metavar='MINUTES',
                         help='Minutes to wait between react and edit phases in meow mode (default: 0)')
+    parser.add_argument('--pacing', choices=PACING_MODES, default=None,
+                        help='"fixed" sleeps delete_delay after every action; "buckets" paces each '
+                             'request to Discord\'s X-RateLimit headers; "adaptive" tunes both delays '
+                             'from observed 429s (default: fixed)')
+    parser.add_argument('--prefetch', action='store_true', default=None,
+                        help='Fetch the next search page in the background while the current batch is processed')
+    parser.add_argument('--pipeline', action='store_true', default=None,
+                        help='Overlap the react/edit/delete requests of several messages in a channel, '
+                             'up to each rate limit bucket\'s limit (needs --pacing buckets; '
+                             'implies --engine async)')
+    parser.add_argument('--engine', choices=ENGINES, default='sync',
+                        help='"sync" uses blocking requests; "async" runs on an asyncio event loop '
+                             'with aiohttp (default: sync)')
+    parser.add_argument('--census', nargs='?', const='disable', default=None,
+                        choices=['disable', 'drop'],
+                        help='Count your messages per target, write the counts into the config and '
+                             'disable (default) or drop targets with none')
+    parser.add_argument('--package', metavar='ZIP',
+                        help='Delete the message IDs listed in a Discord data package (no searching)')
+    parser.add_argument('--plan-out', metavar='FILE',
+                        help='With --dry-run, write every message that would be processed to a plan file')
+    parser.add_argument('--apply', metavar='FILE',
+                        help='Execute a plan file written by --dry-run --plan-out (no searching)')
+    parser.add_argument('--enumerator', choices=ENUMERATORS, default=None,
+                        help='How messages are found: "search", "history" (scan channel history, '
+                             'filter by author) or "auto" (history where the census shows most '
+                             'messages are ours; default)')
+    parser.add_argument('--windows', type=int, default=None, metavar='N',
+                        help='Split each search target into N time windows with their own cursors')
+    parser.add_argument('--retain-days', type=float, default=None, metavar='N',
+                        help='Keep the last N days of messages; later runs only scan what aged '
+                             f'past the horizon since the previous run ({RETENTION_FILE})')
+    parser.add_argument('--passes', type=passes_arg, default=None, metavar='N|auto',
+                        help='Search targets again after the run until the index reports none left: '
+                             'up to N passes, or "auto" (up to max_passes; default: 1)')
+    parser.add_argument('--retry-failed', action='store_true',
+                        help=f'Only retry the failed actions queued in {FAILED_QUEUE_FILE} (no searching)')
+    parser.add_argument('--parallel-targets', type=int, default=None, metavar='N',
+                        help='Work up to N targets at once (implies --engine async)')
     
     args = parser.parse_args()
     
+    if args.apply and args.package:
+        print(f"{Colors.RED}--apply and --package both supply the targets; use one of them{Colors.ENDC}")
+        sys.exit(1)
+    
     # Create initial config with defaults
     config = {
         "settings": {
@@ -1207,7 +3965,15 @@ Examples:
         }
     }
     
-    paracord = Paracord(config)
+    # Parallel targets and pipelined actions overlap their waits on the event loop
+    if (args.parallel_targets is not None and args.parallel_targets > 1) or args.pipeline:
+        args.engine = 'async'
+    engine_class = AsyncParacord if args.engine == 'async' else Paracord
+    
+    # Not Discord: say so before the token is sent anywhere
+    if DISCORD_API_BASE != DEFAULT_API_BASE:
+        print(f"{Colors.YELLOW}Using API at {DISCORD_API_BASE} (DISCORD_API_BASE){Colors.ENDC}")
+    paracord = engine_class(config)
     
     # Load token
     paracord.token = paracord.load_token(args.token)
@@ -1228,11 +3994,25 @@ Examples:
         paracord.discover_servers()
         sys.exit(0)
     
+    # Census mode
+    if args.census:
+        if not args.config:
+            print(f"{Colors.RED}--census needs --config{Colors.ENDC}")
+            sys.exit(1)
+        paracord.run_census(args.config, prune=args.census)
+        sys.exit(0)
+    
     # Batch mode
     if args.config:
         paracord.run_batch(args.config, dry_run=args.dry_run, resume=args.resume,
                            skip_confirm=args.yes, meow_mode=args.meow,
-                           skip_meowed=args.skip_meowed, react_delay=args.react_delay)
+                           skip_meowed=args.skip_meowed, react_delay=args.react_delay,
+                           pacing=args.pacing, prefetch=args.prefetch,
+                           parallel_targets=args.parallel_targets, package=args.package,
+                           plan_out=args.plan_out, apply_plan=args.apply,
+                           enumerator=args.enumerator, retry_failed=args.retry_failed,
+                           windows=args.windows, retain_days=args.retain_days,
+                           passes=args.passes, pipeline=args.pipeline)
         sys.exit(0)
     
     # No action specified
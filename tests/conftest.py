@@ -0,0 +1,42 @@
+import csv
+import io
+import json
+import os
+import sys
+import zipfile
+
+import pytest
+
+# paracord.py and mock_discord.py are single-file scripts at the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def write_package(tmp_path):
+    """Returns a function that writes a Discord data package zip.
+    
+    Each channel is a dict with 'channel' (the channel.json contents),
+    'messages' ([(id, contents)]), optional 'format' ('csv' or 'json') and
+    optional 'folder' (defaults to c<channel id>).
+    """
+    def write(channels, index=None, name='package.zip'):
+        path = tmp_path / name
+        with zipfile.ZipFile(path, 'w') as zf:
+            if index is not None:
+                zf.writestr('messages/index.json', json.dumps(index))
+            for spec in channels:
+                channel = spec['channel']
+                folder = f"messages/{spec.get('folder', 'c' + channel['id'])}"
+                zf.writestr(f"{folder}/channel.json", json.dumps(channel))
+                rows = [{'ID': message_id, 'Timestamp': '', 'Contents': contents,
+                         'Attachments': ''} for message_id, contents in spec['messages']]
+                if spec.get('format', 'csv') == 'json':
+                    zf.writestr(f"{folder}/messages.json", json.dumps(rows))
+                else:
+                    out = io.StringIO()
+                    writer = csv.DictWriter(out, ['ID', 'Timestamp', 'Contents', 'Attachments'])
+                    writer.writeheader()
+                    writer.writerows(rows)
+                    zf.writestr(f"{folder}/messages.csv", out.getvalue())
+        return str(path)
+    return write
@@ -0,0 +1,146 @@
+import json
+import zipfile
+
+import pytest
+
+from paracord import MEOW_TEXT, Paracord, read_data_package, read_plan, target_key
+
+DM = {'id': '300', 'type': 1}
+GROUP = {'id': '400', 'type': 3, 'name': 'Friends'}
+GUILD_CHANNEL = {'id': '500', 'type': 0, 'name': 'general',
+                 'guild': {'id': '50', 'name': 'Server'}}
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+
+def test_package_targets_per_channel(write_package):
+    package = write_package([
+        {'channel': DM, 'messages': [('301', 'hi'), ('305', MEOW_TEXT), ('303', 'yo')]},
+        {'channel': GROUP, 'messages': [('401', 'a')], 'format': 'json'},
+        # Older packages name the folder by ID only
+        {'channel': GUILD_CHANNEL, 'messages': [('501', 'b')], 'folder': '500'},
+        {'channel': {'id': '600', 'type': 1}, 'messages': []},
+    ], index={'300': 'Direct Message with friend#0001'})
+    
+    targets = {t['channel_id']: t for t in read_data_package(package)}
+    
+    assert set(targets) == {'300', '400', '500'}
+    assert targets['300']['type'] == 'dm'
+    assert targets['300']['recipient_name'] == 'friend#0001'
+    assert targets['300']['known_ids'] == ['305', '303', '301']  # Newest first
+    assert targets['300']['meowed_ids'] == ['305']
+    assert targets['400']['type'] == 'group_dm' and targets['400']['known_ids'] == ['401']
+    assert targets['500']['type'] == 'guild'
+    assert (targets['500']['guild_id'], targets['500']['channel_name']) == ('50', 'general')
+
+
+def test_package_channel_without_channel_json_is_ignored(write_package):
+    package = write_package([{'channel': DM, 'messages': [('301', 'hi')]}])
+    with zipfile.ZipFile(package, 'a') as zf:
+        zf.writestr('messages/c700/messages.csv', 'ID,Timestamp,Contents,Attachments\n701,,x,\n')
+    
+    assert [t['channel_id'] for t in read_data_package(package)] == ['300']
+
+
+def write_plan_file(path, records):
+    with open(path, 'w') as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+
+
+def test_plan_targets_split_by_channel_and_action(tmp_path):
+    server = {'type': 'guild_all', 'guild_id': '50', 'guild_name': 'Server',
+              'channel_ids': ['500', '510']}
+    dm = {'type': 'dm', 'channel_id': '300', 'recipient_name': 'friend'}
+    path = tmp_path / 'plan.ndjson'
+    write_plan_file(path, [
+        {'plan': 1, 'author_id': '1', 'meow_mode': 'edit_only'},
+        {'target': server},
+        {'target': dm},
+        {'t': target_key(server), 'c': '500', 'm': '502', 'a': 'edit_only'},
+        {'t': target_key(server), 'c': '510', 'm': '511', 'a': 'edit_only'},
+        {'t': target_key(server), 'c': '500', 'm': '501', 'a': 'edit_only'},
+        {'t': target_key(dm), 'c': '300', 'm': '302', 'a': 'edit_only'},
+        {'t': target_key(dm), 'c': '300', 'm': '301', 'a': 'delete'},
+    ])
+    
+    header, targets = read_plan(str(path))
+    
+    assert header['meow_mode'] == 'edit_only'
+    summary = [(t['type'], t['channel_id'], t['meow_mode'], t['known_ids']) for t in targets]
+    assert summary == [('guild', '500', 'edit_only', ['502', '501']),
+                       ('guild', '510', 'edit_only', ['511']),
+                       ('dm', '300', 'edit_only', ['302']),
+                       ('dm', '300', 'off', ['301'])]
+    assert 'channel_ids' not in targets[0]
+    # A channel's two actions are separate targets with separate progress
+    assert target_key(targets[2]) != target_key(targets[3])
+
+
+def test_plan_round_trips_through_write_plan(tmp_path):
+    client = Paracord({'settings': {'meow_mode': 'edit_and_delete'}})
+    client.author_id = '1'
+    target = {'type': 'dm', 'channel_id': '300', 'recipient_name': 'friend'}
+    client.open_plan(str(tmp_path / 'plan.ndjson'))
+    client.write_plan(target, [{'id': '302', 'channel_id': '300'}, {'id': '301'}])
+    client.plan_file.close()
+    
+    header, targets = read_plan(str(tmp_path / 'plan.ndjson'))
+    
+    assert header['author_id'] == '1'
+    assert len(targets) == 1
+    assert targets[0]['known_ids'] == ['302', '301']
+    assert targets[0]['meow_mode'] == 'edit_and_delete'
+    assert targets[0]['recipient_name'] == 'friend'
+
+
+@pytest.fixture
+def mixed_plan(tmp_path):
+    path = tmp_path / 'plan.ndjson'
+    write_plan_file(path, [
+        {'plan': 1, 'author_id': '1', 'meow_mode': 'edit_only'},
+        {'t': 'dm:300', 'c': '300', 'm': '302', 'a': 'edit_only'},
+        {'t': 'dm:300', 'c': '300', 'm': '301', 'a': 'delete'},
+    ])
+    return str(path)
+
+
+def plan_client(meow_mode='off'):
+    client = Paracord({'settings': {'meow_mode': meow_mode}})
+    client.author_id = '1'
+    return client
+
+
+def test_load_plan_adopts_the_plan_meow_mode(mixed_plan, capsys):
+    client = plan_client()
+    
+    targets = client.load_plan_targets(mixed_plan)
+    
+    assert [t['meow_mode'] for t in targets] == ['edit_only', 'off']
+    assert client.config['settings']['meow_mode'] == 'edit_only'
+    assert 'Plan mixes meow modes' in capsys.readouterr().out
+
+
+def test_load_plan_rejects_a_conflicting_meow(mixed_plan):
+    with pytest.raises(SystemExit):
+        plan_client().load_plan_targets(mixed_plan, meow_mode='edit_only')
+
+
+def test_load_plan_accepts_a_matching_meow(tmp_path):
+    path = tmp_path / 'plan.ndjson'
+    write_plan_file(path, [{'plan': 1, 'author_id': '1', 'meow_mode': 'off'},
+                           {'t': 'dm:300', 'c': '300', 'm': '301', 'a': 'delete'}])
+    
+    targets = plan_client().load_plan_targets(str(path), meow_mode='off')
+    
+    assert [t['known_ids'] for t in targets] == [['301']]
+
+
+def test_load_plan_rejects_another_account(mixed_plan):
+    client = plan_client()
+    client.author_id = '2'
+    with pytest.raises(SystemExit):
+        client.load_plan_targets(mixed_plan)
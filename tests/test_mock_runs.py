@@ -0,0 +1,243 @@
+import json
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import mock_discord
+import paracord
+from mock_discord import MockDiscord, MockHandler
+from paracord import Paracord, target_key
+
+
+@pytest.fixture
+def mock_api(tmp_path, monkeypatch):
+    """Start a MockDiscord server in-process; returns a function that builds one.
+    
+    Runs happen in tmp_path, so progress, retention and journal files start
+    out empty. The server's config is written to config.json.
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(paracord.signal, 'signal', lambda *args: None)
+    servers = []
+    
+    def start(*argv):
+        args = mock_discord.build_parser().parse_args(
+            ['--guilds', '0', '--dms', '1', '--group-dms', '0', '--messages', '60',
+             '--own-ratio', '1', '--pinned-ratio', '0', '--index-lag', '0',
+             '--time-scale', '0.01', *argv])
+        mock = MockDiscord(args)
+        handler = type('Handler', (MockHandler,), {'mock': mock})
+        server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        monkeypatch.setattr(paracord, 'DISCORD_API_BASE',
+                            f"http://127.0.0.1:{server.server_address[1]}/api/v9")
+        mock.write_config('config.json')
+        return mock
+    
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def configure(**settings):
+    """Change config.json settings; runs are paced by the mock's buckets"""
+    with open('config.json') as f:
+        config = json.load(f)
+    config['settings'].update({'pacing': 'buckets', **settings})
+    with open('config.json', 'w') as f:
+        json.dump(config, f)
+    return config
+
+
+def run(**options) -> Paracord:
+    client = Paracord({'settings': {}})
+    client.token = 'mock'
+    valid, client.author_id = client.validate_token()
+    assert valid
+    client.run_batch('config.json', skip_confirm=True, **options)
+    return client
+
+
+def record_searches(mock):
+    """Wrap mock.search to collect the query of every search"""
+    queries = []
+    search = mock.search
+    
+    def recording(scope_id, channel_ids, query):
+        queries.append(query)
+        return search(scope_id, channel_ids, query)
+    mock.search = recording
+    return queries
+
+
+def own_ids(mock):
+    return {m for live in mock.messages.values() for m, msg in live.items()
+            if msg['author']['id'] == mock.me['id']}
+
+
+def test_run_deletes_everything_without_429s(mock_api):
+    mock = mock_api('--dms', '2', '--limit', 'delete=3/0.05')
+    configure()
+    
+    run()
+    
+    assert mock.own_left() == 0
+    assert mock.stats['rate_limited'] == 0
+
+
+def test_resume_starts_at_the_checkpointed_cursor(mock_api, capsys):
+    mock = mock_api()
+    config = configure()
+    target = config['targets'][0]
+    newest_first = mock.order[target['channel_id']]
+    cursor = newest_first[19]
+    with open(paracord.PROGRESS_FILE, 'w') as f:
+        json.dump({'current_target_index': 0, 'completed_targets': [],
+                   'target_cursors': {target_key(target): {'max_id_cursor': cursor}}}, f)
+    
+    run(resume=True)
+    
+    # Everything from the cursor up was done before the interruption
+    assert own_ids(mock) == set(newest_first[:20])
+    assert 'Resuming from checkpoint' in capsys.readouterr().out
+    with open(paracord.PROGRESS_FILE) as f:
+        progress = json.load(f)
+    assert progress['completed_targets'] == [target_key(target)]
+    assert progress['target_cursors'] == {}
+
+
+def test_search_error_keeps_the_checkpoint(mock_api):
+    mock = mock_api()
+    config = configure(failed_queue=False)
+    key = target_key(config['targets'][0])
+    mock.search = lambda scope_id, channel_ids, query: (500, {'message': 'Internal error'})
+    
+    run(retain_days=1)
+    
+    with open(paracord.PROGRESS_FILE) as f:
+        progress = json.load(f)
+    assert key not in progress['completed_targets']
+    assert key in progress['target_cursors']
+    # No low-water mark for a target that never reached its end
+    with open(paracord.RETENTION_FILE) as f:
+        assert key not in json.load(f)['targets']
+
+
+def test_retention_marks_bound_the_next_run(mock_api):
+    mock = mock_api('--days', '10')
+    config = configure()
+    key = target_key(config['targets'][0])
+    
+    first = run(retain_days=5)
+    
+    horizon = first.retention_horizon
+    assert own_ids(mock) and all(int(m) >= horizon for m in own_ids(mock))
+    with open(paracord.RETENTION_FILE) as f:
+        assert json.load(f)['targets'][key]['low'] == horizon
+    
+    queries = record_searches(mock)
+    run(retain_days=4)
+    
+    assert queries and all(q['min_id'] == [str(horizon)] for q in queries)
+
+
+def test_interleaved_windows_keep_their_walk_state(mock_api, capsys):
+    mock = mock_api('--messages', '150')
+    configure(search_prefetch=True)
+    
+    run(windows=3)
+    
+    out = capsys.readouterr().out
+    assert mock.own_left() == 0
+    # One header per window; later turns continue the same walk
+    assert out.count('Target: ') == 3
+    assert 'Continuing ' in out
+    assert 'Using prefetched page' in out
+    assert 'Resuming from checkpoint' not in out
+
+
+def test_react_delay_replays_the_journal(mock_api):
+    mock = mock_api('--messages', '30')
+    configure(meow_mode='edit_and_delete', react_delay=0.01)
+    queries = record_searches(mock)
+    
+    run()
+    
+    assert mock.own_left() == 0
+    assert mock.stats['reacted'] == 30
+    assert mock.stats['edited'] == 30
+    # The meow phase works from the journal: both searches are the react phase's two pages
+    assert len(queries) == 2
+    assert not paracord.Path(paracord.REACT_JOURNAL_FILE).exists()
+
+
+def package_from(mock, write_package):
+    """Data package of our messages in the mock's channels, as exported right now"""
+    return write_package([
+        {'channel': {'id': channel_id, 'type': mock.channels[channel_id]['type']},
+         'messages': [(m, msg['content']) for m, msg in live.items()
+                      if msg['author']['id'] == mock.me['id']]}
+        for channel_id, live in mock.messages.items()])
+
+
+def test_react_delay_package_run_replays_the_journal(mock_api, write_package):
+    mock = mock_api('--messages', '40', '--pinned-ratio', '0.2')
+    configure(meow_mode='edit_and_delete', react_delay=0.001)
+    (live,) = mock.messages.values()
+    unpinned = [m for m in live if not live[m]['pinned']]
+    for message_id in unpinned[:10]:
+        live[message_id]['content'] = paracord.MEOW_TEXT
+    pinned = len(live) - len(unpinned)
+    assert pinned
+    package = package_from(mock, write_package)
+    queries = record_searches(mock)
+    
+    run(package=package)
+    
+    # Meowed messages are only deleted, the rest get one reaction each, pinned ones stay
+    assert mock.stats['reacted'] == len(unpinned) - 10
+    assert mock.stats['edited'] == len(unpinned) - 10
+    assert mock.stats['requests'].get('react') == len(unpinned) - 10
+    assert mock.own_left() == pinned
+    assert all(msg['pinned'] for msg in live.values())
+    assert queries == []
+    assert not paracord.Path(paracord.REACT_JOURNAL_FILE).exists()
+
+
+def test_failed_queue_drain_follows_the_meow_mode(mock_api):
+    mock = mock_api('--messages', '6')
+    configure()
+    (channel_id, live), = mock.messages.items()
+    ids = list(live)
+    queue = paracord.FailedQueue()
+    for message_id, action in zip(ids, ('edit', 'react', 'delete', 'delete')):
+        queue.add(channel_id, message_id, action, 'server error')
+    queue.close()
+    
+    run(retry_failed=True, meow_mode='edit_only')
+    
+    assert mock.stats['edited'] == 1 and mock.stats['reacted'] == 1
+    assert mock.own_left() == 6
+    # The queued deletes wait for a run that deletes
+    assert set(paracord.FailedQueue().entries) == set(ids[2:4])
+    
+    run(retry_failed=True, meow_mode='off')
+    
+    assert set(live) == set(ids[:2] + ids[4:])
+    assert not paracord.Path(paracord.FAILED_QUEUE_FILE).exists()
+
+
+def test_forbidden_channel_is_skipped_after_a_streak(mock_api):
+    mock = mock_api('--guilds', '1', '--channels', '1', '--forbidden-channels', '1', '--dms', '0')
+    configure(meow_mode='edit_and_delete')
+    
+    run()
+    
+    skipped = paracord.SkipCache()
+    (channel_id,) = mock.forbidden
+    assert channel_id in skipped.channels
+    # Each message counts once, though its reaction, edit and delete are all refused
+    assert len(skipped.messages) == paracord.SKIP_CHANNEL_AFTER
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+import paracord
+from paracord import (PACE_ACTION, PACE_SEARCH, ROUTE_DELETE, ROUTE_HISTORY, ROUTE_REACT,
+                      Paracord, RateLimiter)
+
+
+def headers(limit, remaining, reset_after, bucket='b'):
+    return {'X-RateLimit-Limit': str(limit), 'X-RateLimit-Remaining': str(remaining),
+            'X-RateLimit-Reset-After': str(reset_after), 'X-RateLimit-Bucket': bucket}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(paracord.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_exhausted_bucket_does_not_delay_other_channels(clock):
+    limiter = RateLimiter(global_rate=50)
+    limiter.observe(ROUTE_DELETE, 'A', 204, headers(1, 0, 5.0))
+    
+    assert limiter.reserve(ROUTE_DELETE, 'A') == pytest.approx(5.0)
+    # A brand-new channel only waits for its global slot, not for A's window
+    assert limiter.reserve(ROUTE_DELETE, 'B') < 0.1
+
+
+def test_exhausted_bucket_does_not_delay_other_routes(clock):
+    limiter = RateLimiter(global_rate=50)
+    limiter.observe(ROUTE_REACT, 'A', 204, headers(1, 0, 5.0, 'react'))
+    limiter.observe(ROUTE_DELETE, 'A', 204, headers(5, 4, 5.0, 'delete'))
+    
+    assert limiter.reserve(ROUTE_REACT, 'A') == pytest.approx(5.0)
+    assert limiter.reserve(ROUTE_DELETE, 'A') < 0.1
+
+
+def test_global_slots_are_spaced(clock):
+    limiter = RateLimiter(global_rate=10)
+    waits = [limiter.reserve(ROUTE_DELETE, str(i)) for i in range(3)]
+    assert waits == pytest.approx([0.0, 0.1, 0.2])
+
+
+def test_global_429_blocks_every_route(clock):
+    limiter = RateLimiter(backoff=1.0, global_rate=0)
+    limiter.observe(ROUTE_DELETE, 'A', 429, {'X-RateLimit-Global': 'true'},
+                    {'retry_after': 2.0, 'global': True})
+    assert limiter.reserve(ROUTE_REACT, 'B') == pytest.approx(2.0)
+
+
+def test_concurrent_claims_wait_for_the_next_window(clock):
+    limiter = RateLimiter(global_rate=0)
+    limiter.observe(ROUTE_DELETE, 'A', 204, headers(2, 2, 1.0))
+    waits = [limiter.reserve(ROUTE_DELETE, 'A') for _ in range(4)]
+    assert waits == pytest.approx([0.0, 0.0, 1.0, 1.0])
+    # An answer from the old window doesn't hand back the claimed slots
+    limiter.observe(ROUTE_DELETE, 'A', 204, headers(2, 1, 0.9))
+    assert limiter.reserve(ROUTE_DELETE, 'A') == pytest.approx(2.0)
+
+
+def test_only_searches_and_actions_move_adaptive_delays(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    client = Paracord({'settings': {'pacing': 'adaptive', 'search_delay': 8, 'delete_delay': 1}})
+    client.start_pacer()
+    status = [429]
+    
+    async def send(method, url, **kwargs):
+        return type('Response', (), {'status_code': status[0], 'headers': {},
+                                     'json': lambda self: {'retry_after': 0}})()
+    client.send = send
+    client.sleep = lambda seconds: asyncio.sleep(0)
+    
+    asyncio.run(client.api_request('GET', 'url', ROUTE_HISTORY, 'A', 'history'))
+    status[0] = 200
+    asyncio.run(client.api_request('GET', 'url', ROUTE_HISTORY, 'A', 'history'))
+    assert client.pacer.delay(PACE_ACTION) == 1
+    assert client.pacer.delay(PACE_SEARCH) == 8
+    
+    status[0] = 429
+    asyncio.run(client.api_request('DELETE', 'url', ROUTE_DELETE, 'A', 'delete'))
+    assert client.pacer.delay(PACE_ACTION) == 2
@@ -0,0 +1,192 @@
+from array import array
+
+import pytest
+
+import paracord
+from paracord import (MEOW_TEXT, SKIP_CHANNEL_AFTER, FailedQueue, Paracord, ProcessedIndex,
+                      ReactJournal, SkipCache)
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+
+def stored_ids(path=paracord.PROCESSED_INDEX_FILE):
+    ids = array('Q')
+    with open(path, 'rb') as f:
+        ids.frombytes(f.read())
+    return list(ids)
+
+
+def test_processed_index_log_survives_an_interruption():
+    index = ProcessedIndex()
+    for message_id in ('30', '10', '20'):
+        index.add(message_id)
+    index.log.close()  # Interrupted: no compaction
+    # A record cut short by the interruption is ignored
+    with open(paracord.PROCESSED_LOG_FILE, 'ab') as f:
+        f.write(b'\x01\x02\x03')
+    
+    reopened = ProcessedIndex()
+    
+    assert all(message_id in reopened for message_id in ('10', '20', '30'))
+    assert '40' not in reopened and len(reopened) == 3
+
+
+def test_processed_index_compacts_into_a_sorted_file():
+    index = ProcessedIndex()
+    for message_id in ('30', '10', '20'):
+        index.add(message_id)
+    index.close()
+    
+    index = ProcessedIndex()
+    for message_id in ('25', '5', '40', '20'):
+        index.add(message_id)
+    index.close()
+    
+    assert stored_ids() == [5, 10, 20, 25, 30, 40]
+    with open(paracord.PROCESSED_LOG_FILE, 'rb') as f:
+        assert f.read() == b''
+    reopened = ProcessedIndex()
+    assert len(reopened) == 6 and '25' in reopened and '26' not in reopened
+
+
+def test_processed_index_merge_drops_logged_ids_already_indexed():
+    index = ProcessedIndex()
+    index.add('10')
+    index.close()
+    # A log left behind by a run that stopped between merge and truncate
+    with open(paracord.PROCESSED_LOG_FILE, 'ab') as f:
+        array('Q', [10, 5]).tofile(f)
+    
+    ProcessedIndex().close()
+    
+    assert stored_ids() == [5, 10]
+
+
+def test_processed_index_compacts_a_large_log_on_open(monkeypatch):
+    monkeypatch.setattr(ProcessedIndex, 'COMPACT_AT', 3)
+    index = ProcessedIndex()
+    for message_id in ('3', '1', '2'):
+        index.add(message_id)
+    index.log.close()
+    
+    reopened = ProcessedIndex()
+    
+    assert stored_ids() == [1, 2, 3]
+    assert not reopened.recent and '2' in reopened
+
+
+def test_skip_cache_gives_up_after_a_streak_of_403s():
+    cache = SkipCache()
+    for i in range(SKIP_CHANNEL_AFTER - 1):
+        assert not cache.denied('c', str(i))
+    
+    assert cache.denied('c', 'last')
+    assert {'id': 'other', 'channel_id': 'c'} in cache
+    # Already skipped: no second announcement
+    assert not cache.denied('c', 'more')
+
+
+def test_skip_cache_streak_resets_on_success():
+    cache = SkipCache()
+    for i in range(SKIP_CHANNEL_AFTER - 1):
+        cache.denied('c', str(i))
+    cache.allowed('c')
+    
+    assert not cache.denied('c', 'next')
+    assert 'c' not in cache.channels
+    assert {'id': '0', 'channel_id': 'c'} in cache  # The message itself stays cached
+
+
+def test_skip_cache_counts_a_message_once():
+    cache = SkipCache()
+    for i in range(SKIP_CHANNEL_AFTER - 1):
+        # Both the edit and the delete of a message are refused
+        assert not cache.denied('c', str(i))
+        assert not cache.denied('c', str(i))
+    
+    assert 'c' not in cache.channels
+
+
+def test_skip_cache_persists_messages_and_channels_but_not_streaks():
+    cache = SkipCache()
+    cache.denied('a', '1')
+    cache.skip_channel('t', 'archived thread (50083)')
+    cache.save()
+    
+    saved = SkipCache()
+    
+    assert {'id': '1', 'channel_id': 'x'} in saved
+    assert {'id': '2', 'channel_id': 't'} in saved
+    assert saved.denials == {}
+
+
+def test_failed_queue_keeps_the_latest_entry_per_message():
+    queue = FailedQueue()
+    queue.add('c', '1', 'edit', 'rate limited')
+    queue.add('c', '2', 'delete', 'server error')
+    queue.add('c', '1', 'delete', 'server error')
+    queue.log.close()
+    with open(paracord.FAILED_QUEUE_FILE, 'a') as f:
+        f.write('{"c": "c", "m"')  # Cut short by an interruption
+    
+    reopened = FailedQueue()
+    
+    assert {m: e['a'] for m, e in reopened.entries.items()} == {'1': 'delete', '2': 'delete'}
+    reopened.resolve('1')
+    reopened.close()
+    assert list(FailedQueue().entries) == ['2']
+
+
+def test_failed_queue_file_is_removed_once_empty():
+    queue = FailedQueue()
+    queue.add('c', '1', 'delete', 'server error')
+    queue.resolve('1')
+    queue.close()
+    
+    assert not paracord.Path(paracord.FAILED_QUEUE_FILE).exists()
+
+
+@pytest.mark.parametrize('meow_mode, expected', [
+    ('off', {'delete': 'delete', 'edit': 'delete', 'react': 'delete'}),
+    ('edit_and_delete', {'delete': 'delete', 'edit': 'delete', 'react': 'delete'}),
+    ('edit_only', {'delete': None, 'edit': 'edit', 'react': 'react'}),
+    ('react_only', {'delete': None, 'edit': None, 'react': 'react'}),
+])
+def test_drain_action_follows_the_meow_mode(meow_mode, expected):
+    client = Paracord({'settings': {'meow_mode': meow_mode}})
+    assert {action: client.drain_action(action) for action in expected} == expected
+
+
+def test_react_journal_round_trip():
+    journal = ReactJournal()
+    journal.start('dm:1')
+    journal.add('dm:1', '1', '30', True)
+    journal.add('dm:1', '1', '20', False)
+    journal.add('dm:1', '1', '10', False, meowed=True)
+    journal.start('dm:2')
+    journal.add('dm:2', '2', '40', True)
+    journal.drop('dm:2')
+    journal.close()
+    
+    reopened = ReactJournal()
+    
+    assert 'dm:2' not in reopened
+    assert reopened.messages('dm:1') == [
+        {'id': '30', 'channel_id': '1', 'reacted': True},
+        {'id': '20', 'channel_id': '1', 'reacted': False},
+        {'id': '10', 'channel_id': '1', 'reacted': False, 'content': MEOW_TEXT},
+    ]
+
+
+def test_react_journal_restart_drops_the_earlier_phase():
+    journal = ReactJournal()
+    journal.start('dm:1')
+    journal.add('dm:1', '1', '30', True)
+    journal.start('dm:1')
+    journal.add('dm:1', '1', '20', True)
+    journal.log.close()  # Interrupted: the file still holds both phases
+    
+    assert [msg['id'] for msg in ReactJournal().messages('dm:1')] == ['20']